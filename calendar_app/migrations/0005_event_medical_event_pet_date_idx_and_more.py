@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0004_event_is_reservation'),
+        ('common_app', '0008_spendingrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['pet', 'date'], name='medical_event_pet_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['pet', 'next_date'], name='medical_event_pet_next_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0005_event_medical_event_pet_date_idx_and_more'),
+        ('common_app', '0009_calendarversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['pet', 'event_type', 'date'], name='medical_event_pet_type_idx'),
+        ),
+    ]
@@ -21,6 +21,11 @@ class Event(models.Model):
 
     class Meta:
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['pet', 'date'], name='medical_event_pet_date_idx'),
+            models.Index(fields=['pet', 'next_date'], name='medical_event_pet_next_idx'),
+            models.Index(fields=['pet', 'event_type', 'date'], name='medical_event_pet_type_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_event_type_display()} - {self.pet.name} ({self.date})"
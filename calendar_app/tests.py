@@ -1,3 +1,31 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from common_app.models import Pet
+
+from .models import Event
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class CalendarViewQueryBudgetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('owner', password='pw')
+        self.client.force_login(self.user)
+
+    def add_pets(self, count):
+        for n in range(count):
+            pet = Pet.objects.create(owner=self.user, name=f'펫{n}', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+            Event.objects.create(pet=pet, event_type='med', date=date(2026, 1, n + 1), cost=1000)
+            Event.objects.create(pet=pet, event_type='vacc', date=date(2026, 2, n + 1), next_date=date(2099, 1, 1), cost=2000)
+
+    def test_query_count_does_not_grow_with_pets(self):
+        self.add_pets(1)
+        with self.assertNumQueries(9):
+            response = self.client.get('/calendar/')
+        self.assertEqual(response.status_code, 200)
+        self.add_pets(5)
+        with self.assertNumQueries(9):
+            response = self.client.get('/calendar/')
+        self.assertEqual(len(response.context['last_events']), 6)
@@ -8,7 +8,11 @@ from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.utils import timezone
 from datetime import date
-from django.db.models import Sum
+from common_app.calendar_feed import InvalidWindow, calendar_etag, parse_date_window
+from common_app.instrumentation import query_budget
+from common_app.spending import category_summary, month_start, month_total
+from django.db.models import OuterRef, Q, Subquery
+from django.utils.cache import get_conditional_response
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 
@@ -20,7 +24,12 @@ class EventViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Event.objects.filter(pet__owner=self.request.user)
+        queryset = Event.objects.filter(pet__owner=self.request.user).select_related('pet')
+
+        # 캘린더 기간 필터링 (start/end가 있으면 기간 안의 기록과 다음 접종 예정일)
+        if self.action == 'list' and ('start' in self.request.query_params or 'end' in self.request.query_params):
+            start, end = parse_date_window(self.request)
+            queryset = queryset.filter(Q(date__gte=start, date__lt=end) | Q(next_date__gte=start, next_date__lt=end))
         
         # 예약 필터링
         is_reservation = self.request.query_params.get('is_reservation')
@@ -32,6 +41,20 @@ class EventViewSet(viewsets.ModelViewSet):
         
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        # 캘린더 데이터가 바뀌지 않았으면 직렬화하지 않고 304 반환
+        etag = calendar_etag(request)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+        try:
+            response = super().list(request, *args, **kwargs)
+        except InvalidWindow as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        response['ETag'] = etag
+        return response
+
     def perform_create(self, serializer):
         # 고양이 소유자 확인
         pet = Pet.objects.get(id=self.request.data.get('pet'))
@@ -50,33 +73,36 @@ class EventViewSet(viewsets.ModelViewSet):
 
 @ensure_csrf_cookie
 @login_required
+@query_budget(12)
 def calendar_view(request):
-    pets = Pet.objects.filter(owner=request.user)
+    # 반려동물별 마지막 기록 id를 서브쿼리로 함께 조회
+    pets = Pet.objects.filter(owner=request.user).annotate(
+        last_event_id=Subquery(Event.objects.filter(pet=OuterRef('pk')).order_by('-date').values('id')[:1]),
+    )
     next_vacc_list = []
     today = date.today()
     events = Event.objects.filter(pet__owner=request.user)
 
-    total_medical = events.filter(event_type='med').count()
-    total_vaccination = events.filter(event_type='vacc').count()
+    # 기록 수와 이번 달 비용은 월별 지출 집계(SpendingRollup)에서 조회
+    counts = category_summary(request.user, 'medical')
+    total_medical = counts.get('med', {}).get('count', 0)
+    total_vaccination = counts.get('vacc', {}).get('count', 0)
     upcoming_vacc = events.filter(event_type='vacc', next_date__gte=today).count()
-    total_cost = events.filter(date__year=today.year, date__month=today.month).aggregate(total=Sum('cost'))['total'] or 0
+    total_cost = month_total(request.user, 'medical', month_start(today))
 
-    for pet in pets:
-        # 미래의 모든 next_date
-        next_vaccs = Event.objects.filter(
-            pet=pet, event_type='vacc', next_date__isnull=False, next_date__gte=today
-        ).order_by('next_date')
-        for next_vacc in next_vaccs:
-            days_left = (next_vacc.next_date - today).days
-            next_vacc_list.append({
-                'pet_name': pet.name,
-                'next_date': next_vacc.next_date,
-                'days_left': days_left
-            })
+    # 미래의 모든 next_date (반려동물 이름순, 날짜순으로 한 번에 조회)
+    next_vaccs = events.filter(event_type='vacc', next_date__gte=today).order_by('pet__name', 'pet_id', 'next_date').values('pet__name', 'next_date')
+    for next_vacc in next_vaccs:
+        next_vacc_list.append({
+            'pet_name': next_vacc['pet__name'],
+            'next_date': next_vacc['next_date'],
+            'days_left': (next_vacc['next_date'] - today).days
+        })
     # 기존 last_events도 유지
     last_events = []
+    last_by_id = Event.objects.in_bulk([pet.last_event_id for pet in pets if pet.last_event_id])
     for pet in pets:
-        event = Event.objects.filter(pet=pet).order_by('-date').first()
+        event = last_by_id.get(pet.last_event_id)
         if event:
             last_events.append({
                 'pet_id': pet.id,
@@ -84,7 +110,7 @@ def calendar_view(request):
                 'event_type': event.get_event_type_display(),
                 'description': event.description
             })
-    medical_records = events.order_by('-date')
+    medical_records = events.select_related('pet').order_by('-date')
     return render(request, 'calendar_app/calendar.html', {
         'pets': pets,
         'last_events': last_events,
@@ -107,33 +133,33 @@ def calendar_stats(request):
     if pet_id and pet_id != 'all':
         events = events.filter(pet_id=pet_id)
     
+    pet_filter = pet_id if pet_id and pet_id != 'all' else None
+    counts = category_summary(request.user, 'medical', pet=pet_filter)
+    med_count = counts.get('med', {}).get('count', 0)
+    vacc_count = counts.get('vacc', {}).get('count', 0)
+
     # 이벤트 타입 필터 적용
     if event_type and event_type != 'all':
-        filtered_events = events.filter(event_type=event_type)
         if event_type == 'med':
-            total_medical = filtered_events.count()
+            total_medical = med_count
             total_vaccination = 0
             upcoming_vacc = 0
         elif event_type == 'vacc':
             total_medical = 0
-            total_vaccination = filtered_events.count()
-            upcoming_vacc = filtered_events.filter(next_date__gte=today).count()
+            total_vaccination = vacc_count
+            upcoming_vacc = events.filter(event_type='vacc', next_date__gte=today).count()
         else:
-            total_medical = events.filter(event_type='med').count()
-            total_vaccination = events.filter(event_type='vacc').count()
+            total_medical = med_count
+            total_vaccination = vacc_count
             upcoming_vacc = events.filter(event_type='vacc', next_date__gte=today).count()
     else:
-        total_medical = events.filter(event_type='med').count()
-        total_vaccination = events.filter(event_type='vacc').count()
+        total_medical = med_count
+        total_vaccination = vacc_count
         upcoming_vacc = events.filter(event_type='vacc', next_date__gte=today).count()
     
-    # 의료비는 타입 필터에 관계없이 해당 펫의 이번 달 전체 비용
-    cost_events = Event.objects.filter(pet__owner=request.user, date__year=today.year, date__month=today.month)
-    if pet_id and pet_id != 'all':
-        cost_events = cost_events.filter(pet_id=pet_id)
-    if event_type and event_type != 'all':
-        cost_events = cost_events.filter(event_type=event_type)
-    total_cost = cost_events.aggregate(total=Sum('cost'))['total'] or 0
+    # 의료비는 해당 펫의 이번 달 비용 (월별 지출 집계에서 조회)
+    cost_type = event_type if event_type and event_type != 'all' else None
+    total_cost = month_total(request.user, 'medical', month_start(today), pet=pet_filter, category=cost_type)
     
     return JsonResponse({
         'total_medical': total_medical,
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CareCalendarConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'care_calendar'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+from care_calendar.recurrence import BATCH_SIZE, OCCURRENCES_PER_SCHEDULE, roll_all_schedules
+
+class Command(BaseCommand):
+    help = '모든 사용자의 주기 관리 일정(CareEvent)을 오늘 기준으로 굴려 지난 예정일을 지우고 새 예정일(CareOccurrence)을 만듭니다. (매일 밤 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=OCCURRENCES_PER_SCHEDULE, help='일정마다 유지할 앞으로의 예정일 수')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='한 번에 처리할 일정 수')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        created, deleted = roll_all_schedules(count=options['count'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'케어 예정일 {created}건 생성 / {deleted}건 삭제 완료! ({time.perf_counter() - started:.2f}s)'
+        ))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('care_calendar', '0001_initial'),
+        ('common_app', '0008_spendingrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['user', 'start_time', 'end_time'], name='careevent_user_range_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['pet', 'start_time', 'end_time'], name='careevent_pet_range_idx'),
+        ),
+    ]
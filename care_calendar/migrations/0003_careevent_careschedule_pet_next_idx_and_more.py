@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('care_calendar', '0002_event_careevent_user_range_idx_and_more'),
+        ('common_app', '0009_calendarversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='careevent',
+            index=models.Index(fields=['pet', 'next_date'], name='careschedule_pet_next_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['pet', 'category', 'start_time'], name='careevent_pet_category_idx'),
+        ),
+    ]
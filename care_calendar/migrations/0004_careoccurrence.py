@@ -0,0 +1,75 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:04
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+# 마이그레이션 시점의 펼치기 규칙 (이후 recurrence 모듈이 바뀌어도 그대로 유지, 이후 변경은 roll_care_schedules가 맞춤)
+OCCURRENCES_PER_SCHEDULE = 6
+UNIT_DAYS = {'day': 1, 'week': 7}
+MAX_UNIT_DAYS = {**UNIT_DAYS, 'month': 31}
+
+
+def occurrence_date(schedule, sequence):
+    if schedule.unit == 'month':
+        return schedule.last_date + relativedelta(months=schedule.interval * sequence)
+    return schedule.last_date + timedelta(days=UNIT_DAYS[schedule.unit] * schedule.interval * sequence)
+
+
+def populate_care_occurrences(apps, schema_editor):
+    CareEvent = apps.get_model('care_calendar', 'CareEvent')
+    CareOccurrence = apps.get_model('care_calendar', 'CareOccurrence')
+    today = timezone.localdate()
+    rows = []
+    for schedule in CareEvent.objects.select_related('pet').order_by('id').iterator(chunk_size=500):
+        if not schedule.last_date or not schedule.interval or schedule.unit not in MAX_UNIT_DAYS:
+            continue
+        # 밀린 첫 예정일(1번) + 오늘 이후 OCCURRENCES_PER_SCHEDULE개
+        first = max(1, (today - schedule.last_date).days // (MAX_UNIT_DAYS[schedule.unit] * schedule.interval))
+        while occurrence_date(schedule, first) < today:
+            first += 1
+        sequences = list(range(first, first + OCCURRENCES_PER_SCHEDULE))
+        if first > 1:
+            sequences.append(1)
+        rows.extend(
+            CareOccurrence(
+                schedule_id=schedule.pk, owner_id=schedule.pet.owner_id, pet_id=schedule.pet_id,
+                care_type=schedule.care_type, sequence=sequence, due_date=occurrence_date(schedule, sequence),
+            )
+            for sequence in sequences
+        )
+    CareOccurrence.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('care_calendar', '0003_careevent_careschedule_pet_next_idx_and_more'),
+        ('common_app', '0009_calendarversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CareOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('care_type', models.CharField(choices=[('nail', '발톱깎기'), ('ear', '귀청소'), ('fur', '털정리'), ('brush', '양치하기')], max_length=20)),
+                ('sequence', models.PositiveIntegerField(help_text='last_date로부터 몇 번째 주기인지')),
+                ('due_date', models.DateField(verbose_name='예정일')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='care_occurrences', to=settings.AUTH_USER_MODEL)),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='care_occurrences', to='common_app.pet')),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='care_calendar.careevent')),
+            ],
+            options={
+                'ordering': ['due_date'],
+                'indexes': [models.Index(fields=['owner', 'due_date'], name='careoccurrence_owner_due_idx')],
+                'unique_together': {('schedule', 'sequence')},
+            },
+        ),
+        migrations.RunPython(populate_care_occurrences, migrations.RunPython.noop),
+    ]
@@ -29,6 +29,9 @@ class CareEvent(models.Model):
 
     class Meta:
         ordering = ['next_date']
+        indexes = [
+            models.Index(fields=['pet', 'next_date'], name='careschedule_pet_next_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         # next_date 자동 계산
@@ -45,6 +48,26 @@ class CareEvent(models.Model):
     def __str__(self):
         return f"{self.get_care_type_display()} - {self.pet.name} ({self.next_date})"
 
+# CareEvent 주기 일정을 펼친 예정일 (care_calendar.recurrence가 생성/갱신)
+class CareOccurrence(models.Model):
+    schedule = models.ForeignKey(CareEvent, on_delete=models.CASCADE, related_name='occurrences')
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='care_occurrences')
+    pet = models.ForeignKey(Pet, on_delete=models.CASCADE, related_name='care_occurrences')
+    care_type = models.CharField(max_length=20, choices=CareEvent.CARE_TYPE_CHOICES)
+    sequence = models.PositiveIntegerField(help_text='last_date로부터 몇 번째 주기인지')
+    due_date = models.DateField(verbose_name='예정일')
+
+    class Meta:
+        ordering = ['due_date']
+        unique_together = ('schedule', 'sequence')
+        indexes = [
+            # 사용자의 모든 반려동물에 대해 기간 안의 예정일을 한 번에 조회
+            models.Index(fields=['owner', 'due_date'], name='careoccurrence_owner_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_care_type_display()} - {self.pet_id} ({self.due_date})"
+
 class Event(models.Model):
     CATEGORY_CHOICES = [
         ('nail', '발톱깎기'),
@@ -63,6 +86,12 @@ class Event(models.Model):
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
 
     class Meta:
+        indexes = [
+            models.Index(fields=['user', 'start_time', 'end_time'], name='careevent_user_range_idx'),
+            models.Index(fields=['pet', 'start_time', 'end_time'], name='careevent_pet_range_idx'),
+            # 이전 관리 기록 조회 (반려동물 + 카테고리의 최근 날짜)
+            models.Index(fields=['pet', 'category', 'start_time'], name='careevent_pet_category_idx'),
+        ]
         verbose_name = '일정'
         verbose_name_plural = '일정들'
         ordering = ['-start_time']
@@ -0,0 +1,102 @@
+"""CareEvent(주기 관리 일정)의 반복 예정일을 CareOccurrence 테이블에 펼쳐 두는 엔진
+
+일정마다 last_date로부터 interval × k번째 날짜(k ≥ 1)를 순번(sequence) k와 함께 저장한다.
+- 아직 하지 않은 첫 예정일(k=1, 즉 next_date)은 날짜가 지나도 '밀린 관리'로 남기고
+- 오늘 이후 예정일은 OCCURRENCES_PER_SCHEDULE개를 유지한다.
+roll_care_schedules 명령(매일 밤)이 지난 예정일을 지우고 새 예정일을 bulk_create로 채우며,
+일정이 저장되면 시그널이 그 일정의 예정일만 다시 맞춘다.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+OCCURRENCES_PER_SCHEDULE = 6
+BATCH_SIZE = 500
+UNIT_DAYS = {'day': 1, 'week': 7}
+# 첫 예정일 추정용 단위별 최대 일수 (추정값이 실제보다 커지지 않도록)
+MAX_UNIT_DAYS = {**UNIT_DAYS, 'month': 31}
+
+
+def occurrence_date(schedule, sequence):
+    if schedule.unit == 'month':
+        return schedule.last_date + relativedelta(months=schedule.interval * sequence)
+    return schedule.last_date + timedelta(days=UNIT_DAYS[schedule.unit] * schedule.interval * sequence)
+
+
+def upcoming_sequences(schedule, today, count=OCCURRENCES_PER_SCHEDULE):
+    """유지할 {sequence: due_date} (밀린 첫 예정일 + 오늘 이후 count개)"""
+    if not schedule.last_date or not schedule.interval or schedule.unit not in MAX_UNIT_DAYS:
+        return {}
+    elapsed = (today - schedule.last_date).days
+    first = max(1, elapsed // (MAX_UNIT_DAYS[schedule.unit] * schedule.interval))
+    while occurrence_date(schedule, first) < today:
+        first += 1
+    wanted = {sequence: occurrence_date(schedule, sequence) for sequence in range(first, first + count)}
+    if first > 1:
+        wanted[1] = occurrence_date(schedule, 1)
+    return wanted
+
+
+def roll_schedules(schedules, today=None, count=OCCURRENCES_PER_SCHEDULE, apps=None):
+    """일정들의 예정일을 today 기준으로 맞춤 (지났거나 주기/반려동물/관리 종류가 바뀐 행 삭제, 빠진 행 bulk_create) → (생성, 삭제)"""
+    CareOccurrence = (apps or django_apps).get_model('care_calendar', 'CareOccurrence')
+    today = today or timezone.localdate()
+    schedules = list(schedules)
+    existing = defaultdict(dict)
+    for pk, schedule_id, sequence, *row in CareOccurrence.objects.filter(
+        schedule__in=[schedule.pk for schedule in schedules],
+    ).values_list('id', 'schedule_id', 'sequence', 'due_date', 'owner_id', 'pet_id', 'care_type'):
+        existing[schedule_id][sequence] = (pk, tuple(row))
+
+    stale, new = [], []
+    for schedule in schedules:
+        owner_id = schedule.pet.owner_id
+        wanted = upcoming_sequences(schedule, today, count)
+        current = existing[schedule.pk]
+        # 예정일뿐 아니라 소유자/반려동물/관리 종류가 바뀌어도 다시 만듦
+        fields = (owner_id, schedule.pet_id, schedule.care_type)
+        for sequence, (pk, row) in current.items():
+            if sequence not in wanted or row != (wanted[sequence], *fields):
+                stale.append(pk)
+        for sequence, due_date in wanted.items():
+            row = current.get(sequence)
+            if row is None or row[1] != (due_date, *fields):
+                new.append(CareOccurrence(
+                    schedule_id=schedule.pk, owner_id=owner_id, pet_id=schedule.pet_id,
+                    care_type=schedule.care_type, sequence=sequence, due_date=due_date,
+                ))
+    with transaction.atomic():
+        if stale:
+            CareOccurrence.objects.filter(id__in=stale).delete()
+        CareOccurrence.objects.bulk_create(new, batch_size=BATCH_SIZE)
+    return len(new), len(stale)
+
+
+def roll_all_schedules(today=None, count=OCCURRENCES_PER_SCHEDULE, batch_size=BATCH_SIZE, apps=None):
+    """모든 사용자의 주기 일정을 batch_size개씩 (id 순으로) 굴림 → (생성, 삭제)"""
+    CareEvent = (apps or django_apps).get_model('care_calendar', 'CareEvent')
+    created = deleted = 0
+    last_id = 0
+    while True:
+        batch = list(CareEvent.objects.select_related('pet').filter(id__gt=last_id).order_by('id')[:batch_size])
+        if not batch:
+            return created, deleted
+        batch_created, batch_deleted = roll_schedules(batch, today, count, apps)
+        created += batch_created
+        deleted += batch_deleted
+        last_id = batch[-1].pk
+
+
+def due_occurrences(user, days=7, today=None):
+    """오늘부터 days일 안의 예정일과 밀린 첫 예정일 (owner, due_date 인덱스 한 번의 범위 조회)"""
+    from .models import CareOccurrence
+
+    today = today or timezone.localdate()
+    return CareOccurrence.objects.filter(owner=user, due_date__lte=today + timedelta(days=days)).filter(
+        Q(due_date__gte=today) | Q(sequence=1)
+    ).order_by('due_date', 'pet_id')
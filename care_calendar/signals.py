@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+
+from .models import CareEvent
+from .recurrence import roll_schedules
+
+
+def roll_schedule_on_save(sender, instance, raw=False, **kwargs):
+    """주기 일정이 바뀌면 (마지막 관리일/주기) 해당 일정의 예정일을 다시 맞춤"""
+    if raw:
+        return
+    roll_schedules([instance])
+
+
+post_save.connect(roll_schedule_on_save, sender=CareEvent, dispatch_uid='care_occurrence_post_save')
@@ -1,3 +1,43 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.utils import timezone
+
+from common_app.models import Pet
+
+from .models import CareEvent, CareOccurrence
+from .recurrence import OCCURRENCES_PER_SCHEDULE, due_occurrences, roll_schedules
+
+
+class CareOccurrenceTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('owner', password='pw')
+        self.pet = Pet.objects.create(owner=self.user, name='코코', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+        self.other_pet = Pet.objects.create(owner=self.user, name='보리', pet_type='cat', breed='etc', birth_date=date(2021, 1, 1))
+        self.today = timezone.localdate()
+
+    def create_schedule(self, last_date, **kwargs):
+        return CareEvent.objects.create(**{
+            'pet': self.pet, 'care_type': 'nail', 'last_date': last_date, 'interval': 1, 'unit': 'week', **kwargs,
+        })
+
+    def test_save_keeps_overdue_first_and_upcoming(self):
+        schedule = self.create_schedule(self.today - timedelta(days=30))
+        rows = list(schedule.occurrences.order_by('sequence').values_list('sequence', 'due_date'))
+        self.assertEqual(rows[0], (1, self.today - timedelta(days=23)))
+        self.assertEqual(len(rows), OCCURRENCES_PER_SCHEDULE + 1)
+        self.assertTrue(all(due_date >= self.today for _, due_date in rows[1:]))
+        self.assertEqual(roll_schedules([schedule]), (0, 0))
 
-# Create your tests here.
+    def test_edit_care_type_and_pet_updates_occurrences(self):
+        schedule = self.create_schedule(self.today)
+        schedule.care_type = 'ear'
+        schedule.pet = self.other_pet
+        schedule.save()
+        self.assertEqual(
+            set(CareOccurrence.objects.filter(schedule=schedule).values_list('care_type', 'pet_id')),
+            {('ear', self.other_pet.pk)},
+        )
+        due = list(due_occurrences(self.user, days=7, today=self.today).values_list('care_type', 'pet_id'))
+        self.assertEqual(due, [('ear', self.other_pet.pk)])
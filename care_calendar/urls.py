@@ -6,6 +6,8 @@ app_name = 'care_calendar'
 urlpatterns = [
     path('', views.care_calendar, name='care_calendar'),
     path('events/', views.get_events, name='get_events'),
+    path('events/history/', views.get_event_history, name='get_event_history'),
+    path('due/', views.get_due_care, name='get_due_care'),
     path('events/create/', views.create_event, name='create_event'),
     path('events/<int:event_id>/update/', views.update_event, name='update_event'),
     path('events/<int:event_id>/delete/', views.delete_event, name='delete_event'),
@@ -1,10 +1,14 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import condition, require_http_methods
+from django.db.models import Q
 from django.utils import timezone
-from .models import Event
+from .models import CareEvent, Event
+from .recurrence import due_occurrences
 from common_app.models import Pet
+from common_app.calendar_feed import InvalidWindow, calendar_etag, parse_date_window
+from common_app.instrumentation import query_budget
 from datetime import datetime
 import json
 
@@ -14,27 +18,61 @@ def care_calendar(request):
     pets = Pet.objects.filter(owner=request.user)
     return render(request, 'care_calendar/care_calendar.html', {'pets': pets})
 
+def care_event_payload(events):
+    """values()로 조회한 케어 이벤트를 FullCalendar용 dict로 변환 (모델 인스턴스 생성 없음)"""
+    labels = dict(Event.CATEGORY_CHOICES)
+    return [{
+        'id': event['id'],
+        'title': labels.get(event['category'], event['category']),
+        'start': event['start_time'].isoformat(),
+        'description': event['description'],
+        'pet_id': event['pet_id'],
+        'pet_name': event['pet__name'],
+        'category': event['category'],
+    } for event in events]
+
+CARE_EVENT_FIELDS = ('id', 'start_time', 'description', 'pet_id', 'pet__name', 'category')
+
 @login_required
+@condition(etag_func=calendar_etag)
+@query_budget(6)
 def get_events(request):
-    """사용자의 케어 이벤트를 JSON 형식으로 반환합니다."""
+    """start~end 기간의 케어 이벤트를 JSON 형식으로 반환합니다. (start/end 필수)"""
     try:
-        events = Event.objects.filter(pet__owner=request.user)
-        event_list = []
-        
-        for event in events:
-            event_list.append({
-                'id': event.id,
-                'title': event.get_category_display(),
-                'start': event.start_time.isoformat(),
-                'description': event.description,
-                'pet_id': event.pet.id,
-                'pet_name': event.pet.name,
-                'category': event.category
-            })
+        start, end = parse_date_window(request)
+    except InvalidWindow as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    events = Event.objects.filter(pet__owner=request.user, start_time__lte=end).filter(
+        Q(end_time__gte=start) | Q(end_time__isnull=True, start_time__gte=start)
+    ).values(*CARE_EVENT_FIELDS)
+    return JsonResponse(care_event_payload(events), safe=False)
 
-        return JsonResponse(event_list, safe=False)
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+@login_required
+@condition(etag_func=calendar_etag)
+def get_event_history(request):
+    """대시보드/통계용 전체 케어 기록 (바뀌지 않았으면 304)"""
+    events = Event.objects.filter(pet__owner=request.user).values(*CARE_EVENT_FIELDS)
+    return JsonResponse(care_event_payload(events), safe=False)
+
+@login_required
+def get_due_care(request):
+    """모든 반려동물의 앞으로 days일(기본 7일) 안 주기 관리 예정일과 밀린 관리를 반환합니다."""
+    try:
+        days = min(max(int(request.GET.get('days', 7)), 0), 90)
+    except ValueError:
+        return JsonResponse({'error': 'days는 정수여야 합니다.'}, status=400)
+    today = timezone.localdate()
+    labels = dict(CareEvent.CARE_TYPE_CHOICES)
+    occurrences = due_occurrences(request.user, days, today).values('schedule_id', 'pet_id', 'pet__name', 'care_type', 'due_date')
+    return JsonResponse([{
+        'schedule_id': occurrence['schedule_id'],
+        'pet_id': occurrence['pet_id'],
+        'pet_name': occurrence['pet__name'],
+        'care_type': occurrence['care_type'],
+        'title': labels.get(occurrence['care_type'], occurrence['care_type']),
+        'due_date': occurrence['due_date'].isoformat(),
+        'overdue': occurrence['due_date'] < today,
+    } for occurrence in occurrences], safe=False)
 
 @login_required
 @require_http_methods(["POST"])
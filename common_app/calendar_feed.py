@@ -0,0 +1,96 @@
+"""캘린더 피드(FullCalendar가 화면을 바꿀 때마다 조회하는 API) 공통 처리
+
+- parse_window: start/end 파라미터(필수)를 날짜 범위로 변환
+- 사용자별 CalendarVersion은 일정 관련 모델이 바뀔 때 시그널로 증가하고,
+  calendar_etag를 @condition(etag_func=calendar_etag)에 넘기면 데이터가 그대로일 때
+  If-None-Match 요청에 직렬화 없이 304를 돌려준다.
+- 출처(SOURCE_NAMES)별 버전(CalendarSourceVersion)은 해당 출처가 바뀔 때만 증가해서
+  통합 피드(common_app.calendar_sources)가 출처별로 결과를 캐시할 수 있게 한다.
+  (DB에 두므로 다른 워커나 관리 명령에서 바꾼 내용도 모든 프로세스의 캐시 키에 반영됨)
+"""
+import hashlib
+from datetime import date, datetime, timedelta
+
+from django.db.models import F
+
+# 한 번에 조회할 수 있는 최대 기간 (FullCalendar 월/주/목록 보기는 6주 이내)
+MAX_WINDOW_DAYS = 400
+# 통합 캘린더 피드의 출처
+SOURCE_NAMES = ('food', 'care', 'medical', 'weight', 'purchase', 'forecast')
+
+
+class InvalidWindow(ValueError):
+    pass
+
+
+def parse_datetime_param(value):
+    """FullCalendar가 보내는 ISO 문자열 ('+'가 공백으로 바뀐 경우 포함) 또는 YYYY-MM-DD"""
+    if not value:
+        raise InvalidWindow('start와 end 파라미터가 필요합니다.')
+    try:
+        return datetime.fromisoformat(value.replace(' ', '+'))
+    except ValueError:
+        raise InvalidWindow(f'잘못된 날짜 형식입니다: {value}')
+
+
+def parse_window(request):
+    """(start, end) datetime 반환 (없거나 잘못되었거나 MAX_WINDOW_DAYS보다 길면 InvalidWindow)"""
+    start = parse_datetime_param(request.GET.get('start'))
+    end = parse_datetime_param(request.GET.get('end'))
+    if (start.tzinfo is None) != (end.tzinfo is None):
+        raise InvalidWindow('start와 end의 시간대 형식이 다릅니다.')
+    if end < start or end - start > timedelta(days=MAX_WINDOW_DAYS):
+        raise InvalidWindow(f'조회 기간은 0~{MAX_WINDOW_DAYS}일이어야 합니다.')
+    return start, end
+
+
+def parse_date_window(request):
+    start, end = parse_window(request)
+    return start.date(), end.date()
+
+
+def calendar_version(user_id):
+    from .models import CalendarVersion
+
+    return CalendarVersion.objects.filter(user_id=user_id).values_list('version', flat=True).first() or 0
+
+
+def bump_calendar_version(*user_ids, sources=None):
+    """사용자들의 캘린더 버전과 바뀐 출처(None이면 전체)의 버전을 1 증가 (행이 없으면 생성)"""
+    from .models import CalendarSourceVersion, CalendarVersion
+
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    sources = sources or SOURCE_NAMES
+    for model, extra in ((CalendarVersion, {}), (CalendarSourceVersion, {'source__in': sources})):
+        model.objects.filter(user_id__in=user_ids, **extra).update(version=F('version') + 1)
+    CalendarVersion.objects.bulk_create(
+        [CalendarVersion(user_id=user_id, version=1) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+    CalendarSourceVersion.objects.bulk_create(
+        [CalendarSourceVersion(user_id=user_id, source=source, version=1) for user_id in user_ids for source in sources],
+        ignore_conflicts=True,
+    )
+
+
+def source_versions(user_id, sources=SOURCE_NAMES):
+    """{출처: 버전} (행이 없는 출처는 0)"""
+    from .models import CalendarSourceVersion
+
+    versions = dict(CalendarSourceVersion.objects.filter(user_id=user_id, source__in=sources).values_list('source', 'version'))
+    return {source: versions.get(source, 0) for source in sources}
+
+
+def calendar_etag(request, *args, **kwargs):
+    """사용자의 캘린더 버전 + 오늘 날짜 + 요청 경로/파라미터로 만든 ETag (로그인하지 않았으면 None)
+
+    진행 중인 일정은 끝을 현재 시각으로 표시하므로 날짜가 바뀌면 ETag도 바뀌게 함
+    """
+    if not request.user.is_authenticated:
+        return None
+    version = calendar_version(request.user.pk)
+    digest = hashlib.md5(request.get_full_path().encode(), usedforsecurity=False).hexdigest()[:16]
+    return f'"cal-{request.user.pk}-{version}-{date.today():%Y%m%d}-{digest}"'
+
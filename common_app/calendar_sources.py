@@ -0,0 +1,205 @@
+"""여러 앱의 일정을 한 번의 요청으로 합쳐서 돌려주는 통합 캘린더 피드
+
+출처(SOURCES)마다 (user, start, end, pet_id) → 정규화된 이벤트 dict 목록 함수를 두고,
+결과는 출처별 버전(calendar_feed.source_versions)을 넣은 키로 따로 캐시한다.
+캐시에 없는 출처는 스레드 풀에서 동시에 조회한다 (스레드마다 DB 연결을 따로 쓰고 닫음).
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .calendar_feed import SOURCE_NAMES, source_versions
+
+try:  # 설치되어 있으면 orjson으로 직렬화 (없으면 표준 json)
+    import orjson
+except ImportError:
+    orjson = None
+
+# 출처별 결과 캐시 시간 (세대 값이 바뀌면 그 전에라도 새로 조회)
+SOURCE_CACHE_TIMEOUT = 60 * 60
+
+
+def event(source, pk, title, start, end=None, pet_id=None, pet_name=None, category='', all_day=True, **extra):
+    return {
+        'id': f'{source}-{pk}',
+        'source': source,
+        'title': title,
+        'start': start.isoformat(),
+        'end': end.isoformat() if end else None,
+        'allDay': all_day,
+        'pet_id': pet_id,
+        'pet_name': pet_name,
+        'category': category,
+        **extra,
+    }
+
+
+def food_events(user, start, end, pet_id=None):
+    from food_calendar.models import FoodEvent
+
+    start_dt = timezone.make_aware(datetime.combine(start, time.min))
+    end_dt = timezone.make_aware(datetime.combine(end, time.min))
+    qs = FoodEvent.objects.filter(user=user).filter(
+        Q(type='feed', end_time__isnull=True, start_time__lte=end_dt)
+        | Q(type='feed', end_time__isnull=False, end_time__gte=start_dt, start_time__lte=end_dt)
+        | Q(type='snack', start_time__gte=start_dt, start_time__lte=end_dt)
+    )
+    if pet_id:
+        qs = qs.filter(pet_id=pet_id)
+    now = timezone.now()
+    events = []
+    for row in qs.values('id', 'type', 'product_name', 'start_time', 'end_time', 'pet_id', 'pet__name'):
+        if row['type'] == 'feed':
+            icon, end_time = '🥣', row['end_time'] or now
+            label = row['product_name'] if row['end_time'] else f"{row['product_name']} (섭취중)"
+        else:
+            icon, end_time, label = '🍖', row['start_time'], row['product_name']
+        events.append(event(
+            'food', row['id'], f"{icon} {label} ({row['pet__name']})", row['start_time'], end_time,
+            pet_id=row['pet_id'], pet_name=row['pet__name'], category=row['type'], all_day=False,
+        ))
+    return events
+
+
+def care_events(user, start, end, pet_id=None):
+    from care_calendar.models import Event
+
+    labels = dict(Event.CATEGORY_CHOICES)
+    qs = Event.objects.filter(pet__owner=user, start_time__lt=end).filter(
+        Q(end_time__gte=start) | Q(end_time__isnull=True, start_time__gte=start)
+    )
+    if pet_id:
+        qs = qs.filter(pet_id=pet_id)
+    return [
+        event('care', row['id'], f"{labels.get(row['category'], row['category'])} ({row['pet__name']})",
+              row['start_time'], row['end_time'], pet_id=row['pet_id'], pet_name=row['pet__name'], category=row['category'])
+        for row in qs.values('id', 'category', 'start_time', 'end_time', 'pet_id', 'pet__name')
+    ]
+
+
+def medical_events(user, start, end, pet_id=None):
+    from calendar_app.models import Event
+
+    qs = Event.objects.filter(pet__owner=user).filter(
+        Q(date__gte=start, date__lt=end) | Q(next_date__gte=start, next_date__lt=end)
+    )
+    if pet_id:
+        qs = qs.filter(pet_id=pet_id)
+    events = []
+    for row in qs.values('id', 'event_type', 'date', 'next_date', 'is_reservation', 'hospital', 'pet_id', 'pet__name'):
+        kind = '진료' if row['event_type'] == 'med' else '예방접종'
+        common = {'pet_id': row['pet_id'], 'pet_name': row['pet__name'], 'hospital': row['hospital']}
+        if start <= row['date'] < end:
+            title = f"({row['pet__name']}) 예약{kind}" if row['is_reservation'] else f"{kind} ({row['pet__name']})"
+            events.append(event('medical', row['id'], title, row['date'], category=row['event_type'],
+                                is_reservation=row['is_reservation'], **common))
+        if row['event_type'] == 'vacc' and row['next_date'] and start <= row['next_date'] < end:
+            events.append(event('medical', f"next-{row['id']}", f"예정: {row['pet__name']} 예방접종", row['next_date'],
+                                category='next', **common))
+    return events
+
+
+def weight_events(user, start, end, pet_id=None):
+    from weight_tracker_app.models import Weight
+
+    qs = Weight.objects.filter(user=user, date__gte=start, date__lt=end)
+    if pet_id:
+        qs = qs.filter(pet_id=pet_id)
+    return [
+        event('weight', row['id'], f"⚖️ {float(row['weight']):g}kg ({row['pet__name'] or '-'})", row['date'],
+              pet_id=row['pet_id'], pet_name=row['pet__name'], category='weight', weight=float(row['weight']))
+        for row in qs.values('id', 'date', 'weight', 'pet_id', 'pet__name')
+    ]
+
+
+def purchase_events(user, start, end, pet_id=None):
+    from item_purchase_app.models import OtherPurchase
+
+    qs = OtherPurchase.objects.filter(user=user, purchase_date__gte=start, purchase_date__lt=end)
+    if pet_id:
+        qs = qs.filter(cat_id=pet_id)
+    return [
+        event('purchase', row['id'], f"🛍️ {row['product_name']} ({row['price']:,}원)", row['purchase_date'],
+              pet_id=row['cat_id'], pet_name=row['cat__name'], category=row['type'], price=row['price'])
+        for row in qs.values('id', 'purchase_date', 'product_name', 'price', 'type', 'cat_id', 'cat__name')
+    ]
+
+
+def forecast_events(user, start, end, pet_id=None):
+    from food_calendar.forecast import forecast_calendar_events, forecasts_in_window
+
+    last_day = date.fromordinal(end.toordinal() - 1)
+    events = []
+    for item in forecast_calendar_events(forecasts_in_window(user, start, last_day, pet_id), start, last_day):
+        kind = item.pop('type')
+        events.append({**item, 'id': f"forecast-{item['id']}", 'source': 'forecast', 'end': None, 'category': kind})
+    return events
+
+
+SOURCES = {
+    'food': food_events,
+    'care': care_events,
+    'medical': medical_events,
+    'weight': weight_events,
+    'purchase': purchase_events,
+    'forecast': forecast_events,
+}
+assert set(SOURCES) == set(SOURCE_NAMES)
+
+
+def start_sort_key(item):
+    """ISO start(날짜만 또는 시간대가 있는 시각)를 현재 시간대의 aware datetime으로 (날짜만 있으면 그날 0시)"""
+    start = datetime.fromisoformat(item['start'])
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start)
+    return start
+
+
+def source_cache_key(source, user_id, version, start, end, pet_id):
+    # food는 진행 중인 사료의 끝을 현재 시각으로 표시하므로 날짜별로 캐시
+    return f'calendar:src:{source}:{user_id}:{version}:{start.isoformat()}:{end.isoformat()}:{pet_id or "all"}:{date.today()}'
+
+
+def _load_source(source, user, start, end, pet_id):
+    try:
+        return SOURCES[source](user, start, end, pet_id)
+    finally:
+        # 작업 스레드에서 연 DB 연결 정리
+        connection.close()
+
+
+def collect_events(user, start, end, sources=SOURCE_NAMES, pet_id=None):
+    """[start, end) 기간의 출처별 이벤트를 합쳐 시작 시각 순으로 정렬"""
+    versions = source_versions(user.pk, sources)
+    keys = {source: source_cache_key(source, user.pk, versions[source], start, end, pet_id) for source in sources}
+    cached = cache.get_many(keys.values())
+    results = {source: cached[key] for source, key in keys.items() if key in cached}
+    missing = [source for source in sources if source not in results]
+
+    workers = getattr(settings, 'CALENDAR_FEED_WORKERS', 4)
+    # 트랜잭션 안(테스트 등)에서는 다른 스레드가 아직 커밋되지 않은 데이터를 볼 수 없으므로 순차 실행
+    if len(missing) > 1 and workers > 1 and not connection.in_atomic_block:
+        with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as executor:
+            futures = {source: executor.submit(_load_source, source, user, start, end, pet_id) for source in missing}
+            loaded = {source: future.result() for source, future in futures.items()}
+    else:
+        loaded = {source: SOURCES[source](user, start, end, pet_id) for source in missing}
+    if loaded:
+        cache.set_many({keys[source]: events for source, events in loaded.items()}, timeout=SOURCE_CACHE_TIMEOUT)
+        results.update(loaded)
+
+    merged = [item for source in sources for item in results[source]]
+    merged.sort(key=lambda item: (start_sort_key(item), item['source'], item['id']))
+    return merged
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
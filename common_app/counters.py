@@ -0,0 +1,103 @@
+"""게시글/댓글의 좋아요 수·댓글 수 비정규화 컬럼 관리
+
+- toggle_like: 좋아요 중간 테이블 행을 지우거나(취소) 만들고(좋아요) like_count를 F()로 증감
+  (삭제된 행 수와 unique 제약으로 판단하므로 동시에 눌러도 한 번만 반영되고, 좋아요한 사용자를 읽지 않음)
+- liked_ids: 화면에 보이는 객체 중 사용자가 좋아요한 id를 쿼리 한 번으로 조회
+- adjust: 댓글 생성/삭제 시그널에서 comment_count 증감
+- recount: 실제 행 수로 다시 계산 (recount_counters 명령)
+- save_edit_form: 수정 폼의 필드만 저장 (요청 시작 때 읽은 카운터 값으로 덮어쓰지 않도록)
+"""
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+# (앱, 모델, 카운터 필드, 관계 이름)
+COUNTERS = [
+    ('community_app', 'CommunityPost', 'like_count', 'likes'),
+    ('community_app', 'CommunityPost', 'comment_count', 'comments'),
+    ('community_app', 'CommunityComment', 'like_count', 'likes'),
+    ('community_app', 'CommunityReply', 'like_count', 'likes'),
+    ('photo_board_app', 'Post', 'like_count', 'likes'),
+    ('photo_board_app', 'Post', 'comment_count', 'comments'),
+]
+
+
+def like_membership(model):
+    """좋아요 중간 테이블과 (대상 FK, 사용자 FK) 필드 이름"""
+    field = model._meta.get_field('likes')
+    return field.remote_field.through, field.m2m_field_name(), field.m2m_reverse_field_name()
+
+
+def adjust(model, pk, field, delta):
+    # 집계가 어긋나 있어도 0 아래로 내려가지 않게
+    model.objects.filter(pk=pk).update(**{field: Greatest(F(field) + delta, Value(0))})
+
+
+def toggle_like(obj, user):
+    """좋아요 토글 → (liked, like_count)"""
+    model = type(obj)
+    through, source, target = like_membership(model)
+    membership = through.objects.filter(**{f'{source}_id': obj.pk, f'{target}_id': user.pk})
+    with transaction.atomic():
+        if membership.delete()[0]:
+            liked, delta = False, -1
+        else:
+            liked, delta = True, 1
+            try:
+                with transaction.atomic():
+                    through.objects.create(**{f'{source}_id': obj.pk, f'{target}_id': user.pk})
+            except IntegrityError:
+                # 같은 사용자의 다른 요청이 먼저 추가함
+                delta = 0
+        if delta:
+            adjust(model, obj.pk, 'like_count', delta)
+        return liked, model.objects.filter(pk=obj.pk).values_list('like_count', flat=True).get()
+
+
+def is_liked(obj, user):
+    if not user.is_authenticated:
+        return False
+    through, source, target = like_membership(type(obj))
+    return through.objects.filter(**{f'{source}_id': obj.pk, f'{target}_id': user.pk}).exists()
+
+
+def liked_ids(model, user, ids):
+    """ids 중 user가 좋아요한 id 집합"""
+    if not user.is_authenticated:
+        return set()
+    through, source, target = like_membership(model)
+    return set(through.objects.filter(**{f'{source}_id__in': ids, f'{target}_id': user.pk}).values_list(f'{source}_id', flat=True))
+
+
+def save_edit_form(form):
+    """ModelForm의 필드(+ updated_at)만 UPDATE → 저장한 객체"""
+    instance = form.save(commit=False)
+    update_fields = list(form._meta.fields)
+    if any(field.name == 'updated_at' for field in instance._meta.concrete_fields):
+        update_fields.append('updated_at')
+    instance.save(update_fields=update_fields)
+    form.save_m2m()
+    return instance
+
+
+def count_subquery(model, relation):
+    field = model._meta.get_field(relation)
+    if field.many_to_many:
+        related, fk = field.remote_field.through, field.m2m_field_name()
+    else:
+        related, fk = field.related_model, field.field.name
+    counts = related.objects.filter(**{fk: OuterRef('pk')}).order_by().values(fk).annotate(n=Count('*')).values('n')
+    return Coalesce(Subquery(counts), 0)
+
+
+def recount(apps=None, app_label=None):
+    """카운터를 실제 행 수로 다시 계산 → {'앱.모델.필드': 갱신한 행 수}"""
+    apps = apps or global_apps
+    updated = {}
+    for label, model_name, field, relation in COUNTERS:
+        if app_label and label != app_label:
+            continue
+        model = apps.get_model(label, model_name)
+        updated[f'{label}.{model_name}.{field}'] = model.objects.update(**{field: count_subquery(model, relation)})
+    return updated
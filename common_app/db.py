@@ -0,0 +1,16 @@
+"""여러 앱에서 쓰는 DB 함수 식"""
+from django.db.models import Func, IntegerField
+
+
+class DaysBetween(Func):
+    """두 날짜 사이의 일 수 (end - start, DB별 날짜 연산 사용)"""
+    arity = 2
+    arg_joiner = ' - '
+    template = '(%(expressions)s)'
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='CAST(julianday(%(expressions)s) AS INTEGER)', arg_joiner=') - julianday(', **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function='DATEDIFF', template='%(function)s(%(expressions)s)', arg_joiner=', ', **extra_context)
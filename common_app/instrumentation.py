@@ -0,0 +1,132 @@
+"""뷰별 SQL 쿼리 수/DB 시간/템플릿 렌더링 시간/응답 크기 계측
+
+settings.MIDDLEWARE에 QueryInstrumentationMiddleware를 추가하면 모든 요청에 대해
+Server-Timing 헤더와 구조화 로그(common_app.instrumentation)를 남긴다.
+뷰에 @query_budget(n)을 붙이면 쿼리 수가 n을 넘을 때 경고 로그를 남기고,
+settings.QUERY_BUDGET_RAISE = True(테스트용)이면 QueryBudgetExceeded를 발생시킨다.
+"""
+import contextvars
+import functools
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('common_app.instrumentation')
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """@query_budget으로 지정한 쿼리 수 초과 (QUERY_BUDGET_RAISE = True일 때)"""
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper로 등록되어 모든 SQL 실행 시간을 누적
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+
+def query_budget(max_queries):
+    """뷰가 실행할 수 있는 최대 쿼리 수 지정 (QueryInstrumentationMiddleware가 검사)"""
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(*args, **kwargs):
+            return view_func(*args, **kwargs)
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+
+_template_timing_installed = False
+
+
+def install_template_timing():
+    """최상위 템플릿 렌더링 시간을 현재 요청의 RequestMetrics에 누적하도록 한 번만 패치"""
+    global _template_timing_installed
+    if _template_timing_installed:
+        return
+    from django.template.backends.django import Template
+
+    original_render = Template.render
+
+    @functools.wraps(original_render)
+    def timed_render(self, *args, **kwargs):
+        metrics = _current.get()
+        if metrics is None:
+            return original_render(self, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return original_render(self, *args, **kwargs)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+
+    Template.render = timed_render
+    _template_timing_installed = True
+
+
+class QueryInstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install_template_timing()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        request.query_budget = None
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        size = None if response.streaming else len(response.content)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+            f'tpl;dur={metrics.template_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(getattr(request, 'resolver_match', None), 'view_name', None),
+            'status': response.status_code,
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 1),
+            'template_ms': round(metrics.template_time * 1000, 1),
+            'total_ms': round(total * 1000, 1),
+            'response_bytes': size,
+            'query_budget': request.query_budget,
+        }
+        logger.info(json.dumps(record, ensure_ascii=False), extra={'metrics': record})
+
+        budget = request.query_budget
+        if budget is not None and metrics.queries > budget:
+            message = f"{record['view'] or request.path}: 쿼리 {metrics.queries}개 실행 (허용 {budget}개)"
+            if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message, extra={'metrics': record})
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # 함수형 뷰는 @query_budget, 클래스형 뷰(DRF 포함)는 클래스 속성 query_budget
+        view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+        request.query_budget = getattr(view_func, 'query_budget', getattr(view_class, 'query_budget', None))
+        return None
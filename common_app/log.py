@@ -0,0 +1,72 @@
+"""settings.LOGGING에서 사용하는 JSON 포매터, 샘플링 필터, 큐 핸들러
+
+- JsonFormatter: 한 줄짜리 JSON 로그 (extra로 넘긴 필드 포함)
+- SamplingFilter: WARNING 미만 로그는 rate 비율만 남김
+- QueueStreamHandler: 레코드를 큐에 넣기만 하고 별도 스레드(QueueListener)가 출력해서
+  요청 스레드가 로그 출력 때문에 막히지 않도록 함 (큐가 가득 차면 버림)
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 넘긴 값으로 보고 JSON에 포함)
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in payload:
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """WARNING 이상은 항상, 그 밑은 rate 비율만 통과"""
+
+    def __init__(self, rate=1.0, name=''):
+        super().__init__(name)
+        self.rate = float(rate)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class QueueStreamHandler(QueueHandler):
+    """큐에 넣은 레코드를 백그라운드 스레드의 StreamHandler가 출력"""
+
+    def __init__(self, maxsize=10000, stream=None):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, logging.StreamHandler(stream))
+        self.listener.start()
+        atexit.register(self.stop_listener)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop_listener(self):
+        # 남은 레코드를 모두 출력한 뒤 스레드 종료 (여러 번 호출돼도 안전)
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def close(self):
+        self.stop_listener()
+        super().close()
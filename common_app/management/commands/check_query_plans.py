@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from common_app.query_plans import check_views, seed_data
+
+class Command(BaseCommand):
+    help = '테스트 DB에 테이블별 합성 데이터(기본 10만 행)를 만들고 주요 뷰의 SELECT마다 EXPLAIN을 실행해 전체 테이블 스캔이 있으면 실패합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='테이블별 합성 행 수')
+        parser.add_argument('--min-rows', type=int, default=1000, help='이보다 행이 적은 테이블의 전체 스캔은 무시')
+        parser.add_argument('--seed', type=int, default=0, help='합성 데이터 난수 시드')
+        parser.add_argument('--view', action='append', dest='views', help='특정 뷰만 검사 (여러 번 지정 가능)')
+        parser.add_argument('--show-plan', action='store_true', help='전체 스캔 쿼리의 실행 계획 출력')
+
+    def handle(self, *args, **options):
+        def log(result):
+            mark = self.style.ERROR('FULL SCAN') if result['full_scans'] else self.style.SUCCESS('ok')
+            self.stdout.write(f"{result['name']:<22} status={result['status']} queries={result['queries']:>3} {mark}")
+            for scan in result['full_scans']:
+                self.stdout.write(f"    {scan['table']}: {scan['sql'][:200]}")
+                if options['show_plan']:
+                    for row in scan['plan']:
+                        self.stdout.write(f'      {row}')
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            started = time.perf_counter()
+            user, pet = seed_data(rows=options['rows'], seed=options['seed'])
+            self.stdout.write(f"합성 데이터 생성: 테이블별 {options['rows']}행 ({time.perf_counter() - started:.1f}s, {connection.vendor})")
+            results = check_views(user, pet, min_rows=options['min_rows'], views=options['views'], log=log)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        failed = [result['name'] for result in results if result['full_scans']]
+        if failed:
+            raise CommandError(f"전체 테이블 스캔이 있는 뷰: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f'{len(results)}개 뷰 모두 인덱스를 사용합니다.'))
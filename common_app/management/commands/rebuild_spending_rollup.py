@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from common_app.spending import rebuild_spending
+
+class Command(BaseCommand):
+    help = '사료/기타 구매/병원 기록으로 월별 지출 집계(SpendingRollup)를 다시 생성합니다. (bulk 수정 등 시그널을 거치지 않은 변경 반영용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='특정 사용자 ID만 다시 집계')
+
+    def handle(self, *args, **options):
+        created = rebuild_spending(user_id=options['user'])
+        self.stdout.write(self.style.SUCCESS(f'지출 집계 {created}건 생성 완료!'))
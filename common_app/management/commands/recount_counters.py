@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from common_app.counters import recount
+
+class Command(BaseCommand):
+    help = '게시글/댓글의 좋아요 수와 댓글 수를 실제 행 수로 다시 계산합니다. (사용자 삭제, bulk 변경 등 카운터를 거치지 않은 변경 반영용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--app', help='특정 앱만 다시 계산 (community_app, photo_board_app)')
+
+    def handle(self, *args, **options):
+        for name, count in recount(app_label=options['app']).items():
+            self.stdout.write(f'{name}: {count}행')
+        self.stdout.write(self.style.SUCCESS('카운터 재계산 완료!'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from common_app.scheduler import JOBS, Scheduler, ensure_jobs
+
+class Command(BaseCommand):
+    help = '예방접종/케어/사료 재주문 리마인더를 적재하고 알림을 발송하는 주기 작업 워커를 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='지금 실행할 작업만 한 번 실행하고 종료 (cron용)')
+
+    def handle(self, *args, **options):
+        ensure_jobs(JOBS)
+        scheduler = Scheduler(JOBS)
+        if options['once']:
+            scheduler.load()
+            for name, result in scheduler.run_pending():
+                self.stdout.write(f'{name}: {result}')
+            self.stdout.write(self.style.SUCCESS('예정된 작업 실행 완료!'))
+            return
+        self.stdout.write(f"작업 {len(JOBS)}개 스케줄러 시작 (Ctrl+C로 종료)")
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            self.stdout.write('스케줄러 종료')
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:39
+
+from datetime import date
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, FloatField, Max, Min, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+
+# 마이그레이션 시점의 출처별 (모델, 사용자, 반려동물, 날짜, 카테고리, 금액) 필드 (이후 spending.SOURCES가 바뀌어도 그대로 유지)
+ROLLUP_SOURCES = {
+    'food': (('food_calendar', 'FoodEvent'), 'user_id', 'pet_id', 'purchase_date', 'type', 'price'),
+    'other': (('item_purchase_app', 'OtherPurchase'), 'user_id', 'cat_id', 'purchase_date', 'type', 'price'),
+    'medical': (('calendar_app', 'Event'), 'pet__owner_id', 'pet_id', 'date', 'event_type', 'cost'),
+}
+
+
+def populate_spending_rollup(apps, schema_editor):
+    SpendingRollup = apps.get_model('common_app', 'SpendingRollup')
+    rows = []
+    for source, (model, user, pet, date_field, category, amount) in ROLLUP_SOURCES.items():
+        grouped = apps.get_model(*model).objects.filter(**{f'{date_field}__isnull': False}).annotate(
+            rollup_month=TruncMonth(date_field),
+        ).values(user, pet, 'rollup_month', category).annotate(
+            total=Coalesce(Sum(amount), 0.0, output_field=FloatField()),
+            count=Count('id'),
+            min_amount=Coalesce(Min(amount), 0.0, output_field=FloatField()),
+            max_amount=Coalesce(Max(amount), 0.0, output_field=FloatField()),
+        ).order_by()
+        for row in grouped:
+            month = row['rollup_month']
+            rows.append(SpendingRollup(
+                user_id=row[user],
+                pet_id=row[pet],
+                month=date(month.year, month.month, 1),
+                source=source,
+                category=row[category] or '',
+                total=row['total'],
+                count=row['count'],
+                min_amount=row['min_amount'],
+                max_amount=row['max_amount'],
+            ))
+    SpendingRollup.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_app', '0007_alter_pet_options'),
+        ('calendar_app', '0004_event_is_reservation'),
+        ('food_calendar', '0007_alter_foodevent_price'),
+        ('item_purchase_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpendingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='월(1일)')),
+                ('source', models.CharField(choices=[('food', '사료/간식'), ('other', '기타 구매'), ('medical', '병원/예방접종')], max_length=10)),
+                ('category', models.CharField(blank=True, max_length=50)),
+                ('total', models.FloatField(default=0)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('min_amount', models.FloatField(default=0)),
+                ('max_amount', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='spending_rollups', to='common_app.pet')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='spending_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'source', 'month'], name='spending_rollup_month_idx')],
+                'unique_together': {('user', 'pet', 'month', 'source', 'category')},
+            },
+        ),
+        migrations.RunPython(populate_spending_rollup, migrations.RunPython.noop),
+    ]
@@ -95,3 +95,106 @@ class Pet(models.Model):
             if self.breed == choice_value:
                 return choice_label
         return self.breed
+
+class SpendingRollup(models.Model):
+    """사용자 × 반려동물 × 월 × 출처 × 카테고리별 지출 집계 (common_app.spending이 시그널로 갱신)"""
+    SOURCE_CHOICES = [
+        ('food', '사료/간식'),
+        ('other', '기타 구매'),
+        ('medical', '병원/예방접종'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='spending_rollups')
+    pet = models.ForeignKey(Pet, on_delete=models.CASCADE, related_name='spending_rollups')
+    month = models.DateField(verbose_name='월(1일)')
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    category = models.CharField(max_length=50, blank=True)
+    total = models.FloatField(default=0)
+    count = models.PositiveIntegerField(default=0)
+    min_amount = models.FloatField(default=0)
+    max_amount = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'pet', 'month', 'source', 'category')
+        indexes = [
+            models.Index(fields=['user', 'source', 'month'], name='spending_rollup_month_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.pet_id} {self.month:%Y-%m} {self.source}/{self.category}: {self.total}"
+
+
+class CalendarVersion(models.Model):
+    """사용자별 캘린더 데이터 버전 (일정이 바뀔 때마다 증가, 캘린더 피드의 ETag에 사용)"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='calendar_version')
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id}: v{self.version}"
+
+
+class CalendarSourceVersion(models.Model):
+    """사용자 × 통합 캘린더 피드 출처별 데이터 버전 (출처별 결과 캐시 키에 사용, 모든 프로세스가 같은 값을 봄)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='calendar_source_versions')
+    source = models.CharField(max_length=20)
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'source')
+
+    def __str__(self):
+        return f"{self.user_id}/{self.source}: v{self.version}"
+
+
+class ScheduledJob(models.Model):
+    """주기 작업 (run_scheduler 워커가 next_run_at 순으로 힙에 올려 실행, common_app.scheduler 참고)"""
+    name = models.CharField(max_length=50, unique=True)
+    interval_seconds = models.PositiveIntegerField()
+    next_run_at = models.DateTimeField(db_index=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_duration_ms = models.FloatField(default=0)
+    last_result = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        ordering = ['next_run_at']
+
+    def __str__(self):
+        return f"{self.name} (다음 실행: {self.next_run_at})"
+
+
+class Notification(models.Model):
+    """발송 대기/완료 알림 (dedupe_key가 같은 알림은 한 번만 생성, common_app.notifications 참고)"""
+    KIND_CHOICES = [
+        ('vaccination', '예방접종'),
+        ('care', '케어'),
+        ('feed', '사료 재주문'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', '대기'),
+        ('sent', '발송'),
+        ('skipped', '건너뜀'),
+        ('failed', '실패'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    title = models.CharField(max_length=200)
+    message = models.TextField(blank=True)
+    due_date = models.DateField(null=True, blank=True)
+    dedupe_key = models.CharField(max_length=100, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # 발송 워커가 대기 중인 알림을 오래된 순으로 조회
+            models.Index(fields=['status', 'id'], name='notification_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.kind}: {self.title} ({self.status})"
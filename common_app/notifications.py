@@ -0,0 +1,150 @@
+"""알림 적재(enqueue)와 발송(deliver)
+
+- enqueue: 알림 목록을 dedupe_key 기준으로 중복을 걸러 bulk_create (이미 있는 키는 건너뜀)
+- deliver_pending: 대기 중인 알림을 batch_size개씩 사용자별로 묶어 settings.NOTIFICATION_BACKEND로 발송
+  (사용자당 한 통, 실패하면 MAX_ATTEMPTS번까지 다시 시도)
+
+백엔드는 send(user, notifications)만 구현하면 되고, 설정에 점으로 구분한 경로로 지정한다.
+- EmailBackend: send_mass_mail로 한 번의 SMTP 연결에 여러 사용자 메일 발송
+- FileBackend: NOTIFICATION_FILE_PATH에 JSON 한 줄씩 기록 (로컬 개발용)
+- ConsoleBackend: 로그로만 출력
+"""
+import json
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_BATCH_SIZE = 500
+MAX_ATTEMPTS = 3
+
+
+class NotificationBackend:
+    """send_batch({user: [notification, ...]}) → 발송한 사용자 id 집합"""
+
+    def send_batch(self, grouped):
+        sent = set()
+        for user, notifications in grouped.items():
+            if self.send(user, notifications):
+                sent.add(user.pk)
+        return sent
+
+    def send(self, user, notifications):
+        raise NotImplementedError
+
+    @staticmethod
+    def render(user, notifications):
+        subject = notifications[0].title if len(notifications) == 1 else f'[반려동물 일정] 알림 {len(notifications)}건'
+        lines = [f'안녕하세요, {user.username}님.', '']
+        for notification in notifications:
+            due = f' ({notification.due_date:%Y-%m-%d})' if notification.due_date else ''
+            lines.append(f'- {notification.title}{due}')
+            if notification.message:
+                lines.append(f'  {notification.message}')
+        return subject, '\n'.join(lines)
+
+
+class ConsoleBackend(NotificationBackend):
+    def send(self, user, notifications):
+        subject, body = self.render(user, notifications)
+        logger.info('notification', extra={'user_id': user.pk, 'subject': subject, 'count': len(notifications)})
+        return True
+
+
+class FileBackend(NotificationBackend):
+    def send_batch(self, grouped):
+        path = getattr(settings, 'NOTIFICATION_FILE_PATH', 'notifications.jsonl')
+        with open(path, 'a', encoding='utf-8') as f:
+            for user, notifications in grouped.items():
+                subject, body = self.render(user, notifications)
+                f.write(json.dumps({
+                    'time': timezone.now().isoformat(),
+                    'user_id': user.pk,
+                    'subject': subject,
+                    'body': body,
+                    'notification_ids': [notification.pk for notification in notifications],
+                }, ensure_ascii=False) + '\n')
+        return {user.pk for user in grouped}
+
+
+class EmailBackend(NotificationBackend):
+    def send_batch(self, grouped):
+        messages, users = [], []
+        for user, notifications in grouped.items():
+            if not user.email:
+                continue
+            subject, body = self.render(user, notifications)
+            messages.append((subject, body, settings.DEFAULT_FROM_EMAIL, [user.email]))
+            users.append(user.pk)
+        if messages:
+            send_mass_mail(messages, fail_silently=False)
+        return set(users)
+
+
+def get_backend():
+    return import_string(getattr(settings, 'NOTIFICATION_BACKEND', 'common_app.notifications.ConsoleBackend'))()
+
+
+def enqueue(notifications, batch_size=1000):
+    """dedupe_key가 없는 알림만 생성 → 새로 만든 수"""
+    from .models import Notification
+
+    notifications = {notification.dedupe_key: notification for notification in notifications}
+    if not notifications:
+        return 0
+    existing = set()
+    keys = list(notifications)
+    for start in range(0, len(keys), batch_size):
+        existing.update(Notification.objects.filter(dedupe_key__in=keys[start:start + batch_size]).values_list('dedupe_key', flat=True))
+    new = [notification for key, notification in notifications.items() if key not in existing]
+    # 다른 워커가 동시에 같은 키를 넣은 경우는 unique 제약으로 무시
+    Notification.objects.bulk_create(new, batch_size=batch_size, ignore_conflicts=True)
+    return len(new)
+
+
+def deliver_pending(batch_size=DELIVERY_BATCH_SIZE, backend=None):
+    """대기 중인 알림을 모두 발송 → {'sent', 'skipped', 'failed'} 건수"""
+    from .models import Notification
+
+    backend = backend or get_backend()
+    stats = {'sent': 0, 'skipped': 0, 'failed': 0}
+    last_id = 0
+    while True:
+        batch = list(Notification.objects.filter(status='pending', id__gt=last_id).select_related('user').order_by('id')[:batch_size])
+        if not batch:
+            return stats
+        last_id = batch[-1].pk
+        grouped = defaultdict(list)
+        for notification in batch:
+            grouped[notification.user].append(notification)
+        try:
+            sent_users = backend.send_batch(grouped)
+        except Exception:
+            logger.exception('notification delivery failed', extra={'count': len(batch)})
+            sent_users = set()
+            failed_ids = {notification.pk for notification in batch}
+        else:
+            failed_ids = set()
+
+        now = timezone.now()
+        sent_ids = [notification.pk for notification in batch if notification.user_id in sent_users]
+        skipped_ids = [notification.pk for notification in batch if notification.user_id not in sent_users and not failed_ids]
+        Notification.objects.filter(pk__in=sent_ids).update(status='sent', sent_at=now)
+        # 받을 주소가 없는 사용자
+        Notification.objects.filter(pk__in=skipped_ids).update(status='skipped')
+        failed = [notification for notification in batch if notification.pk in failed_ids]
+        for notification in failed:
+            notification.attempts += 1
+            notification.status = 'failed' if notification.attempts >= MAX_ATTEMPTS else 'pending'
+        Notification.objects.bulk_update(failed, ['attempts', 'status'])
+        stats['sent'] += len(sent_ids)
+        stats['skipped'] += len(skipped_ids)
+        stats['failed'] += len(failed_ids)
+        if failed_ids:
+            # 실패한 배치는 다음 실행 때 다시 시도
+            return stats
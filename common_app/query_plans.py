@@ -0,0 +1,235 @@
+"""자주 쓰는 뷰가 실행하는 SELECT의 실행 계획(EXPLAIN) 검사
+
+check_query_plans 명령이 테스트 DB에 사용자/반려동물과 테이블별 합성 행(기본 10만 행)을 만들고,
+hot_views()의 URL을 test client로 호출하면서 실행된 SELECT마다 EXPLAIN을 실행해
+행이 많은 테이블을 인덱스 없이 전체 스캔하는 쿼리를 찾는다. (SQLite, MySQL 지원)
+"""
+import random
+import re
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+
+from .models import Pet
+
+PLAN_USERNAME = 'plan-check'
+PETS_PER_USER = 2
+# 사용자 한 명당 테이블별 평균 행 수 (rows / ROWS_PER_USER명의 사용자를 만듦)
+ROWS_PER_USER = 100
+HISTORY_DAYS = 3 * 365
+BATCH_SIZE = 2000
+
+# SQLite EXPLAIN QUERY PLAN에서 인덱스를 쓰지 않는 전체 스캔 ("SCAN t USING INDEX ..."는 제외)
+SQLITE_FULL_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+
+
+def seed_data(rows=100000, seed=0):
+    """테이블별로 rows개의 합성 행을 bulk_create로 생성하고 검사에 쓸 (user, pet) 반환"""
+    from calendar_app.models import Event as MedicalEvent
+    from care_calendar.models import CareEvent, Event as CareCalendarEvent
+    from care_calendar.recurrence import roll_all_schedules
+    from community_app.models import CommunityPost
+    from food_calendar.models import FoodEvent
+    from item_purchase_app.models import OtherPurchase
+    from item_purchase_app.stats import CATEGORY_LABELS
+    from photo_board_app.models import Post
+    from weight_tracker_app.models import Weight
+
+    rng = random.Random(seed)
+    n_users = max(1, rows // ROWS_PER_USER)
+    User.objects.bulk_create([
+        User(username=PLAN_USERNAME if i == 0 else f'{PLAN_USERNAME}-{i}', password='!')
+        for i in range(n_users)
+    ], batch_size=BATCH_SIZE)
+    user_ids = list(User.objects.filter(username__startswith=PLAN_USERNAME).order_by('id').values_list('id', flat=True))
+    Pet.objects.bulk_create([
+        Pet(owner_id=user_id, name=f'펫{user_id}-{n}', pet_type=rng.choice(['dog', 'cat']), breed='etc', birth_date=date(2020, 1, 1))
+        for user_id in user_ids
+        for n in range(PETS_PER_USER)
+    ], batch_size=BATCH_SIZE)
+    pets = list(Pet.objects.filter(owner_id__in=user_ids).order_by('id').values_list('id', 'owner_id'))
+
+    today = date.today()
+
+    def random_day():
+        return today - timedelta(days=rng.randrange(HISTORY_DAYS))
+
+    def rows_for(build):
+        return [build(*pets[rng.randrange(len(pets))]) for _ in range(rows)]
+
+    def food_event(pet_id, user_id):
+        start = timezone.make_aware(datetime.combine(random_day(), time(9)))
+        kind = rng.choice(['feed', 'feed', 'snack'])
+        end = start + timedelta(days=rng.randint(20, 60)) if kind == 'feed' and rng.random() < 0.95 else None
+        return FoodEvent(
+            user_id=user_id, pet_id=pet_id, type=kind, product_name=f'상품{rng.randrange(500)}',
+            quantity_kg=rng.choice([1, 2, 5]), start_time=start, end_time=end if kind == 'feed' else start,
+            purchase_date=start.date(), price=rng.randint(5, 80) * 1000,
+        )
+
+    def medical_event(pet_id, user_id):
+        day = random_day()
+        kind = rng.choice(['vacc', 'med'])
+        return MedicalEvent(
+            pet_id=pet_id, event_type=kind, date=day, next_date=day + timedelta(days=365) if kind == 'vacc' else None,
+            hospital=f'병원{rng.randrange(50)}', cost=rng.randint(1, 50) * 10000, is_reservation=rng.random() < 0.1,
+        )
+
+    def care_event(pet_id, user_id):
+        day = random_day()
+        return CareCalendarEvent(user_id=user_id, pet_id=pet_id, category=rng.choice(['nail', 'ear', 'brush', 'fur']), start_time=day, end_time=day)
+
+    def care_schedule(pet_id, user_id):
+        day = random_day()
+        weeks = rng.randint(1, 8)
+        return CareEvent(pet_id=pet_id, care_type=rng.choice(['nail', 'ear', 'brush', 'fur']), last_date=day, interval=weeks, unit='week', next_date=day + timedelta(weeks=weeks))
+
+    def other_purchase(pet_id, user_id):
+        return OtherPurchase(
+            user_id=user_id, cat_id=pet_id, purchase_date=random_day(), price=rng.randint(1, 100) * 1000,
+            type=rng.choice(CATEGORY_LABELS), product_name=f'용품{rng.randrange(500)}',
+        )
+
+    def community_post(pet_id, user_id):
+        return CommunityPost(title='제목', content='내용', author_id=user_id)
+
+    def photo_post(pet_id, user_id):
+        return Post(title='제목', content='내용', author_id=user_id, pet_id=pet_id, image='post_images/plan.jpg')
+
+    for model, build in [
+        (FoodEvent, food_event), (MedicalEvent, medical_event), (CareCalendarEvent, care_event), (CareEvent, care_schedule),
+        (OtherPurchase, other_purchase), (CommunityPost, community_post), (Post, photo_post),
+    ]:
+        model.objects.bulk_create(rows_for(build), batch_size=BATCH_SIZE)
+
+    # 게시글의 created_at은 auto_now_add라 bulk_create 시 모두 현재 시각이 되므로 작성일을 따로 분산
+    now = timezone.now()
+    for model in (CommunityPost, Post):
+        posts = list(model.objects.only('id'))
+        for post in posts:
+            post.created_at = now - timedelta(minutes=rng.randrange(HISTORY_DAYS * 24 * 60))
+        model.objects.bulk_update(posts, ['created_at'], batch_size=BATCH_SIZE)
+
+    # 체중은 (user, pet, date)가 유일해야 하므로 반려동물마다 하루씩 거슬러 올라가며 생성
+    Weight.objects.bulk_create([
+        Weight(user_id=pets[i % len(pets)][1], pet_id=pets[i % len(pets)][0], date=today - timedelta(days=i // len(pets)), weight=rng.randint(30, 90) / 10)
+        for i in range(rows)
+    ], batch_size=BATCH_SIZE)
+
+    # 주기 일정의 예정일 (bulk_create는 시그널을 보내지 않으므로 직접 생성)
+    roll_all_schedules()
+    analyze_tables()
+    user = User.objects.get(username=PLAN_USERNAME)
+    return user, Pet.objects.filter(owner=user).order_by('id').first()
+
+
+def analyze_tables():
+    """bulk 입력 후 옵티마이저 통계 갱신 (통계가 없으면 행 수와 무관한 계획이 나옴)"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            for table in connection.introspection.table_names(cursor):
+                cursor.execute(f'ANALYZE TABLE {connection.ops.quote_name(table)}')
+                cursor.fetchall()
+        else:
+            cursor.execute('ANALYZE')
+
+
+def hot_views(pet):
+    """(이름, URL) 목록 — 사용자/날짜 범위로 조회하는 주요 화면과 API"""
+    today = date.today()
+    month = today.strftime('%Y-%m')
+    # FullCalendar 월 보기처럼 시간대가 붙은 6주 범위
+    start = timezone.make_aware(datetime.combine(today.replace(day=1) - timedelta(days=7), time.min))
+    window = f'start={start.isoformat()}&end={(start + timedelta(days=42)).isoformat()}'
+    return [
+        ('home', '/home/'),
+        ('calendar_feed', f'/home/calendar/feed/?{window}'),
+        ('food_calendar', '/food/'),
+        ('food_events_all', f'/food/events/all/?{window}'),
+        ('food_purchase', f'/food/purchase/?month={month}'),
+        ('food_other_purchase', f'/food/other_purchase/?month={month}'),
+        ('food_stats', f'/food/stats/?pet_id={pet.id}'),
+        ('feed_forecast', '/food/forecast/'),
+        ('items', f'/items/?month={month}'),
+        ('items_api', f'/items/api/otherpurchase/?month={month}&pet={pet.id}'),
+        ('care_events', f'/care/events/?{window}'),
+        ('care_history', '/care/events/history/'),
+        ('care_due', '/care/due/'),
+        ('care_previous', f'/care/previous-care/{pet.id}/nail/'),
+        ('medical_events', f'/calendar/api/events/?{window}'),
+        ('medical_stats', f'/calendar/stats/?pet_id={pet.id}'),
+        ('weights', f'/weight/api/weights/?pet_id={pet.id}'),
+        ('weight_analytics', '/weight/api/weights/analytics/'),
+        ('community', '/community/?period=1w'),
+        ('photo_board', '/board/'),
+    ]
+
+
+class SelectRecorder:
+    """connection.execute_wrapper로 실행된 SELECT의 (sql, params) 기록"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip()[:6].upper() == 'SELECT':
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def explain(sql, params):
+    """(전체 스캔하는 테이블 목록, 원본 실행 계획)"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            details = [row[-1] for row in cursor.fetchall()]
+            return [match.group(1) for match in map(SQLITE_FULL_SCAN.match, details) if match], details
+        if connection.vendor == 'mysql':
+            cursor.execute('EXPLAIN ' + sql, params)
+            columns = [column[0] for column in cursor.description]
+            plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return [row['table'] for row in plan if row['type'] == 'ALL'], plan
+    raise NotImplementedError(f'{connection.vendor} 실행 계획은 지원하지 않습니다.')
+
+
+def table_sizes():
+    with connection.cursor() as cursor:
+        sizes = {}
+        for table in connection.introspection.table_names(cursor):
+            cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+            sizes[table] = cursor.fetchone()[0]
+    return sizes
+
+
+def check_views(user, pet, min_rows=1000, views=None, log=None):
+    """뷰별 결과 [{'name', 'url', 'status', 'queries', 'full_scans': [{'table', 'sql', 'plan'}]}]
+
+    min_rows보다 행이 적은 테이블과 서브쿼리(파생 테이블)의 전체 스캔은 무시한다.
+    """
+    sizes = table_sizes()
+    client = Client()
+    client.force_login(user)
+    results = []
+    for name, url in hot_views(pet):
+        if views and name not in views:
+            continue
+        recorder = SelectRecorder()
+        with connection.execute_wrapper(recorder):
+            response = client.get(url)
+        full_scans, seen = [], set()
+        for sql, params in recorder.queries:
+            if sql in seen:
+                continue
+            seen.add(sql)
+            tables, plan = explain(sql, params)
+            for table in tables:
+                if sizes.get(table, 0) >= min_rows:
+                    full_scans.append({'table': table, 'sql': sql, 'plan': plan})
+        result = {'name': name, 'url': url, 'status': response.status_code, 'queries': len(recorder.queries), 'full_scans': full_scans}
+        results.append(result)
+        if log:
+            log(result)
+    return results
@@ -0,0 +1,166 @@
+"""주기 작업 스케줄러 (run_scheduler 명령의 워커)
+
+작업 상태는 ScheduledJob 테이블(next_run_at 인덱스)에 두고, 워커는 (next_run_at, name)을
+최소 힙에 올려 가장 먼저 실행할 작업의 시각까지만 잠든다.
+실행 전에 next_run_at이 읽은 값 그대로일 때만 다음 시각으로 바꾸는 조건부 UPDATE로 작업을 가져가므로
+워커를 여러 개 띄워도 같은 작업이 두 번 실행되지 않는다.
+
+리마인더 작업은 기간 안에 예정일이 있는 행만 범위 조회해 알림을 한꺼번에 적재하고
+(dedupe_key로 중복 제거), 발송 작업이 대기 중인 알림을 백엔드로 묶어 보낸다.
+"""
+import heapq
+import logging
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .notifications import deliver_pending, enqueue
+
+logger = logging.getLogger(__name__)
+
+VACCINATION_LEAD_DAYS = 7
+CARE_LEAD_DAYS = 1
+# 다른 워커가 작업 시각을 바꿨을 수 있으므로 최대 이 시간마다 테이블을 다시 읽음
+MAX_SLEEP_SECONDS = 60
+
+
+def vaccination_reminders(today):
+    from calendar_app.models import Event
+
+    from .models import Notification
+
+    events = Event.objects.filter(
+        event_type='vacc', next_date__gte=today, next_date__lte=today + timedelta(days=VACCINATION_LEAD_DAYS),
+    ).values('id', 'next_date', 'hospital', 'pet__name', 'pet__owner_id')
+    return enqueue(Notification(
+        user_id=event['pet__owner_id'],
+        kind='vaccination',
+        title=f"{event['pet__name']} 예방접종 예정일이 {(event['next_date'] - today).days}일 남았습니다.",
+        message=f"병원: {event['hospital']}" if event['hospital'] else '',
+        due_date=event['next_date'],
+        dedupe_key=f"vacc:{event['id']}:{event['next_date']}",
+    ) for event in events.iterator())
+
+
+def care_reminders(today):
+    from care_calendar.models import CareOccurrence
+
+    from .models import Notification
+
+    labels = dict(CareOccurrence._meta.get_field('care_type').choices)
+    occurrences = CareOccurrence.objects.filter(
+        due_date__gte=today, due_date__lte=today + timedelta(days=CARE_LEAD_DAYS),
+    ).values('schedule_id', 'owner_id', 'care_type', 'due_date', 'pet__name')
+    return enqueue(Notification(
+        user_id=occurrence['owner_id'],
+        kind='care',
+        title=f"{occurrence['pet__name']} {labels.get(occurrence['care_type'], occurrence['care_type'])} 할 날입니다.",
+        due_date=occurrence['due_date'],
+        dedupe_key=f"care:{occurrence['schedule_id']}:{occurrence['due_date']}",
+    ) for occurrence in occurrences.iterator())
+
+
+def feed_reorder_reminders(today):
+    from food_calendar.models import FeedForecast
+
+    from .models import Notification
+
+    forecasts = FeedForecast.objects.filter(reorder_by__lte=today, run_out_date__gte=today).values(
+        'event_id', 'event__user_id', 'event__product_name', 'pet__name', 'run_out_date', 'reorder_by',
+    )
+    return enqueue(Notification(
+        user_id=forecast['event__user_id'],
+        kind='feed',
+        title=f"{forecast['pet__name']} 사료({forecast['event__product_name']})를 주문할 때입니다.",
+        message=f"소진 예상일: {forecast['run_out_date']:%Y-%m-%d}",
+        due_date=forecast['run_out_date'],
+        dedupe_key=f"feed:{forecast['event_id']}:{forecast['reorder_by']}",
+    ) for forecast in forecasts.iterator())
+
+
+def deliver_notifications(today):
+    return deliver_pending()
+
+
+def rebuild_knn_index(today):
+    from insurance_app.knn_utils import rebuild_if_needed
+
+    return rebuild_if_needed()
+
+
+# 작업 이름 → (함수(today), 기본 실행 간격(초))
+JOBS = {
+    'vaccination_reminders': (vaccination_reminders, 60 * 60),
+    'care_reminders': (care_reminders, 60 * 60),
+    'feed_reorder_reminders': (feed_reorder_reminders, 60 * 60),
+    'deliver_notifications': (deliver_notifications, 60),
+    'knn_index': (rebuild_knn_index, 10 * 60),
+}
+
+
+def ensure_jobs(jobs=JOBS):
+    """테이블에 없는 작업을 바로 실행되도록 추가"""
+    from .models import ScheduledJob
+
+    now = timezone.now()
+    ScheduledJob.objects.bulk_create([
+        ScheduledJob(name=name, interval_seconds=interval, next_run_at=now)
+        for name, (_, interval) in jobs.items()
+    ], ignore_conflicts=True)
+
+
+class Scheduler:
+    def __init__(self, jobs=JOBS, clock=timezone.now, sleep=time.sleep):
+        self.jobs = jobs
+        self.clock = clock
+        self.sleep = sleep
+        self.heap = []
+
+    def load(self):
+        from .models import ScheduledJob
+
+        self.heap = list(ScheduledJob.objects.filter(name__in=self.jobs).values_list('next_run_at', 'name', 'interval_seconds'))
+        heapq.heapify(self.heap)
+
+    def claim(self, name, due, interval, now):
+        """읽은 next_run_at이 그대로일 때만 다음 시각으로 옮김 (다른 워커가 먼저 가져갔으면 False)"""
+        from .models import ScheduledJob
+
+        return ScheduledJob.objects.filter(name=name, next_run_at=due).update(
+            next_run_at=now + timedelta(seconds=interval), last_run_at=now,
+        ) == 1
+
+    def run_pending(self):
+        """시각이 된 작업을 모두 실행 → [(이름, 결과)]"""
+        from .models import ScheduledJob
+
+        results = []
+        while self.heap and self.heap[0][0] <= self.clock():
+            due, name, interval = heapq.heappop(self.heap)
+            now = self.clock()
+            if not self.claim(name, due, interval, now):
+                continue
+            started = time.perf_counter()
+            try:
+                result = self.jobs[name][0](timezone.localdate(now))
+            except Exception:
+                logger.exception('scheduled job failed', extra={'job': name})
+                result = 'error'
+            duration_ms = (time.perf_counter() - started) * 1000
+            ScheduledJob.objects.filter(name=name).update(last_duration_ms=duration_ms, last_result=str(result)[:200])
+            logger.info('scheduled job', extra={'job': name, 'result': result, 'duration_ms': round(duration_ms, 1)})
+            results.append((name, result))
+            heapq.heappush(self.heap, (now + timedelta(seconds=interval), name, interval))
+        return results
+
+    def run_forever(self, max_loops=None):
+        loops = 0
+        while max_loops is None or loops < max_loops:
+            self.load()
+            self.run_pending()
+            loops += 1
+            wait = MAX_SLEEP_SECONDS
+            if self.heap:
+                wait = min(wait, max((self.heap[0][0] - self.clock()).total_seconds(), 0))
+            self.sleep(wait)
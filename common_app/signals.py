@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from calendar_app.models import Event
+from care_calendar.models import Event as CareEvent
+from food_calendar.models import FoodEvent
+from item_purchase_app.models import OtherPurchase
+from weight_tracker_app.models import Weight
+from .calendar_feed import bump_calendar_version
+from .models import Pet
+from .spending import refresh_spending, spending_key, stored_spending_key
+
+SPENDING_SOURCES = {
+    FoodEvent: 'food',
+    OtherPurchase: 'other',
+    Event: 'medical',
+}
+
+
+def remember_spending_key(sender, instance, raw=False, **kwargs):
+    """수정 전 집계 키를 기억해 두었다가 월/카테고리/반려동물이 바뀌면 이전 집계도 갱신"""
+    if raw or instance.pk is None:
+        instance._previous_spending_key = None
+        return
+    instance._previous_spending_key = stored_spending_key(SPENDING_SOURCES[sender], instance.pk)
+
+
+def refresh_spending_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    source = SPENDING_SOURCES[sender]
+    keys = {getattr(instance, '_previous_spending_key', None), spending_key(source, instance)} - {None}
+    refresh_spending(source, keys)
+
+
+def refresh_spending_on_delete(sender, instance, **kwargs):
+    source = SPENDING_SOURCES[sender]
+    key = spending_key(source, instance)
+    if key is not None:
+        refresh_spending(source, [key])
+
+
+for model in SPENDING_SOURCES:
+    pre_save.connect(remember_spending_key, sender=model, dispatch_uid=f'spending_pre_save_{model._meta.label}')
+    post_save.connect(refresh_spending_on_save, sender=model, dispatch_uid=f'spending_post_save_{model._meta.label}')
+    post_delete.connect(refresh_spending_on_delete, sender=model, dispatch_uid=f'spending_post_delete_{model._meta.label}')
+
+
+# 캘린더 피드에 나오는 모델 → (통합 피드 출처, 소유 사용자 id) (출처가 None이면 전체)
+CALENDAR_OWNERS = {
+    FoodEvent: (('food',), lambda instance: instance.user_id),
+    CareEvent: (('care',), lambda instance: instance.user_id),
+    Event: (('medical',), lambda instance: Pet.objects.filter(pk=instance.pet_id).values_list('owner_id', flat=True).first()),
+    Weight: (('weight',), lambda instance: instance.user_id),
+    OtherPurchase: (('purchase',), lambda instance: instance.user_id),
+    Pet: (None, lambda instance: instance.owner_id),
+}
+
+
+def bump_calendar_on_change(sender, instance, raw=False, origin=None, **kwargs):
+    if raw:
+        return
+    # 사용자 삭제에 딸려 지워지는 경우 삭제될 사용자의 CalendarVersion 행을 다시 만들지 않음
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is User:
+        return
+    sources, owner = CALENDAR_OWNERS[sender]
+    bump_calendar_version(owner(instance), sources=sources)
+
+
+for model in CALENDAR_OWNERS:
+    post_save.connect(bump_calendar_on_change, sender=model, dispatch_uid=f'calendar_version_post_save_{model._meta.label}')
+    post_delete.connect(bump_calendar_on_change, sender=model, dispatch_uid=f'calendar_version_post_delete_{model._meta.label}')
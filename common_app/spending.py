@@ -0,0 +1,158 @@
+from datetime import date
+
+from django.apps import apps as django_apps
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Count, FloatField, Max, Min, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+
+# 출처별 원본 모델과 집계에 쓰는 필드 (user는 Event처럼 반려동물을 거쳐야 하는 경우도 있음)
+SOURCES = {
+    'food': {'model': ('food_calendar', 'FoodEvent'), 'user': 'user_id', 'pet': 'pet_id', 'date': 'purchase_date', 'category': 'type', 'amount': 'price'},
+    'other': {'model': ('item_purchase_app', 'OtherPurchase'), 'user': 'user_id', 'pet': 'cat_id', 'date': 'purchase_date', 'category': 'type', 'amount': 'price'},
+    'medical': {'model': ('calendar_app', 'Event'), 'user': 'pet__owner_id', 'pet': 'pet_id', 'date': 'date', 'category': 'event_type', 'amount': 'cost'},
+}
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def source_model(source, apps=None):
+    return (apps or django_apps).get_model(*SOURCES[source]['model'])
+
+
+def spending_key(source, instance):
+    """원본 행이 속한 (user_id, pet_id, month, category) (날짜가 없으면 None)"""
+    config = SOURCES[source]
+    value = getattr(instance, config['date'])
+    if value is None:
+        return None
+    pet_id = getattr(instance, config['pet'])
+    if config['user'] == 'user_id':
+        user_id = instance.user_id
+    else:
+        try:
+            user_id = instance.pet.owner_id
+        except ObjectDoesNotExist:
+            return None
+    return (user_id, pet_id, month_start(value), getattr(instance, config['category']) or '')
+
+
+def stored_spending_key(source, pk):
+    """DB에 저장된(수정 전) 행의 집계 키"""
+    config = SOURCES[source]
+    row = source_model(source).objects.filter(pk=pk).values_list(config['user'], config['pet'], config['date'], config['category']).first()
+    if row is None or row[2] is None:
+        return None
+    return (row[0], row[1], month_start(row[2]), row[3] or '')
+
+
+def _aggregates(amount):
+    return {
+        'total': Coalesce(Sum(amount), 0.0, output_field=FloatField()),
+        'count': Count('id'),
+        'min_amount': Coalesce(Min(amount), 0.0, output_field=FloatField()),
+        'max_amount': Coalesce(Max(amount), 0.0, output_field=FloatField()),
+    }
+
+
+def refresh_spending(source, keys):
+    """집계 키별로 원본 행을 다시 집계해 SpendingRollup 행을 갱신(행이 없으면 삭제)"""
+    from .models import SpendingRollup
+
+    config = SOURCES[source]
+    model = source_model(source)
+    for user_id, pet_id, month, category in keys:
+        stats = model.objects.filter(**{
+            config['user']: user_id,
+            config['pet']: pet_id,
+            f"{config['date']}__gte": month,
+            f"{config['date']}__lt": add_months(month, 1),
+            config['category']: category,
+        }).aggregate(**_aggregates(config['amount']))
+        lookup = {'user_id': user_id, 'pet_id': pet_id, 'month': month, 'source': source, 'category': category}
+        if stats['count']:
+            SpendingRollup.objects.update_or_create(defaults=stats, **lookup)
+        else:
+            SpendingRollup.objects.filter(**lookup).delete()
+
+
+def rebuild_spending(apps=None, user_id=None):
+    """원본 테이블 전체(또는 한 사용자)를 월 단위로 GROUP BY해 SpendingRollup을 다시 생성"""
+    SpendingRollup = (apps or django_apps).get_model('common_app', 'SpendingRollup')
+    rows = []
+    for source, config in SOURCES.items():
+        queryset = source_model(source, apps).objects.filter(**{f"{config['date']}__isnull": False})
+        if user_id is not None:
+            queryset = queryset.filter(**{config['user']: user_id})
+        grouped = queryset.annotate(rollup_month=TruncMonth(config['date'])).values(
+            config['user'], config['pet'], 'rollup_month', config['category'],
+        ).annotate(**_aggregates(config['amount'])).order_by()
+        for row in grouped:
+            rows.append(SpendingRollup(
+                user_id=row[config['user']],
+                pet_id=row[config['pet']],
+                month=month_start(row['rollup_month']),
+                source=source,
+                category=row[config['category']] or '',
+                total=row['total'],
+                count=row['count'],
+                min_amount=row['min_amount'],
+                max_amount=row['max_amount'],
+            ))
+    existing = SpendingRollup.objects.all()
+    if user_id is not None:
+        existing = existing.filter(user_id=user_id)
+    with transaction.atomic():
+        existing.delete()
+        SpendingRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rollup_queryset(user, source, pet=None, category=None):
+    from .models import SpendingRollup
+
+    queryset = SpendingRollup.objects.filter(user=user, source=source)
+    if pet:
+        queryset = queryset.filter(pet_id=pet)
+    if category:
+        queryset = queryset.filter(category=category)
+    return queryset
+
+
+def _summary_values():
+    return {
+        'total': Coalesce(Sum('total'), 0.0),
+        'count': Coalesce(Sum('count'), 0),
+        'min_amount': Min('min_amount'),
+        'max_amount': Max('max_amount'),
+    }
+
+
+def monthly_summary(user, source, start_month, months=1, pet=None, category=None):
+    """start_month부터 months개월의 월별 합계 {month: {'total', 'count', 'min_amount', 'max_amount'}}"""
+    rows = rollup_queryset(user, source, pet, category).filter(
+        month__gte=start_month, month__lt=add_months(start_month, months),
+    ).values('month').annotate(**_summary_values()).order_by('month')
+    return {row.pop('month'): row for row in rows}
+
+
+def category_summary(user, source, start_month=None, months=1, pet=None, category=None):
+    """카테고리별 합계 {category: {...}} (start_month가 없으면 전체 기간)"""
+    queryset = rollup_queryset(user, source, pet, category)
+    if start_month is not None:
+        queryset = queryset.filter(month__gte=start_month, month__lt=add_months(start_month, months))
+    rows = queryset.values('category').annotate(**_summary_values()).order_by('category')
+    return {row.pop('category'): row for row in rows}
+
+
+def month_total(user, source, month, pet=None, category=None):
+    """한 달 합계 (한 번의 인덱스 조회)"""
+    summary = monthly_summary(user, source, month, pet=pet, category=category).get(month)
+    return summary['total'] if summary else 0
@@ -1,3 +1,210 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.utils import timezone
+
+from calendar_app.models import Event
+from item_purchase_app.models import OtherPurchase
+
+from .models import CalendarVersion, Notification, Pet, ScheduledJob, SpendingRollup
+from .notifications import NotificationBackend, deliver_pending, enqueue
+from .scheduler import Scheduler, ensure_jobs, vaccination_reminders
+from .spending import rebuild_spending
+
+
+class CalendarVersionTests(TestCase):
+    def test_delete_user_with_pets(self):
+        # 반려동물 삭제 시그널이 삭제 중인 사용자의 CalendarVersion을 다시 만들면 FK 오류
+        user = User.objects.create_user('owner', password='pw')
+        Pet.objects.create(owner=user, name='코코', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+        self.assertTrue(CalendarVersion.objects.filter(user=user).exists())
+        user.delete()
+        self.assertFalse(CalendarVersion.objects.exists())
+
+    def test_delete_pet_bumps_version(self):
+        user = User.objects.create_user('owner', password='pw')
+        pet = Pet.objects.create(owner=user, name='코코', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+        version = CalendarVersion.objects.get(user=user).version
+        pet.delete()
+        self.assertEqual(CalendarVersion.objects.get(user=user).version, version + 1)
+
+
+class CalendarSourceCacheTests(TestCase):
+    def test_change_from_another_process_invalidates_source_cache(self):
+        from datetime import datetime
+
+        from django.core.cache import cache
+
+        from weight_tracker_app.models import Weight
+
+        from .calendar_sources import collect_events
+        from .models import CalendarSourceVersion
+
+        user = User.objects.create_user('owner', password='pw')
+        pet = Pet.objects.create(owner=user, name='코코', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+        start, end = datetime(2024, 1, 1), datetime(2024, 2, 1)
+        Weight.objects.create(user=user, pet=pet, date=date(2024, 1, 10), weight=5)
+        self.assertEqual(len(collect_events(user, start, end, sources=('weight',))), 1)
+
+        # 다른 프로세스의 변경: 이 프로세스의 캐시는 그대로이고 DB의 행과 버전만 바뀜
+        Weight.objects.bulk_create([Weight(user=user, pet=pet, date=date(2024, 1, 11), weight=5)])
+        self.assertEqual(len(collect_events(user, start, end, sources=('weight',))), 1)
+        CalendarSourceVersion.objects.filter(user=user, source='weight').update(version=99)
+        self.assertEqual(len(collect_events(user, start, end, sources=('weight',))), 2)
+        cache.clear()
+
+
+class CalendarFeedOrderTests(TestCase):
+    def test_merged_feed_sorts_by_local_start_time(self):
+        from datetime import datetime, timezone as dt_timezone
+        from unittest import mock
+
+        from django.core.cache import cache
+
+        from . import calendar_sources
+
+        user = User.objects.create_user('owner', password='pw')
+        sources = {
+            # UTC 16:30 = 한국 시간 다음 날 01:30
+            'medical': lambda *args: [calendar_sources.event('medical', 1, '진료', datetime(2024, 1, 1, 16, 30, tzinfo=dt_timezone.utc), all_day=False)],
+            'weight': lambda *args: [
+                calendar_sources.event('weight', 1, '체중', date(2024, 1, 2)),
+                calendar_sources.event('weight', 2, '체중', date(2024, 1, 1)),
+            ],
+        }
+        with mock.patch.dict(calendar_sources.SOURCES, sources):
+            events = calendar_sources.collect_events(user, datetime(2024, 1, 1), datetime(2024, 2, 1), sources=('medical', 'weight'))
+        cache.clear()
+        self.assertEqual([item['id'] for item in events], ['weight-2', 'weight-1', 'medical-1'])
+
+
+class SpendingRollupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('owner', password='pw')
+        self.pet = Pet.objects.create(owner=self.user, name='코코', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+
+    def purchase(self, day, price, kind='toy'):
+        return OtherPurchase.objects.create(user=self.user, cat=self.pet, purchase_date=day, price=price, type=kind, product_name='공')
+
+    def rollups(self):
+        return sorted(SpendingRollup.objects.values_list('source', 'month', 'category', 'total', 'count', 'min_amount', 'max_amount'))
+
+    def test_create_update_delete_keep_buckets(self):
+        first = self.purchase(date(2026, 1, 5), 1000)
+        self.purchase(date(2026, 1, 20), 3000)
+        self.assertEqual(self.rollups(), [('other', date(2026, 1, 1), 'toy', 4000.0, 2, 1000.0, 3000.0)])
+
+        # 월과 카테고리를 옮기면 이전 버킷도 다시 집계
+        first.purchase_date, first.type = date(2026, 2, 1), 'food'
+        first.save()
+        self.assertEqual(self.rollups(), [
+            ('other', date(2026, 1, 1), 'toy', 3000.0, 1, 3000.0, 3000.0),
+            ('other', date(2026, 2, 1), 'food', 1000.0, 1, 1000.0, 1000.0),
+        ])
+
+        first.delete()
+        self.assertEqual(self.rollups(), [('other', date(2026, 1, 1), 'toy', 3000.0, 1, 3000.0, 3000.0)])
+
+    def test_medical_events_use_pet_owner(self):
+        event = Event.objects.create(pet=self.pet, event_type='med', date=date(2026, 3, 31), cost=25000)
+        self.assertEqual(self.rollups(), [('medical', date(2026, 3, 1), 'med', 25000.0, 1, 25000.0, 25000.0)])
+        event.delete()
+        self.assertEqual(self.rollups(), [])
+
+    def test_rebuild_matches_incremental_rollup(self):
+        self.purchase(date(2025, 12, 31), 500)
+        moved = self.purchase(date(2026, 1, 1), 700)
+        self.purchase(date(2026, 1, 2), 900, kind='food')
+        Event.objects.create(pet=self.pet, event_type='vacc', date=date(2026, 1, 9), cost=30000)
+        moved.price = 800
+        moved.save()
+        incremental = self.rollups()
+        SpendingRollup.objects.all().delete()
+        rebuild_spending()
+        self.assertEqual(self.rollups(), incremental)
+
+
+class SchedulerTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.calls = []
+        self.jobs = {
+            'tick': (lambda today: self.calls.append(today) or len(self.calls), 60),
+            'broken': (lambda today: 1 / 0, 300),
+        }
+        ensure_jobs(self.jobs)
+        ScheduledJob.objects.update(next_run_at=self.now)
+
+    def scheduler(self):
+        scheduler = Scheduler(jobs=self.jobs, clock=lambda: self.now, sleep=lambda seconds: None)
+        scheduler.load()
+        return scheduler
+
+    def test_second_worker_does_not_rerun_claimed_job(self):
+        first, second = self.scheduler(), self.scheduler()
+        with self.assertLogs('common_app.scheduler', 'INFO'):
+            self.assertEqual(dict(first.run_pending()), {'tick': 1, 'broken': 'error'})
+        # 같은 next_run_at을 읽은 두 번째 워커는 조건부 UPDATE에 실패
+        self.assertEqual(second.run_pending(), [])
+        self.assertEqual(len(self.calls), 1)
+
+    def test_failed_job_still_moves_to_next_run(self):
+        with self.assertLogs('common_app.scheduler', 'INFO'):
+            self.scheduler().run_pending()
+        job = ScheduledJob.objects.get(name='broken')
+        self.assertEqual((job.next_run_at, job.last_result), (self.now + timedelta(seconds=300), 'error'))
+        self.assertEqual(ScheduledJob.objects.get(name='tick').next_run_at, self.now + timedelta(seconds=60))
+
+    def test_ensure_jobs_keeps_existing_schedule(self):
+        later = self.now + timedelta(hours=1)
+        ScheduledJob.objects.filter(name='tick').update(next_run_at=later)
+        ensure_jobs(self.jobs)
+        self.assertEqual(ScheduledJob.objects.get(name='tick').next_run_at, later)
+
+
+class NotificationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('owner', password='pw', email='owner@example.com')
+        self.pet = Pet.objects.create(owner=self.user, name='코코', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+
+    def notification(self, key, user=None):
+        return Notification(user=user or self.user, kind='care', title=key, dedupe_key=key)
+
+    def test_enqueue_dedupes_by_key(self):
+        self.assertEqual(enqueue([self.notification('a'), self.notification('a'), self.notification('b')]), 2)
+        self.assertEqual(enqueue([self.notification('b'), self.notification('c')]), 1)
+        self.assertEqual(sorted(Notification.objects.values_list('dedupe_key', flat=True)), ['a', 'b', 'c'])
+
+    def test_vaccination_reminders_run_once_per_due_date(self):
+        today = date(2026, 3, 1)
+        Event.objects.create(pet=self.pet, event_type='vacc', date=date(2025, 3, 5), next_date=date(2026, 3, 5))
+        Event.objects.create(pet=self.pet, event_type='vacc', date=date(2025, 4, 1), next_date=date(2026, 4, 1))
+        self.assertEqual(vaccination_reminders(today), 1)
+        self.assertEqual(vaccination_reminders(today), 0)
+        self.assertEqual(Notification.objects.get().due_date, date(2026, 3, 5))
+
+    def test_deliver_pending_groups_and_retries(self):
+        other = User.objects.create_user('other', password='pw')
+        enqueue([self.notification('a'), self.notification('b'), self.notification('c', user=other)])
+
+        class Recorder(NotificationBackend):
+            def __init__(self):
+                self.grouped = None
+
+            def send_batch(self, grouped):
+                self.grouped = {user.username: len(items) for user, items in grouped.items()}
+                return {user.pk for user in grouped if user.email}
+
+        backend = Recorder()
+        self.assertEqual(deliver_pending(backend=backend), {'sent': 2, 'skipped': 1, 'failed': 0})
+        self.assertEqual(backend.grouped, {'owner': 2, 'other': 1})
+
+        class Broken(NotificationBackend):
+            def send_batch(self, grouped):
+                raise OSError('smtp down')
 
-# Create your tests here.
+        enqueue([self.notification('d')])
+        with self.assertLogs('common_app.notifications'):
+            self.assertEqual(deliver_pending(backend=Broken()), {'sent': 0, 'skipped': 0, 'failed': 1})
+        self.assertEqual(Notification.objects.filter(dedupe_key='d').values_list('status', 'attempts').get(), ('pending', 1))
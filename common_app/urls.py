@@ -11,4 +11,5 @@ urlpatterns = [
     path('delete/<int:pet_id>/', views.pet_delete, name='pet_delete'),
     path('profile/', views.profile, name='profile'),
     path('kakao/callback/', views.kakao_callback, name='kakao_callback'),
+    path('calendar/feed/', views.calendar_feed, name='calendar_feed'),
 ] 
\ No newline at end of file
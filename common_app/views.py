@@ -8,6 +8,10 @@ from weight_tracker_app.models import Weight
 from django.contrib.auth import logout, update_session_auth_hash
 from django.contrib.auth.forms import PasswordChangeForm
 from insurance_app.models import PetProfile
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import condition
+from .calendar_feed import SOURCE_NAMES, InvalidWindow, calendar_etag, parse_date_window
+from .calendar_sources import collect_events, dumps
 
 # Create your views here.
 
@@ -328,3 +332,19 @@ def kakao_callback(request):
 def custom_logout_view(request):
     logout(request)
     return redirect('login')
+
+@login_required
+@condition(etag_func=calendar_etag)
+def calendar_feed(request):
+    """음식/케어/병원/체중/구매/사료 예측 일정을 한 번에 반환 (start/end 필수, sources로 출처 선택)"""
+    try:
+        start, end = parse_date_window(request)
+    except InvalidWindow as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    sources = [source for source in request.GET.get('sources', '').split(',') if source] or list(SOURCE_NAMES)
+    unknown = set(sources) - set(SOURCE_NAMES)
+    if unknown:
+        return JsonResponse({'error': f"알 수 없는 출처: {', '.join(sorted(unknown))}"}, status=400)
+    pet_id = request.GET.get('pet_id')
+    events = collect_events(request.user, start, end, sources=sources, pet_id=pet_id if pet_id != 'all' else None)
+    return HttpResponse(dumps(events), content_type='application/json')
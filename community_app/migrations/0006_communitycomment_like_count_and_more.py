@@ -0,0 +1,56 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# (모델, 카운터 필드, 관계 이름)
+COUNTERS = [
+    ('CommunityPost', 'like_count', 'likes'),
+    ('CommunityPost', 'comment_count', 'comments'),
+    ('CommunityComment', 'like_count', 'likes'),
+    ('CommunityReply', 'like_count', 'likes'),
+]
+
+
+def populate_counters(apps, schema_editor):
+    for model_name, field_name, relation in COUNTERS:
+        model = apps.get_model('community_app', model_name)
+        field = model._meta.get_field(relation)
+        if field.many_to_many:
+            related, fk = field.remote_field.through, field.m2m_field_name()
+        else:
+            related, fk = field.related_model, field.field.name
+        counts = related.objects.filter(**{fk: OuterRef('pk')}).order_by().values(fk).annotate(n=Count('*')).values('n')
+        model.objects.update(**{field_name: Coalesce(Subquery(counts), 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community_app', '0005_communitypost_communitypost_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='communitycomment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='좋아요 수'),
+        ),
+        migrations.AddField(
+            model_name='communitypost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='댓글 수'),
+        ),
+        migrations.AddField(
+            model_name='communitypost',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='좋아요 수'),
+        ),
+        migrations.AddField(
+            model_name='communityreply',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='좋아요 수'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
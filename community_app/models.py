@@ -10,10 +10,16 @@ class CommunityPost(models.Model):
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
     views = models.PositiveIntegerField(default=0, verbose_name='조회수')
     likes = models.ManyToManyField(User, related_name='liked_community_posts', blank=True, verbose_name='좋아요')
+    # likes/comments 행 수 (common_app.counters에서 F()로 갱신)
+    like_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='좋아요 수')
+    comment_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='댓글 수')
     image = models.ImageField(upload_to='community/', blank=True, null=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='communitypost_created_idx'),
+        ]
         verbose_name = '커뮤니티 게시글'
         verbose_name_plural = '커뮤니티 게시글들'
 
@@ -31,6 +37,7 @@ class CommunityComment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='작성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
     likes = models.ManyToManyField(User, related_name='liked_community_comments', blank=True, verbose_name='좋아요')
+    like_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='좋아요 수')
 
     class Meta:
         ordering = ['created_at']
@@ -51,6 +58,7 @@ class CommunityReply(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='작성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
     likes = models.ManyToManyField(User, related_name='liked_community_replies', blank=True, verbose_name='좋아요')
+    like_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='좋아요 수')
     parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='children', verbose_name='부모 대댓글')
 
     class Meta:
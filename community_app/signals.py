@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+
+from common_app.counters import adjust
+
+from .models import CommunityComment, CommunityPost
+
+
+def count_comment_on_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust(CommunityPost, instance.post_id, 'comment_count', 1)
+
+
+def count_comment_on_delete(sender, instance, **kwargs):
+    adjust(CommunityPost, instance.post_id, 'comment_count', -1)
+
+
+post_save.connect(count_comment_on_save, sender=CommunityComment, dispatch_uid='community_comment_count_post_save')
+post_delete.connect(count_comment_on_delete, sender=CommunityComment, dispatch_uid='community_comment_count_post_delete')
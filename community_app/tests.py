@@ -1,3 +1,139 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError
 from django.test import TestCase
 
-# Create your tests here.
+from common_app.counters import recount, save_edit_form, toggle_like
+
+from .forms import CommunityPostForm
+from .models import CommunityComment, CommunityPost, CommunityReply
+from .view_counts import ViewCounter
+
+
+class PostEditCounterTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user('author', password='pw')
+        self.reader = User.objects.create_user('reader', password='pw')
+        self.post = CommunityPost.objects.create(title='제목', content='내용', author=self.author)
+
+    def test_edit_keeps_counters_changed_after_read(self):
+        post = CommunityPost.objects.get(pk=self.post.pk)
+        # 수정 화면을 연 뒤에 들어온 좋아요/댓글/조회
+        toggle_like(self.post, self.reader)
+        CommunityComment.objects.create(post=self.post, author=self.reader, content='댓글')
+        CommunityPost.objects.filter(pk=self.post.pk).update(views=7)
+        form = CommunityPostForm({'title': '새 제목', 'content': '새 내용'}, instance=post)
+        self.assertTrue(form.is_valid(), form.errors)
+        save_edit_form(form)
+        post.refresh_from_db()
+        self.assertEqual((post.title, post.like_count, post.comment_count, post.views), ('새 제목', 1, 1, 7))
+
+    def test_edit_view(self):
+        self.client.force_login(self.author)
+        post = CommunityPost.objects.get(pk=self.post.pk)
+        toggle_like(post, self.reader)
+        response = self.client.post(f'/community/{self.post.pk}/edit/', {'title': '새 제목', 'content': '새 내용'})
+        self.assertEqual(response.status_code, 302)
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.title, self.post.like_count), ('새 제목', 1))
+
+
+class LikeCounterTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user('author', password='pw')
+        self.reader = User.objects.create_user('reader', password='pw')
+        self.post = CommunityPost.objects.create(title='제목', content='내용', author=self.author)
+
+    def test_toggle_twice_returns_to_start(self):
+        self.assertEqual(toggle_like(self.post, self.reader), (True, 1))
+        self.assertEqual(toggle_like(self.post, self.author), (True, 2))
+        self.assertEqual(toggle_like(self.post, self.reader), (False, 1))
+        self.assertEqual(toggle_like(self.post, self.reader), (True, 2))
+        self.assertEqual(self.post.likes.count(), 2)
+
+    def test_stale_object_does_not_double_count(self):
+        # 같은 사용자가 예전에 읽은 객체로 두 번 눌러도 행/카운터는 실제 상태만 따름
+        stale = CommunityPost.objects.get(pk=self.post.pk)
+        toggle_like(self.post, self.reader)
+        self.assertEqual(toggle_like(stale, self.reader), (False, 0))
+        self.assertEqual(self.post.likes.count(), 0)
+
+    def test_counter_never_goes_negative(self):
+        self.post.likes.add(self.reader)
+        self.assertEqual(toggle_like(self.post, self.reader), (False, 0))
+
+    def test_comment_count_follows_comment_rows(self):
+        comment = CommunityComment.objects.create(post=self.post, author=self.reader, content='댓글')
+        CommunityComment.objects.create(post=self.post, author=self.author, content='댓글2')
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+
+    def test_recount_repairs_drift(self):
+        comment = CommunityComment.objects.create(post=self.post, author=self.reader, content='댓글')
+        reply = CommunityReply.objects.create(comment=comment, author=self.reader, content='답글')
+        self.post.likes.add(self.reader, self.author)
+        reply.likes.add(self.author)
+        CommunityPost.objects.filter(pk=self.post.pk).update(like_count=9, comment_count=0)
+        recount(app_label='community_app')
+        self.post.refresh_from_db()
+        reply.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count, reply.like_count), (2, 1, 1))
+
+    def test_like_view(self):
+        self.client.force_login(self.reader)
+        first = self.client.post(f'/community/{self.post.pk}/like/').json()
+        second = self.client.post(f'/community/{self.post.pk}/like/').json()
+        self.assertEqual((first, second), ({'liked': True, 'count': 1}, {'liked': False, 'count': 0}))
+
+
+class ViewCounterTests(TestCase):
+    def setUp(self):
+        author = User.objects.create_user('author', password='pw')
+        self.first = CommunityPost.objects.create(title='1', content='내용', author=author)
+        self.second = CommunityPost.objects.create(title='2', content='내용', author=author)
+        # 테스트 중에는 타이머가 돌지 않도록 긴 주기
+        self.counter = ViewCounter(CommunityPost, interval=3600, threshold=5)
+        self.addCleanup(self.counter.flush)
+
+    def views(self):
+        return list(CommunityPost.objects.order_by('pk').values_list('views', flat=True))
+
+    def test_without_buffer_writes_immediately(self):
+        counter = ViewCounter(CommunityPost, interval=0)
+        self.assertEqual(counter.add(self.first.pk), 1)
+        self.assertEqual(self.views(), [1, 0])
+
+    def test_flush_applies_buffered_increments(self):
+        for pk in (self.first.pk, self.first.pk, self.second.pk):
+            self.counter.add(pk)
+        self.assertEqual(self.views(), [0, 0])
+        self.assertEqual(self.counter.pending_for(self.first.pk), 2)
+        self.assertEqual(self.counter.flush(), 3)
+        self.assertEqual(self.views(), [2, 1])
+        self.assertIsNone(self.counter.timer)
+        self.assertEqual(self.counter.flush(), 0)
+
+    def test_threshold_flushes_during_add(self):
+        for _ in range(5):
+            self.counter.add(self.first.pk)
+        self.assertEqual(self.views(), [5, 0])
+        self.assertEqual(self.counter.pending_for(self.first.pk), 0)
+
+    def test_failed_write_is_buffered_again(self):
+        self.counter.add(self.first.pk)
+        self.counter.add(self.second.pk)
+        with mock.patch.object(self.counter, 'write', side_effect=DatabaseError), self.assertLogs('community_app.view_counts'):
+            self.assertEqual(self.counter.flush(), 0)
+        self.counter.add(self.first.pk)
+        self.assertEqual(self.counter.flush(), 3)
+        self.assertEqual(self.views(), [2, 1])
+
+    def test_detail_shows_pending_views(self):
+        self.client.force_login(User.objects.get(username='author'))
+        with mock.patch('community_app.views.get_view_counter', return_value=self.counter):
+            self.client.get(f'/community/{self.first.pk}/')
+            response = self.client.get(f'/community/{self.first.pk}/')
+        self.assertEqual(response.context['post'].views, 2)
+        self.assertEqual(self.views(), [0, 0])
@@ -0,0 +1,117 @@
+"""게시글 조회수 버퍼
+
+상세 화면을 열 때마다 행을 갱신하면 인기 글에서 같은 행의 잠금을 기다리게 되므로
+조회수를 프로세스 메모리에 모았다가 주기적으로 UPDATE ... SET views = views + n 으로 한꺼번에 반영한다.
+
+- 버퍼가 생기면 VIEW_COUNT_FLUSH_SECONDS 뒤에 백그라운드 타이머가 반영하고,
+  쌓인 조회가 FLUSH_THRESHOLD건을 넘으면 요청 중에 바로 반영
+- 같은 증가량끼리 묶어 pk 순서로 갱신 (증가량 종류만큼의 UPDATE)
+- 반영에 실패하면 버퍼로 되돌려 다음에 다시 시도, 프로세스 종료 시 남은 버퍼 반영
+- VIEW_COUNT_FLUSH_SECONDS = 0 이면 버퍼 없이 바로 F('views') + 1
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+FLUSH_THRESHOLD = 1000
+BATCH_SIZE = 500
+
+
+class ViewCounter:
+    def __init__(self, model, field='views', interval=None, threshold=FLUSH_THRESHOLD):
+        self.model = model
+        self.field = field
+        self.interval = interval
+        self.threshold = threshold
+        self.pending = Counter()
+        self.buffered = 0
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def get_interval(self):
+        if self.interval is not None:
+            return self.interval
+        return getattr(settings, 'VIEW_COUNT_FLUSH_SECONDS', 10)
+
+    def add(self, pk):
+        """조회 1건 기록 → 이 객체의 아직 DB에 반영되지 않은 조회 수 (이번 조회 포함)"""
+        interval = self.get_interval()
+        if interval <= 0:
+            self.write({pk: 1})
+            return 1
+        with self.lock:
+            self.pending[pk] += 1
+            self.buffered += 1
+            count = self.pending[pk]
+            due = self.buffered >= self.threshold
+            if not due and self.timer is None:
+                self.timer = threading.Timer(interval, self.flush_in_background)
+                self.timer.daemon = True
+                self.timer.start()
+        if due:
+            self.flush()
+        return count
+
+    def pending_for(self, pk):
+        with self.lock:
+            return self.pending[pk]
+
+    def flush(self):
+        """버퍼를 DB에 반영 → 반영한 조회 수"""
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+            self.buffered = 0
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        if not pending:
+            return 0
+        try:
+            self.write(pending)
+        except DatabaseError:
+            logger.exception('view count flush failed', extra={'posts': len(pending)})
+            with self.lock:
+                self.pending.update(pending)
+                self.buffered += sum(pending.values())
+            return 0
+        return sum(pending.values())
+
+    def flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            # 타이머 스레드가 연 DB 연결 정리
+            connections.close_all()
+
+    def write(self, counts):
+        by_increment = defaultdict(list)
+        for pk, n in counts.items():
+            by_increment[n].append(pk)
+        with transaction.atomic():
+            for n, pks in sorted(by_increment.items()):
+                pks.sort()
+                for start in range(0, len(pks), BATCH_SIZE):
+                    self.model.objects.filter(pk__in=pks[start:start + BATCH_SIZE]).update(**{self.field: F(self.field) + n})
+
+
+_counter = None
+_counter_lock = threading.Lock()
+
+
+def get_view_counter():
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                from .models import CommunityPost
+
+                _counter = ViewCounter(CommunityPost)
+                atexit.register(_counter.flush)
+    return _counter
@@ -1,15 +1,18 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from django.utils import timezone
 from datetime import timedelta
 from .models import CommunityPost, CommunityComment, CommunityReply
 from .forms import CommunityPostForm, CommunityCommentForm, CommunityReplyForm
 from django.http import JsonResponse
+from common_app.counters import is_liked, liked_ids, save_edit_form, toggle_like
+from common_app.instrumentation import query_budget
+from .view_counts import get_view_counter
 
 def post_list(request):
-    posts = CommunityPost.objects.all()
+    posts = CommunityPost.objects.select_related('author')
     
     # 기간 필터링
     period = request.GET.get('period', '')
@@ -64,16 +67,21 @@ def post_create(request):
 
 def post_detail(request, post_id):
     post = get_object_or_404(CommunityPost, id=post_id)
-    post.views += 1
-    post.save()
+    # 조회수는 버퍼에 모았다가 일괄 반영 (화면에는 아직 반영되지 않은 조회까지 더해 표시)
+    post.views += get_view_counter().add(post.id)
     
-    comments = post.comments.all()
+    comments = list(post.comments.select_related('author').prefetch_related(
+        Prefetch('replies', queryset=CommunityReply.objects.select_related('author')),
+    ))
     comment_form = CommunityCommentForm()
     
     return render(request, 'community_app/post_detail.html', {
         'post': post,
         'comments': comments,
         'comment_form': comment_form,
+        'liked': is_liked(post, request.user),
+        'liked_comment_ids': liked_ids(CommunityComment, request.user, [comment.id for comment in comments]),
+        'liked_reply_ids': liked_ids(CommunityReply, request.user, [reply.id for comment in comments for reply in comment.replies.all()]),
     })
 
 @login_required
@@ -82,7 +90,7 @@ def post_edit(request, post_id):
     if request.method == 'POST':
         form = CommunityPostForm(request.POST, instance=post)
         if form.is_valid():
-            form.save()
+            save_edit_form(form)
             messages.success(request, '게시글이 수정되었습니다.')
             return redirect('community_app:detail', post_id=post.id)
     else:
@@ -118,26 +126,18 @@ def comment_delete(request, post_id, comment_id):
     return redirect('community_app:detail', post_id=post.id)
 
 @login_required
+@query_budget(12)
 def post_like(request, post_id):
     post = get_object_or_404(CommunityPost, id=post_id)
-    if request.user in post.likes.all():
-        post.likes.remove(request.user)
-        liked = False
-    else:
-        post.likes.add(request.user)
-        liked = True
-    return JsonResponse({'liked': liked, 'count': post.likes.count()})
+    liked, count = toggle_like(post, request.user)
+    return JsonResponse({'liked': liked, 'count': count})
 
 @login_required
+@query_budget(12)
 def comment_like(request, post_id, comment_id):
     comment = get_object_or_404(CommunityComment, id=comment_id, post_id=post_id)
-    if request.user in comment.likes.all():
-        comment.likes.remove(request.user)
-        liked = False
-    else:
-        comment.likes.add(request.user)
-        liked = True
-    return JsonResponse({'liked': liked, 'count': comment.likes.count()})
+    liked, count = toggle_like(comment, request.user)
+    return JsonResponse({'liked': liked, 'count': count})
 
 @login_required
 def reply_create(request, post_id, comment_id):
@@ -163,12 +163,8 @@ def reply_delete(request, post_id, comment_id, reply_id):
     return redirect('community_app:detail', post_id=post_id)
 
 @login_required
+@query_budget(12)
 def reply_like(request, post_id, comment_id, reply_id):
     reply = get_object_or_404(CommunityReply, id=reply_id, comment_id=comment_id)
-    if request.user in reply.likes.all():
-        reply.likes.remove(request.user)
-        liked = False
-    else:
-        reply.likes.add(request.user)
-        liked = True
-    return JsonResponse({'liked': liked, 'count': reply.likes.count()})
+    liked, count = toggle_like(reply, request.user)
+    return JsonResponse({'liked': liked, 'count': count})
@@ -58,6 +58,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'common_app.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -198,4 +199,73 @@ SOCIALACCOUNT_PROVIDERS = {
         'AUTH_PARAMS': {'access_type': 'online'},
         'VERIFIED_EMAIL': True,
     }
-} 
\ No newline at end of file
+} 
+
+# 뷰별 쿼리 수/DB 시간 계측 (common_app.instrumentation)
+# True이면 @query_budget 초과 시 예외 발생 (테스트에서 사용), False이면 경고 로그만 남김
+QUERY_BUDGET_RAISE = False
+
+# 앱별 로거 설정 (common_app.log)
+# 앱 로거는 JSON 한 줄로 큐 핸들러에 넘기고 별도 스레드가 출력하므로 요청 스레드를 막지 않음
+# LOG_SAMPLE_RATE: INFO/DEBUG 로그 중 남길 비율 (WARNING 이상은 항상 남김)
+LOG_SAMPLE_RATE = 1.0 if DEBUG else 0.1
+APP_LOG_LEVEL = 'DEBUG' if DEBUG else 'INFO'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'common_app.log.JsonFormatter',
+        },
+    },
+    'filters': {
+        'sampled': {
+            '()': 'common_app.log.SamplingFilter',
+            'rate': LOG_SAMPLE_RATE,
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+        'app_queue': {
+            '()': 'common_app.log.QueueStreamHandler',
+            'formatter': 'json',
+            'filters': ['sampled'],
+        },
+    },
+    'loggers': {
+        'common_app.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        **{
+            app: {
+                'handlers': ['app_queue'],
+                'level': APP_LOG_LEVEL,
+                'propagate': False,
+            }
+            for app in [
+                'common_app', 'food_calendar', 'emergency_app', 'calendar_app', 'care_calendar',
+                'item_purchase_app', 'insurance_app', 'weight_tracker_app', 'community_app', 'photo_board_app',
+            ]
+        },
+    },
+}
+
+# 통합 캘린더 피드 (common_app.calendar_sources)
+# 캐시에 없는 출처를 동시에 조회할 스레드 수 (1이면 순차 조회)
+CALENDAR_FEED_WORKERS = 4
+
+# 커뮤니티 게시글 조회수를 모았다가 반영하는 주기(초) (community_app.view_counts, 0이면 조회마다 바로 반영)
+VIEW_COUNT_FLUSH_SECONDS = 10
+
+# 보험 카탈로그/점수 엔진 캐시가 DB 버전을 다시 확인하는 최소 간격(초) (insurance_app.catalog)
+CATALOG_VERSION_CHECK_SECONDS = 1
+
+# 리마인더 알림 발송 백엔드 (common_app.notifications, run_scheduler 명령이 발송)
+# 운영: 'common_app.notifications.EmailBackend' / 로컬: FileBackend(NOTIFICATION_FILE_PATH) 또는 ConsoleBackend
+NOTIFICATION_BACKEND = 'common_app.notifications.ConsoleBackend' if DEBUG else 'common_app.notifications.EmailBackend'
+NOTIFICATION_FILE_PATH = BASE_DIR / 'notifications.jsonl'
@@ -6,6 +6,9 @@ from .models import VetHospital, HospitalFavorite
 import json
 from common_app.models import Pet
 from django.db import models
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Create your views here.
 
@@ -120,13 +123,8 @@ def create_sample_hospitals():
 @login_required
 def add_search_hospital(request):
     """검색된 병원을 DB에 추가하고 즐겨찾기에 추가"""
-    print("=== DEBUG: add_search_hospital view called ===")
-    print(f"Request method: {request.method}")
-    print(f"Request path: {request.path}")
-    print(f"Request POST data: {request.POST}")
-    print(f"Request user: {request.user}")
-    print(f"User authenticated: {request.user.is_authenticated}")
-    
+    logger.debug('add_search_hospital', extra={'method': request.method, 'user_id': request.user.id})
+
     if request.method == 'POST':
         try:
             name = request.POST.get('name')
@@ -170,6 +168,7 @@ def add_search_hospital(request):
             })
             
         except Exception as e:
+            logger.exception('add_search_hospital failed', extra={'user_id': request.user.id})
             return JsonResponse({'error': str(e)}, status=500)
     
     return JsonResponse({'error': 'POST 요청만 허용됩니다.'}, status=405)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FoodCalendarConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'food_calendar'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,150 @@
+import math
+from datetime import date, timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Q
+
+from common_app.calendar_feed import bump_calendar_version
+from .models import FeedForecast, FoodEvent
+
+# 최근 봉지에 둘 가중치 (지수가중 평균의 평활 계수)
+ALPHA = 0.5
+# 배송 기간 등을 고려해 소진 예상일보다 며칠 먼저 재주문을 권장할지
+REORDER_LEAD_DAYS = 5
+
+
+def consumption_rates(pet_ids=None, alpha=ALPHA):
+    """종료된 사료 봉지들의 하루 섭취량으로 반려동물별 지수가중 평균/표준편차 계산
+
+    {pet_id: (daily_grams, daily_grams_std, 봉지 수)} 반환 (최근 봉지일수록 가중치가 큼)
+    """
+    qs = FoodEvent.objects.filter(type='feed').with_consumption().filter(daily_grams__isnull=False)
+    if pet_ids is not None:
+        qs = qs.filter(pet_id__in=pet_ids)
+    rows = list(qs.order_by('pet_id', 'start_time', 'id').values_list('pet_id', 'daily_grams'))
+    if not rows:
+        return {}
+    pets = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    rates = np.fromiter((row[1] for row in rows), dtype=float, count=len(rows))
+
+    unique, first, counts = np.unique(pets, return_index=True, return_counts=True)
+    group = np.repeat(np.arange(len(unique)), counts)
+    # 같은 반려동물 안에서 가장 최근 봉지가 0, 그 이전이 1, 2, ...
+    age = counts[group] - 1 - (np.arange(len(rows)) - first[group])
+    weights = (1 - alpha) ** age
+    weight_sums = np.bincount(group, weights=weights)
+    means = np.bincount(group, weights=weights * rates) / weight_sums
+    variances = np.bincount(group, weights=weights * (rates - means[group]) ** 2) / weight_sums
+    return {
+        int(pet_id): (float(mean), float(math.sqrt(variance)), int(count))
+        for pet_id, mean, variance, count in zip(unique, means, variances, counts)
+    }
+
+
+def run_out_date(start, quantity_kg, daily_grams):
+    """시작일을 첫날로 셌을 때 마지막으로 먹는 날"""
+    days = quantity_kg * 1000 / daily_grams
+    return start + timedelta(days=max(math.ceil(days) - 1, 0))
+
+
+def forecast_feed(pet_ids=None, lead_days=REORDER_LEAD_DAYS):
+    """열린 사료 봉지의 소진 예상일/재주문 권장일을 계산해 FeedForecast를 다시 생성
+
+    종료된 봉지가 없는 반려동물은 봉지에 입력한 소비 기간(duration_days)으로 추정하고,
+    둘 다 없으면 예측하지 않는다. 생성한 예측 수 반환.
+    """
+    bags = FoodEvent.objects.filter(type='feed', end_time__isnull=True, quantity_kg__gt=0)
+    if pet_ids is not None:
+        bags = bags.filter(pet_id__in=pet_ids)
+    bags = list(bags.values('id', 'user_id', 'pet_id', 'start_time', 'quantity_kg', 'duration_days'))
+    rates = consumption_rates({bag['pet_id'] for bag in bags})
+
+    forecasts = []
+    for bag in bags:
+        if bag['pet_id'] in rates:
+            daily_grams, std, sample_size = rates[bag['pet_id']]
+        elif bag['duration_days']:
+            daily_grams, std, sample_size = bag['quantity_kg'] * 1000 / bag['duration_days'], 0.0, 0
+        else:
+            continue
+        if daily_grams <= 0:
+            continue
+        # 저장된 UTC 기준 날짜 (FoodEventQuerySet.with_consumption과 같은 기준)
+        start = bag['start_time'].date()
+        earliest = run_out_date(start, bag['quantity_kg'], daily_grams + std)
+        forecasts.append(FeedForecast(
+            event_id=bag['id'],
+            pet_id=bag['pet_id'],
+            daily_grams=daily_grams,
+            daily_grams_std=std,
+            sample_size=sample_size,
+            run_out_date=run_out_date(start, bag['quantity_kg'], daily_grams),
+            run_out_earliest=earliest,
+            reorder_by=earliest - timedelta(days=lead_days),
+        ))
+
+    stale = FeedForecast.objects.all()
+    if pet_ids is not None:
+        stale = stale.filter(Q(pet_id__in=pet_ids) | Q(event_id__in=[bag['id'] for bag in bags]))
+    # 캘린더 오버레이가 바뀌므로 관련 사용자의 캘린더 버전 증가
+    owners = set(stale.values_list('pet__owner_id', flat=True)) | {bag['user_id'] for bag in bags}
+    with transaction.atomic():
+        stale.delete()
+        FeedForecast.objects.bulk_create(forecasts, batch_size=1000)
+        bump_calendar_version(*owners, sources=('forecast',))
+    return len(forecasts)
+
+
+def forecast_payload(forecast, today=None):
+    today = today or date.today()
+    return {
+        'event_id': forecast.event_id,
+        'pet_id': forecast.pet_id,
+        'pet_name': forecast.pet.name,
+        'product_name': forecast.event.product_name,
+        'start': forecast.event.start_time.isoformat(),
+        'quantity_kg': forecast.event.quantity_kg,
+        'daily_grams': round(forecast.daily_grams, 1),
+        'daily_grams_std': round(forecast.daily_grams_std, 1),
+        'sample_size': forecast.sample_size,
+        'run_out_date': forecast.run_out_date.isoformat(),
+        'run_out_earliest': forecast.run_out_earliest.isoformat(),
+        'reorder_by': forecast.reorder_by.isoformat(),
+        'days_left': (forecast.run_out_date - today).days,
+        'reorder_due': forecast.reorder_by <= today,
+    }
+
+
+def forecasts_in_window(user, start, end, pet_id=None):
+    """재주문 권장일 또는 소진 예상일이 start~end 안에 있는 사용자의 예측"""
+    forecasts = FeedForecast.objects.filter(pet__owner=user).filter(
+        Q(reorder_by__gte=start, reorder_by__lte=end) | Q(run_out_date__gte=start, run_out_date__lte=end)
+    ).select_related('pet', 'event')
+    if pet_id:
+        forecasts = forecasts.filter(pet_id=pet_id)
+    return forecasts
+
+
+def forecast_calendar_events(forecasts, start, end):
+    """start~end 안의 재주문 권장일/소진 예상일을 FullCalendar 이벤트로 변환 (pet, event select_related 필요)"""
+    event_list = []
+    for forecast in forecasts:
+        name = f"{forecast.event.product_name} ({forecast.pet.name})"
+        for kind, day, title in [
+            ('reorder', forecast.reorder_by, f"🛒 재주문 권장: {name}"),
+            ('runout', forecast.run_out_date, f"⚠️ 사료 소진 예상: {name}"),
+        ]:
+            if start <= day <= end:
+                event_list.append({
+                    'id': f'{kind}_{forecast.event_id}',
+                    'title': title,
+                    'start': day.isoformat(),
+                    'allDay': True,
+                    'pet_id': forecast.pet_id,
+                    'pet_name': forecast.pet.name,
+                    'type': kind,
+                    'event_id': forecast.event_id,
+                    'daily_grams': round(forecast.daily_grams, 1),
+                })
+    return event_list
@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+from food_calendar.forecast import REORDER_LEAD_DAYS, forecast_feed
+
+class Command(BaseCommand):
+    help = '모든 사용자의 열린 사료 봉지에 대해 소진 예상일/재주문 권장일(FeedForecast)을 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pet_ids', nargs='*', type=int, help='다시 계산할 반려동물 ID (생략하면 전체)')
+        parser.add_argument('--lead-days', type=int, default=REORDER_LEAD_DAYS, help='소진 예상일 며칠 전에 재주문을 권장할지')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        created = forecast_feed(options['pet_ids'] or None, lead_days=options['lead_days'])
+        self.stdout.write(self.style.SUCCESS(f'사료 소진 예측 {created}건 생성 완료! ({time.perf_counter() - started:.2f}s)'))
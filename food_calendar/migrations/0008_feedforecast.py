@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_app', '0008_spendingrollup'),
+        ('food_calendar', '0007_alter_foodevent_price'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('daily_grams', models.FloatField(verbose_name='예상 하루 섭취량(g)')),
+                ('daily_grams_std', models.FloatField(default=0, verbose_name='하루 섭취량 표준편차(g)')),
+                ('sample_size', models.PositiveIntegerField(default=0, verbose_name='표본 수')),
+                ('run_out_date', models.DateField(verbose_name='소진 예상일')),
+                ('run_out_earliest', models.DateField(verbose_name='가장 이른 소진 예상일')),
+                ('reorder_by', models.DateField(db_index=True, verbose_name='재주문 권장일')),
+                ('computed_at', models.DateTimeField(auto_now=True, verbose_name='계산 시각')),
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='forecast', to='food_calendar.foodevent', verbose_name='사료 기록')),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_forecasts', to='common_app.pet', verbose_name='반려동물')),
+            ],
+            options={
+                'verbose_name': '사료 소진 예측',
+                'verbose_name_plural': '사료 소진 예측',
+                'ordering': ['reorder_by'],
+            },
+        ),
+    ]
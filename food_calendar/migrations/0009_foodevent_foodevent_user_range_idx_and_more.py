@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_app', '0009_calendarversion'),
+        ('food_calendar', '0008_feedforecast'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='foodevent',
+            index=models.Index(fields=['user', 'start_time', 'end_time'], name='foodevent_user_range_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodevent',
+            index=models.Index(fields=['pet', 'start_time', 'end_time'], name='foodevent_pet_range_idx'),
+        ),
+    ]
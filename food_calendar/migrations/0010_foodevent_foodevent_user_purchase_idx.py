@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_app', '0009_calendarversion'),
+        ('food_calendar', '0009_foodevent_foodevent_user_range_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='foodevent',
+            index=models.Index(fields=['user', 'purchase_date'], name='foodevent_user_purchase_idx'),
+        ),
+    ]
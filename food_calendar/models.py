@@ -1,8 +1,55 @@
+from datetime import date, timezone as dt_timezone
+
 from django.db import models
+from django.db.models import Avg, BooleanField, Case, DateField, ExpressionWrapper, F, FloatField, Q, Value, When, Window
+from django.db.models.functions import Coalesce, TruncDate
+from django.db.models.expressions import RowRange
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth.models import User
+from common_app.db import DaysBetween
 from common_app.models import Pet
 
+
+class FoodEventQuerySet(models.QuerySet):
+    def with_consumption(self, today=None):
+        """개봉 후 일수(days_since_open), 하루 평균 섭취량(daily_grams, 종료된 기록만), 섭취 중 여부(is_active) 주석
+
+        날짜는 저장된 UTC 기준 날짜로 계산하고, 종료되지 않은 기록은 today까지 센다 (시작일 포함).
+        """
+        start = TruncDate('start_time', tzinfo=dt_timezone.utc)
+        end = Coalesce(TruncDate('end_time', tzinfo=dt_timezone.utc), Value(today or date.today(), output_field=DateField()))
+        return self.annotate(
+            days_since_open=DaysBetween(end, start) + 1,
+            is_active=ExpressionWrapper(Q(end_time__isnull=True), output_field=BooleanField()),
+        ).annotate(
+            daily_grams=Case(
+                When(end_time__isnull=False, quantity_kg__gt=0, days_since_open__gt=0,
+                     then=F('quantity_kg') * 1000.0 / F('days_since_open')),
+                default=None,
+                output_field=FloatField(),
+            ),
+        )
+
+    def with_running_average(self):
+        """반려동물별 시작일 순 누적 평균 섭취량(running_daily_grams) 주석 (with_consumption 이후 사용)"""
+        return self.annotate(running_daily_grams=Window(
+            Avg('daily_grams'),
+            partition_by=[F('pet_id')],
+            order_by=[F('start_time').asc(), F('id').asc()],
+            frame=RowRange(start=None, end=0),
+        ))
+
+    def consumption_summary(self, today=None):
+        """사료/간식 건수, 이번 달 건수, 종료된 사료의 평균 daily_grams를 한 번의 집계로 계산"""
+        today = today or date.today()
+        return self.with_consumption(today).aggregate(
+            total_feeds=models.Count('id', filter=Q(type='feed')),
+            total_snacks=models.Count('id', filter=Q(type='snack')),
+            this_month=models.Count('id', filter=Q(start_time__year=today.year, start_time__month=today.month)),
+            avg_daily_grams=Avg('daily_grams', filter=Q(type='feed')),
+        )
+
+
 class FoodEvent(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name='사용자')
     pet = models.ForeignKey(Pet, on_delete=models.CASCADE, verbose_name='반려동물')
@@ -31,10 +78,41 @@ class FoodEvent(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
 
+    objects = FoodEventQuerySet.as_manager()
+
     class Meta:
         ordering = ['-start_time']
+        indexes = [
+            # 캘린더 피드의 기간 조회 (user 또는 pet + 시작/종료 시각)
+            models.Index(fields=['user', 'start_time', 'end_time'], name='foodevent_user_range_idx'),
+            models.Index(fields=['pet', 'start_time', 'end_time'], name='foodevent_pet_range_idx'),
+            # 구매 관리/지출 집계의 구매일 조회
+            models.Index(fields=['user', 'purchase_date'], name='foodevent_user_purchase_idx'),
+        ]
         verbose_name = '식사 기록'
         verbose_name_plural = '식사 기록'
 
     def __str__(self):
         return f'{self.pet.name}의 식사 - {self.start_time}'
+
+
+# 열린 사료 봉지별 소진 예측 (food_calendar.forecast.forecast_feed가 생성)
+class FeedForecast(models.Model):
+    event = models.OneToOneField(FoodEvent, on_delete=models.CASCADE, related_name='forecast', verbose_name='사료 기록')
+    pet = models.ForeignKey(Pet, on_delete=models.CASCADE, related_name='feed_forecasts', verbose_name='반려동물')
+    daily_grams = models.FloatField(verbose_name='예상 하루 섭취량(g)')
+    daily_grams_std = models.FloatField(default=0, verbose_name='하루 섭취량 표준편차(g)')
+    # 섭취량 추정에 사용한 종료된 봉지 수 (0이면 입력한 소비 기간으로 추정)
+    sample_size = models.PositiveIntegerField(default=0, verbose_name='표본 수')
+    run_out_date = models.DateField(verbose_name='소진 예상일')
+    run_out_earliest = models.DateField(verbose_name='가장 이른 소진 예상일')
+    reorder_by = models.DateField(db_index=True, verbose_name='재주문 권장일')
+    computed_at = models.DateTimeField(auto_now=True, verbose_name='계산 시각')
+
+    class Meta:
+        ordering = ['reorder_by']
+        verbose_name = '사료 소진 예측'
+        verbose_name_plural = '사료 소진 예측'
+
+    def __str__(self):
+        return f'{self.pet.name} {self.event.product_name} - {self.run_out_date}'
@@ -9,6 +9,10 @@ class PetSimpleSerializer(serializers.ModelSerializer):
 
 class FoodEventSerializer(serializers.ModelSerializer):
     pet = PetSimpleSerializer(read_only=True)
+    # FoodEvent.objects.with_consumption()으로 주석한 경우에만 포함
+    days_since_open = serializers.IntegerField(read_only=True)
+    daily_grams = serializers.FloatField(read_only=True)
+    is_active = serializers.BooleanField(read_only=True)
     class Meta:
         model = FoodEvent
         fields = '__all__' 
\ No newline at end of file
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+
+from .forecast import forecast_feed
+from .models import FeedForecast, FoodEvent
+
+
+def refresh_forecast_on_save(sender, instance, raw=False, **kwargs):
+    """사료 기록이 바뀌면 해당 반려동물의 섭취량/소진 예측을 다시 계산"""
+    if raw:
+        return
+    # 반려동물이 바뀌었거나 종료된 봉지의 이전 예측 제거
+    FeedForecast.objects.filter(event_id=instance.pk).exclude(pet_id=instance.pet_id).delete()
+    if instance.type == 'feed':
+        forecast_feed([instance.pet_id])
+
+
+def refresh_forecast_on_delete(sender, instance, **kwargs):
+    if instance.type == 'feed':
+        forecast_feed([instance.pet_id])
+
+
+post_save.connect(refresh_forecast_on_save, sender=FoodEvent, dispatch_uid='feed_forecast_post_save')
+post_delete.connect(refresh_forecast_on_delete, sender=FoodEvent, dispatch_uid='feed_forecast_post_delete')
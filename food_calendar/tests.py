@@ -1,3 +1,114 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from common_app.models import Pet
+
+from .forecast import consumption_rates, forecast_feed
+from .models import FeedForecast, FoodEvent
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class FoodTestMixin:
+    def setUp(self):
+        self.user = User.objects.create_user('owner', password='pw')
+        self.pet = Pet.objects.create(owner=self.user, name='코코', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+
+    def bag(self, start, end=None, quantity_kg=0, pet=None, **fields):
+        fields.setdefault('type', 'feed')
+        return FoodEvent.objects.create(
+            user=self.user, pet=pet or self.pet, product_name='사료', start_time=start, end_time=end, quantity_kg=quantity_kg, **fields,
+        )
+
+
+class ConsumptionTests(FoodTestMixin, TestCase):
+    def test_with_consumption(self):
+        finished = self.bag(utc(2026, 1, 1, 23, 30), utc(2026, 1, 10, 8), quantity_kg=2)
+        active = self.bag(utc(2026, 1, 5), quantity_kg=3)
+        empty = self.bag(utc(2026, 1, 1), utc(2026, 1, 2))
+        rows = {
+            row.id: (row.days_since_open, row.is_active, row.daily_grams)
+            for row in FoodEvent.objects.with_consumption(date(2026, 1, 7))
+        }
+        # 시작일/종료일 모두 포함, 날짜는 저장된 UTC 기준
+        self.assertEqual(rows[finished.id], (10, False, 200.0))
+        self.assertEqual(rows[active.id], (3, True, None))
+        self.assertEqual(rows[empty.id], (2, False, None))
+
+    def test_running_average_per_pet(self):
+        other = Pet.objects.create(owner=self.user, name='보리', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+        first = self.bag(utc(2026, 1, 1), utc(2026, 1, 10), quantity_kg=1)
+        second = self.bag(utc(2026, 1, 11), utc(2026, 1, 15), quantity_kg=1)
+        current = self.bag(utc(2026, 1, 16), quantity_kg=1)
+        elsewhere = self.bag(utc(2026, 1, 1), utc(2026, 1, 2), quantity_kg=1, pet=other)
+        rows = dict(FoodEvent.objects.with_consumption(date(2026, 1, 20)).with_running_average().values_list('id', 'running_daily_grams'))
+        self.assertEqual(rows[first.id], 100.0)
+        self.assertEqual(rows[second.id], 150.0)
+        # 아직 먹는 중인 봉지는 평균에 들어가지 않음
+        self.assertEqual(rows[current.id], 150.0)
+        self.assertEqual(rows[elsewhere.id], 500.0)
+
+    def test_consumption_summary(self):
+        self.bag(utc(2026, 1, 1), utc(2026, 1, 10), quantity_kg=1)
+        self.bag(utc(2026, 2, 1), utc(2026, 2, 5), quantity_kg=1)
+        self.bag(utc(2026, 2, 3), type='snack')
+        with self.assertNumQueries(1):
+            summary = FoodEvent.objects.consumption_summary(date(2026, 2, 10))
+        self.assertEqual(summary, {'total_feeds': 2, 'total_snacks': 1, 'this_month': 2, 'avg_daily_grams': 150.0})
+
+
+class FeedForecastTests(FoodTestMixin, TestCase):
+    def forecast(self, bag):
+        row = FeedForecast.objects.get(event=bag)
+        return (row.daily_grams, row.sample_size, row.run_out_date, row.run_out_earliest, row.reorder_by)
+
+    def test_exponentially_weighted_rate(self):
+        self.bag(utc(2026, 1, 1), utc(2026, 1, 10), quantity_kg=1)   # 100g/일
+        self.bag(utc(2026, 1, 11), utc(2026, 1, 15), quantity_kg=1)  # 200g/일
+        mean, std, count = consumption_rates([self.pet.id])[self.pet.id]
+        # 최근 봉지 가중치 1, 그 이전 0.5
+        self.assertAlmostEqual(mean, 500 / 3)
+        self.assertAlmostEqual(std, (2 ** 0.5) * 100 / 3)
+        self.assertEqual(count, 2)
+
+    def test_open_bag_forecast_and_refresh_on_finish(self):
+        self.bag(utc(2026, 1, 1), utc(2026, 1, 10), quantity_kg=1)
+        self.bag(utc(2026, 1, 11), utc(2026, 1, 20), quantity_kg=1)
+        current = self.bag(utc(2026, 1, 21), quantity_kg=3)
+        # 100g/일, 표준편차 0 → 30일째(시작일 포함)에 소진, 5일 전 재주문
+        self.assertEqual(self.forecast(current), (100.0, 2, date(2026, 2, 19), date(2026, 2, 19), date(2026, 2, 14)))
+
+        current.end_time = utc(2026, 2, 10)
+        current.save()
+        self.assertFalse(FeedForecast.objects.exists())
+
+    def test_falls_back_to_duration_days(self):
+        guessed = self.bag(utc(2026, 1, 1), quantity_kg=1, duration_days=10)
+        unknown = self.bag(utc(2026, 1, 1), quantity_kg=1, pet=Pet.objects.create(
+            owner=self.user, name='보리', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1),
+        ))
+        self.assertEqual(self.forecast(guessed), (100.0, 0, date(2026, 1, 10), date(2026, 1, 10), date(2026, 1, 5)))
+        self.assertFalse(FeedForecast.objects.filter(event=unknown).exists())
+
+    def test_batch_rebuild_matches_signals(self):
+        self.bag(utc(2026, 1, 1), utc(2026, 1, 8), quantity_kg=1.5)
+        self.bag(utc(2026, 1, 9), quantity_kg=2)
+        self.bag(utc(2026, 1, 9), quantity_kg=1, duration_days=4, pet=Pet.objects.create(
+            owner=self.user, name='보리', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1),
+        ))
+        incremental = sorted(FeedForecast.objects.values_list('event_id', 'daily_grams', 'run_out_date', 'reorder_by'))
+        FeedForecast.objects.all().delete()
+        self.assertEqual(forecast_feed(), 2)
+        self.assertEqual(sorted(FeedForecast.objects.values_list('event_id', 'daily_grams', 'run_out_date', 'reorder_by')), incremental)
+
+    def test_calendar_overlay_window(self):
+        self.bag(utc(2026, 1, 1), quantity_kg=1, duration_days=10)
+        self.client.force_login(self.user)
+        response = self.client.get('/food/forecast/events/', {'start': '2026-01-08', 'end': '2026-01-31'})
+        self.assertEqual(response.status_code, 200)
+        # 재주문 권장일(1/5)은 기간 밖, 소진 예상일(1/10)만
+        self.assertEqual([(event['type'], event['start']) for event in response.json()], [('runout', '2026-01-10')])
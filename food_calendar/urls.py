@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import food_calendar, get_events, create_event, get_event_details, delete_event, update_food_event, end_event, purchase_management, other_purchase_management, get_events_all, food_stats, create_other_purchase_api
+from .views import food_calendar, get_events, create_event, get_event_details, delete_event, update_food_event, end_event, purchase_management, other_purchase_management, get_events_all, food_stats, create_other_purchase_api, feed_forecast, feed_forecast_events
 
 app_name = 'food_calendar'
 
@@ -16,4 +16,6 @@ urlpatterns = [
     path('api/purchases/other/', create_other_purchase_api, name='api_other_purchase'),
     path('events/all/', get_events_all, name='get_events_all'),
     path('stats/', food_stats, name='food_stats'),
+    path('forecast/', feed_forecast, name='feed_forecast'),
+    path('forecast/events/', feed_forecast_events, name='feed_forecast_events'),
 ] 
\ No newline at end of file
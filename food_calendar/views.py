@@ -1,79 +1,53 @@
 from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import condition, require_http_methods
 from django.contrib.auth.decorators import login_required
 import json
 from datetime import datetime, timedelta, date
-from .models import FoodEvent
+from .models import FeedForecast, FoodEvent
+from .forecast import forecast_calendar_events, forecast_payload, forecasts_in_window
 from common_app.models import Pet
 from django.utils import timezone
-from django.db.models import Q, F, ExpressionWrapper, FloatField, Sum, Value, DecimalField
+from django.db.models import Q, Sum, Value, DecimalField
 from django.db.models.functions import Coalesce
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from .serializers import FoodEventSerializer
 from item_purchase_app.models import OtherPurchase
+from common_app.calendar_feed import InvalidWindow, calendar_etag, parse_date_window, parse_window
+from common_app.instrumentation import query_budget
+from common_app.spending import month_start, month_total
 
 from django.views.decorators.csrf import csrf_exempt
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Create your views here.
 
 @login_required
 def food_calendar(request):
     pets = Pet.objects.filter(owner=request.user)
-    foods = FoodEvent.objects.filter(user=request.user).order_by('-start_time')
-
-    # 종료된 사료만 필터링
-    finished_feeds = foods.filter(type='feed', end_time__isnull=False)
-    avg_list = []
-    for food in finished_feeds:
-        days = (food.end_time.date() - food.start_time.date()).days + 1
-        if days > 0 and food.quantity_kg:
-            avg = food.quantity_kg / days
-            avg_list.append(avg)
-    overall_avg = round(sum(avg_list) / len(avg_list), 3) if avg_list else 0
-    overall_avg_gram = int(overall_avg * 1000)
-
     today = date.today()
-    total_feeds = foods.filter(type='feed').count()
-    total_snacks = foods.filter(type='snack').count()
-    this_month_count = foods.filter(start_time__year=today.year, start_time__month=today.month).count()
-    cost_qs = FoodEvent.objects.filter(
-        start_time__year=today.year,
-        start_time__month=today.month
-    )
-    agg = cost_qs.aggregate(total=Sum('price'))
-    total_cost = float(agg['total'] or 0)
-    # 디버깅용: 실제 price, 날짜, 타입, 집계 포함 여부 출력 (운영시 삭제)
-    print(f"[DEBUG] 현재 로그인 user id: {request.user.id}, username: {request.user.username}")
-    # user 조건 없이 집계 (테스트)
-    cost_qs = FoodEvent.objects.filter(
-        start_time__year=today.year,
-        start_time__month=today.month
-    )
-    agg = cost_qs.aggregate(total=Sum('price'))
-    total_cost = float(agg['total'] or 0)
-    # 디버깅용: 실제 price, 날짜, 타입, 집계 포함 여부 출력 (운영시 삭제)
-    print(f"[DEBUG] 오늘: {today}")
-    for food in foods:
-        print(f"[DEBUG] id={food.id}, price={food.price}, type={food.type}, user={food.user}, start_time={food.start_time}, year={food.start_time.year}, month={food.start_time.month}")
-        if food.start_time.year == today.year and food.start_time.month == today.month:
-            print(f"[DEBUG]  -> 집계 포함!")
-    print(f"[DEBUG] total_cost 집계 결과: {total_cost}")
-
-    # foods에 가상 필드 추가
-    for food in foods:
-        food.open_date = food.start_time
-        food.end_date = food.end_time
-        if food.end_time:
-            food.days_since_open = (food.end_time.date() - food.start_time.date()).days + 1
-        else:
-            food.days_since_open = (today - food.start_time.date()).days + 1
-        # 하루평균 섭취량(정수 g) 계산
-        if food.type == 'feed' and food.end_time and food.quantity_kg and food.days_since_open > 0:
-            food.avg_gram = int(round(food.quantity_kg / food.days_since_open * 1000))
-        else:
-            food.avg_gram = ''
+    foods = FoodEvent.objects.filter(user=request.user).with_consumption(today).select_related('pet', 'forecast').order_by('-start_time')
+
+    # 건수와 종료된 사료의 하루 평균 섭취량을 한 번의 집계로 계산
+    summary = FoodEvent.objects.filter(user=request.user).consumption_summary(today)
+    total_feeds = summary['total_feeds']
+    total_snacks = summary['total_snacks']
+    this_month_count = summary['this_month']
+    overall_avg = round(summary['avg_daily_grams'] / 1000, 3) if summary['avg_daily_grams'] else 0
+    overall_avg_gram = int(overall_avg * 1000)
+    # 이번 달 구매 금액은 월별 지출 집계(SpendingRollup)에서 조회
+    total_cost = float(month_total(request.user, 'food', month_start(today)))
+    # 행마다 출력하던 디버그 로그 대신 요청당 요약 한 줄만 남김
+    logger.debug('food_calendar summary', extra={
+        'user_id': request.user.id,
+        'feeds': total_feeds,
+        'snacks': total_snacks,
+        'this_month': this_month_count,
+        'total_cost': total_cost,
+    })
 
     return render(request, 'food_calendar/food_calendar.html', {
         'pets': pets,
@@ -86,21 +60,14 @@ def food_calendar(request):
     })
 
 @login_required
+@condition(etag_func=calendar_etag)
+@query_budget(6)
 def get_events(request, pet_id):
-    start_str = request.GET.get('start')
-    end_str = request.GET.get('end')
-    # URL 쿼리에서 '+'가 space로 변환되므로 복원
-    if start_str:
-        start_str = start_str.replace(' ', '+')
-    if end_str:
-        end_str = end_str.replace(' ', '+')
+    # start/end는 필수 (FullCalendar가 보내는 ISO 문자열, '+'가 공백으로 바뀐 경우 복원)
     try:
-        # ISO 포맷 문자열을 datetime 객체로 변환
-        start_dt = datetime.fromisoformat(start_str)
-        end_dt = datetime.fromisoformat(end_str)
-    except Exception:
-        return JsonResponse({'error': 'Invalid date format'}, status=400)
-    end_param = end_str
+        start_dt, end_dt = parse_window(request)
+    except InvalidWindow as e:
+        return JsonResponse({'error': str(e)}, status=400)
     # feed(사료)는 개봉부터 종료 전까지 혹은 종료된 경우에도 윈도우 기간에 걸쳐 표시
     events = FoodEvent.objects.filter(
         user=request.user,
@@ -109,7 +76,7 @@ def get_events(request, pet_id):
         Q(type='feed', end_time__isnull=True, start_time__lte=end_dt)
         | Q(type='feed', end_time__isnull=False, end_time__gte=start_dt, start_time__lte=end_dt)
         | Q(type='snack', start_time__gte=start_dt, start_time__lte=end_dt)
-    )
+    ).select_related('pet')
     event_list = []
     for event in events:
         if event.type == 'feed':
@@ -373,42 +340,24 @@ def purchase_management(request):
     if search:
         events = events.filter(product_name__icontains=search)
     
-    # 일일 평균 섭취량 계산
-    events = events.annotate(
-        computed_duration_days=Coalesce(
-            ExpressionWrapper(
-                F('end_time') - F('start_time'),
-                output_field=FloatField()
-            ) / (24*60*60*1000000),
-            1.0
-        ),
-        daily_amount=ExpressionWrapper(
-            F('quantity_kg') / F('computed_duration_days'),
-            output_field=FloatField()
-        )
-    ).order_by('-purchase_date')
-
-    # 월 총 합계(가격) 계산
-    total_price = events.aggregate(
-        total_price=Coalesce(
-            Sum('price'),
-            Value(0),
-            output_field=DecimalField(max_digits=12, decimal_places=2)
-        )
-    )['total_price']
-    
+    # 일일 평균 섭취량(daily_grams)은 DB에서 계산
+    events = events.with_consumption().select_related('pet').order_by('-purchase_date')
+
     selected_type = request.GET.get('type', '')
     if selected_type:
         events = events.filter(type=selected_type)
     
-    # 모든 필터 적용 후에 합계 계산
-    total_price = events.aggregate(
-        total_price=Coalesce(
-            Sum('price'),
-            Value(0),
-            output_field=DecimalField(max_digits=12, decimal_places=2)
-        )
-    )['total_price']
+    # 모든 필터 적용 후에 합계 계산 (검색어가 없으면 월별 지출 집계에서 조회)
+    if search:
+        total_price = events.aggregate(
+            total_price=Coalesce(
+                Sum('price'),
+                Value(0),
+                output_field=DecimalField(max_digits=12, decimal_places=2)
+            )
+        )['total_price']
+    else:
+        total_price = month_total(request.user, 'food', start_date.date(), pet=selected_pet_id, category=selected_type)
 
     context = {
         'events': events,
@@ -437,8 +386,11 @@ def other_purchase_management(request):
     qs = OtherPurchase.objects.filter(user=request.user, purchase_date__gte=start_date, purchase_date__lt=end_date)
     if search:
         qs = qs.filter(product_name__icontains=search)
-    # 총합
-    total_price = qs.aggregate(total_price=Coalesce(Sum('price'), Value(0), output_field=DecimalField()))['total_price']
+    # 총합 (검색어가 없으면 월별 지출 집계에서 조회)
+    if search:
+        total_price = qs.aggregate(total_price=Coalesce(Sum('price'), Value(0), output_field=DecimalField()))['total_price']
+    else:
+        total_price = month_total(request.user, 'other', start_date.date())
     context = {
         'purchases': qs.order_by('-purchase_date'),
         'current_month': start_date.strftime('%Y-%m'),
@@ -448,18 +400,13 @@ def other_purchase_management(request):
     return render(request, 'food_calendar/other_purchase_management.html', context)
 
 @login_required
+@condition(etag_func=calendar_etag)
+@query_budget(6)
 def get_events_all(request):
-    start_str = request.GET.get('start')
-    end_str = request.GET.get('end')
-    if start_str:
-        start_str = start_str.replace(' ', '+')
-    if end_str:
-        end_str = end_str.replace(' ', '+')
     try:
-        start_dt = datetime.fromisoformat(start_str)
-        end_dt = datetime.fromisoformat(end_str)
-    except Exception:
-        return JsonResponse({'error': 'Invalid date format'}, status=400)
+        start_dt, end_dt = parse_window(request)
+    except InvalidWindow as e:
+        return JsonResponse({'error': str(e)}, status=400)
     # 전체 반려동물의 이벤트 필터링
     events = FoodEvent.objects.filter(
         user=request.user
@@ -467,7 +414,7 @@ def get_events_all(request):
         Q(type='feed', end_time__isnull=True, start_time__lte=end_dt)
         | Q(type='feed', end_time__isnull=False, end_time__gte=start_dt, start_time__lte=end_dt)
         | Q(type='snack', start_time__gte=start_dt, start_time__lte=end_dt)
-    )
+    ).select_related('pet')
     event_list = []
     for event in events:
         if event.type == 'feed':
@@ -537,28 +484,19 @@ def purchase_management_api(request):
     if selected_type:
         events = events.filter(type=selected_type)
 
-    # 일일 평균 섭취량 계산
-    events = events.annotate(
-        computed_duration_days=Coalesce(
-            ExpressionWrapper(
-                F('end_time') - F('start_time'),
-                output_field=FloatField()
-            ) / (24*60*60*1000000),
-            1.0
-        ),
-        daily_amount=ExpressionWrapper(
-            F('quantity_kg') / F('computed_duration_days'),
-            output_field=FloatField()
-        )
-    ).order_by('-purchase_date')
+    # 일일 평균 섭취량(daily_grams)은 DB에서 계산
+    events = events.with_consumption().select_related('pet').order_by('-purchase_date')
 
-    total_price = events.aggregate(
-        total_price=Coalesce(
-            Sum('price'),
-            Value(0),
-            output_field=DecimalField(max_digits=12, decimal_places=2)
-        )
-    )['total_price']
+    if search:
+        total_price = events.aggregate(
+            total_price=Coalesce(
+                Sum('price'),
+                Value(0),
+                output_field=DecimalField(max_digits=12, decimal_places=2)
+            )
+        )['total_price']
+    else:
+        total_price = month_total(request.user, 'food', start_date.date(), pet=selected_pet_id, category=selected_type)
 
     serializer = FoodEventSerializer(events, many=True)
     return JsonResponse({
@@ -593,18 +531,43 @@ def food_stats(request):
     pet_id = request.GET.get('pet_id')
     type_param = request.GET.get('type')
     foods = FoodEvent.objects.filter(user=request.user)
-    if pet_id and pet_id != 'all':
-        foods = foods.filter(pet_id=pet_id)
-    if type_param and type_param != 'all':
-        foods = foods.filter(type=type_param)
+    pet_filter = pet_id if pet_id and pet_id != 'all' else None
+    type_filter = type_param if type_param and type_param != 'all' else None
+    if pet_filter:
+        foods = foods.filter(pet_id=pet_filter)
+    if type_filter:
+        foods = foods.filter(type=type_filter)
     today = date.today()
     total_feeds = foods.filter(type='feed').count()
     total_snacks = foods.filter(type='snack').count()
     this_month_count = foods.filter(start_time__year=today.year, start_time__month=today.month).count()
-    total_cost = foods.filter(purchase_date__year=today.year, purchase_date__month=today.month).aggregate(total=Sum('price'))['total'] or 0
+    total_cost = month_total(request.user, 'food', month_start(today), pet=pet_filter, category=type_filter)
     return JsonResponse({
         'total_feeds': total_feeds,
         'total_snacks': total_snacks,
         'this_month_count': this_month_count,
         'total_cost': int(total_cost),
     })
+
+
+@login_required
+def feed_forecast(request):
+    # 열린 사료 봉지별 소진 예상일/재주문 권장일 (forecast_feed 명령/시그널이 미리 계산한 값)
+    forecasts = FeedForecast.objects.filter(pet__owner=request.user).select_related('pet', 'event')
+    pet_id = request.GET.get('pet_id')
+    if pet_id and pet_id != 'all':
+        forecasts = forecasts.filter(pet_id=pet_id)
+    today = date.today()
+    return JsonResponse({'forecasts': [forecast_payload(forecast, today) for forecast in forecasts]})
+
+@login_required
+@condition(etag_func=calendar_etag)
+def feed_forecast_events(request):
+    # 캘린더 오버레이용: 기간 안의 재주문 권장일/소진 예상일을 FullCalendar 이벤트로 반환
+    try:
+        start, end = parse_date_window(request)
+    except InvalidWindow as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    pet_id = request.GET.get('pet_id')
+    forecasts = forecasts_in_window(request.user, start, end, pet_id=pet_id if pet_id != 'all' else None)
+    return JsonResponse(forecast_calendar_events(forecasts, start, end), safe=False)
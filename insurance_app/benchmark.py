@@ -0,0 +1,264 @@
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import Client
+
+from common_app.models import Pet
+from . import signals
+from .catalog import COVER_TYPE_TO_CATEGORY, invalidate_catalog
+from .coverage_index import rebuild_disease_coverage
+from .models import (
+    Breed, Cover, CoverType, Disease, InsuranceCompany, InsuranceDetail, InsuranceProduct, PetProfile,
+    RecommendationResult,
+)
+from .scoring import invalidate_scoring_engine
+from .utils import recommend_insurance, recompute_sure_indexes, refresh_product_summaries
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+BENCH_USERNAME = 'insurance-bench'
+BENCH_PREFERENCES = {
+    'outpatient': 5, 'inpatient': 4, 'surgery': 2, 'liability': 1,
+    'joint': 5, 'skin': 3, 'oral': 1, 'urinary': 2,
+}
+
+
+def generate_catalog(n_products, seed=0, diseases=60, breeds=45, covers_per_product=6, details_per_product=2):
+    """보험사/상품/보장/상세 플랜/질병/품종 합성 데이터를 bulk_create로 생성"""
+    rng = random.Random(seed)
+    CoverType.objects.bulk_create([CoverType(id=pk, type=name) for pk, name in COVER_TYPE_TO_CATEGORY.items()])
+    Disease.objects.bulk_create([
+        Disease(name=f'질병{i}', info='정보', cause='원인', tip='팁', cover_type=rng.choice([None, *COVER_TYPE_TO_CATEGORY]))
+        for i in range(diseases)
+    ])
+    disease_ids = list(Disease.objects.values_list('id', flat=True))
+    Breed.objects.bulk_create([Breed(name=f'품종{i}', species=1 if i % 3 else 2) for i in range(breeds)])
+    Breed.disease.through.objects.bulk_create([
+        Breed.disease.through(breed_id=breed_id, disease_id=disease_id)
+        for breed_id in Breed.objects.values_list('id', flat=True)
+        for disease_id in rng.sample(disease_ids, 3)
+    ])
+
+    InsuranceCompany.objects.bulk_create([
+        InsuranceCompany(name=f'보험사{i}', rating=round(rng.uniform(1, 5), 2), contact_number='')
+        for i in range(max(1, n_products // 20))
+    ])
+    company_ids = list(InsuranceCompany.objects.values_list('id', flat=True))
+    InsuranceProduct.objects.bulk_create([
+        InsuranceProduct(
+            company_id=rng.choice(company_ids),
+            name=f'상품{i}',
+            pet_type=rng.choice(['dog', 'cat']),
+            base_price=rng.randint(10000, 90000),
+            min_age=0,
+            max_age=rng.choice([10, 15, 20]),
+            coverage_period=3,
+            renewal_cycle=3,
+            coverage_details={},
+            coverage_limits={},
+            special_benefits=[],
+        )
+        for i in range(n_products)
+    ], batch_size=1000)
+    product_ids = list(InsuranceProduct.objects.values_list('id', flat=True))
+
+    Cover.objects.bulk_create([
+        Cover(cover_type=rng.randint(1, 8), insurance_id=product_id, price=rng.randint(1, 300) * 10000, detail=f'보장 {product_id}-{i}')
+        for product_id in product_ids
+        for i in range(covers_per_product)
+    ], batch_size=1000)
+    product_covers = {}
+    for cover_id, product_id in Cover.objects.values_list('id', 'insurance_id'):
+        product_covers.setdefault(product_id, []).append(cover_id)
+    products = list(InsuranceProduct.objects.all())
+    for product in products:
+        covers = product_covers.get(product.id, [])
+        product.coverage_details = {'기본보장': covers[:covers_per_product // 2], '특별보장': covers[covers_per_product // 2:]}
+        product.special_benefits = covers[covers_per_product // 2:]
+    InsuranceProduct.objects.bulk_update(products, ['coverage_details', 'special_benefits'], batch_size=1000)
+
+    InsuranceDetail.objects.bulk_create([
+        InsuranceDetail(
+            insurance_id=product_id,
+            name=f'플랜{i}',
+            fee=rng.randint(10000, 90000),
+            basic=rng.sample(disease_ids, 5),
+            special=rng.sample(disease_ids, 2),
+            all_cover=[0] + [rng.randint(0, 1) for _ in COVER_TYPE_TO_CATEGORY],
+            price_score=rng.random(),
+        )
+        for product_id in product_ids
+        for i in range(details_per_product)
+    ], batch_size=1000)
+
+    # bulk 연산은 시그널을 보내지 않으므로 요약/역색인/캐시를 직접 갱신
+    refresh_product_summaries()
+    rebuild_disease_coverage()
+    recompute_sure_indexes()
+    invalidate_catalog()
+    invalidate_scoring_engine()
+    return len(product_ids)
+
+
+# 카탈로그 행마다 캐시 무효화/역색인 재생성을 실행하는 삭제 시그널 (전체 삭제 중에는 끊고 끝나면 한 번만 갱신)
+CATALOG_DELETE_RECEIVERS = [
+    (signals.refresh_coverage_catalog, (Cover, Disease, Breed, CoverType)),
+    (signals.refresh_scoring_engine, (InsuranceProduct, InsuranceDetail, InsuranceCompany)),
+    (signals.refresh_detail_summary, (InsuranceDetail,)),
+    (signals.refresh_disease_coverage, (Disease,)),
+]
+
+
+@contextmanager
+def catalog_delete_signals_disconnected():
+    pairs = [(receiver, sender) for receiver, senders in CATALOG_DELETE_RECEIVERS for sender in senders]
+    for receiver, sender in pairs:
+        post_delete.disconnect(receiver, sender=sender)
+    try:
+        yield
+    finally:
+        for receiver, sender in pairs:
+            post_delete.connect(receiver, sender=sender)
+
+
+def clear_catalog():
+    """보험 카탈로그 전체와 벤치마크 사용자 삭제 (benchmark_insurance 명령의 테스트 DB에서만 사용)"""
+    RecommendationResult.objects.all().delete()
+    User.objects.filter(username=BENCH_USERNAME).delete()
+    with catalog_delete_signals_disconnected():
+        InsuranceProduct.objects.all().delete()
+        InsuranceCompany.objects.all().delete()
+        Breed.objects.all().delete()
+        Disease.objects.all().delete()
+        CoverType.objects.all().delete()
+    invalidate_catalog()
+    invalidate_scoring_engine()
+
+
+def create_bench_pet():
+    user = User.objects.create_user(BENCH_USERNAME, password=BENCH_USERNAME)
+    breed = Breed.objects.filter(species=1).order_by('id').first()
+    pet = Pet.objects.create(owner=user, name='벤치', pet_type='dog', breed=breed.name, birth_date=date(2020, 1, 1), weight=8)
+    PetProfile.objects.create(
+        user=user, name=pet.name, pet_type='dog', breed=breed.name, birth_date=pet.birth_date,
+        weight=pet.weight, gender='male', preference_dict=BENCH_PREFERENCES,
+    )
+    return user, pet
+
+
+def clear_recommendation_results():
+    RecommendationResult.objects.all().delete()
+
+
+def bench_scenarios(client, pet):
+    """(이름, 호출 함수, measure 옵션) 목록 — 뷰는 test client로, recommend_insurance는 직접 호출
+
+    insurance_recommend는 미리 계산된 추천 결과(RecommendationResult)를 지우고 콜드를 측정해
+    콜드는 점수 계산 경로, 반복 측정은 캐시 조회 경로가 되고,
+    insurance_recommend_uncached는 매 호출 전에 지워 점수 계산 경로만 측정한다.
+    """
+    recommend_data = {**BENCH_PREFERENCES, 'breed': pet.breed}
+    birth = pet.birth_date.isoformat()
+    recommend = lambda: client.post(f'/insurance/recommend/{pet.id}/', recommend_data)  # noqa: E731
+    return [
+        ('insurance_recommend', recommend, {'reset': clear_recommendation_results}),
+        ('insurance_recommend_uncached', recommend, {'reset': clear_recommendation_results, 'reset_each': True}),
+        ('insurance_compare', lambda: client.get(f'/insurance/compare/?pet_id={pet.id}'), {}),
+        ('insurance_compare_post', lambda: client.post(f'/insurance/compare/?pet_id={pet.id}', BENCH_PREFERENCES), {}),
+        ('api_recommend', lambda: client.post('/insurance/api/recommend/', {'pet_type': 'dog', 'pet_birth': birth}), {}),
+        ('recommend_insurance', lambda: recommend_insurance('dog', pet.birth_date), {}),
+    ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class QueryCounter:
+    """connection.execute_wrapper로 실행된 SQL 수를 셈 (CaptureQueriesContext의 9000개 제한 없음)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(func, repeat=20, warmup=2, reset=None, reset_each=False):
+    """콜드 1회, 워밍업 후 repeat회 실행 시간(ms)/쿼리 수, tracemalloc 최대 메모리 측정
+
+    reset은 콜드 실행 전에 호출하고, reset_each면 매 실행 전에 호출한다 (시간/쿼리 수에서 제외).
+    """
+    def prepare():
+        if reset_each:
+            reset()
+
+    if reset:
+        reset()
+    started = time.perf_counter()
+    response = func()
+    cold_ms = (time.perf_counter() - started) * 1000
+    status = getattr(response, 'status_code', None)
+    for _ in range(warmup):
+        prepare()
+        func()
+    timings, query_counts = [], []
+    for _ in range(repeat):
+        prepare()
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        query_counts.append(counter.count)
+    prepare()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'status': status,
+        'cold_ms': round(cold_ms, 3),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'mean_ms': round(statistics.fmean(timings), 3) if timings else 0.0,
+        'queries': int(statistics.median(query_counts)) if query_counts else 0,
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, repeat=20, warmup=2, seed=0, scenarios=None, log=None):
+    """카탈로그 크기별로 합성 데이터를 만들고 각 시나리오를 측정한 결과 dict 반환"""
+    results = {'sizes': {}, 'repeat': repeat, 'warmup': warmup, 'seed': seed, 'database': connection.vendor}
+    for size in sizes:
+        clear_catalog()
+        started = time.perf_counter()
+        generate_catalog(size, seed=seed)
+        _, pet = create_bench_pet()
+        client = Client()
+        client.force_login(pet.owner)
+        size_result = {'generate_s': round(time.perf_counter() - started, 3), 'scenarios': {}}
+        for name, func, options in bench_scenarios(client, pet):
+            if scenarios and name not in scenarios:
+                continue
+            size_result['scenarios'][name] = measure(func, repeat=repeat, warmup=warmup, **options)
+            if log:
+                log(size, name, size_result['scenarios'][name])
+        results['sizes'][str(size)] = size_result
+    clear_catalog()
+    return results
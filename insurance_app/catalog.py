@@ -0,0 +1,245 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import F
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+FIXTURE_FILES = ('cover.json', 'disease.json', 'breed.json', 'cover_type.json')
+
+# cover_type → 카테고리명 매핑
+COVER_TYPE_TO_CATEGORY = {
+    1: '통원',
+    2: '입원',
+    3: '수술',
+    4: '슬관절',
+    5: '피부병',
+    6: '구강질환',
+    7: '비뇨기질환',
+    8: '배상책임',
+}
+
+
+class CoverageCatalog:
+    """보장(cover)/질병/품종/보장유형 데이터를 pk 기준으로 색인해 둔 읽기 전용 카탈로그"""
+
+    def __init__(self, covers, diseases, breeds, cover_types, source):
+        self.covers = covers            # cover pk -> {'cover_type', 'insurance', 'price', 'wild', 'detail'}
+        self.diseases = diseases        # disease pk -> {'name', 'cover_type', 'info', 'cause', 'tip'}
+        self.breeds = breeds            # 품종명 -> {'pk', 'species', 'disease': [disease pk, ...]}
+        self.cover_types = cover_types  # cover_type pk -> 유형명
+        self.source = source
+        self.cover_id_to_type = {pk: cover['cover_type'] for pk, cover in covers.items()}
+        self.breed_names = list(breeds.keys())
+
+    def cover_detail(self, pk):
+        return self.covers.get(pk, {}).get('detail')
+
+    def disease_name(self, pk):
+        return self.diseases.get(pk, {}).get('name')
+
+    def breed_disease_pks(self, breed_name):
+        breed = self.breeds.get(breed_name)
+        return list(breed['disease']) if breed else []
+
+    def verbose_coverage(self, coverage_details):
+        """보장 id 리스트를 보장 설명/질병명으로 변환"""
+        verbose = {}
+        for key, value in coverage_details.items():
+            if isinstance(value, list):
+                verbose[key] = [self.cover_detail(i) or self.disease_name(i) or str(i) for i in value]
+            else:
+                verbose[key] = value
+        return verbose
+
+    def category_summary(self, coverage_details):
+        """카테고리별 보장 내용 정리 (중복 제거)"""
+        category_details = defaultdict(set)
+        for section in ['기본보장', '특별보장']:
+            for cover_id in coverage_details.get(section, []):
+                cover = self.covers.get(cover_id)
+                if cover:
+                    category = COVER_TYPE_TO_CATEGORY.get(cover['cover_type'], '기타')
+                    category_details[category].add(cover['detail'])
+        return {cat: list(details) for cat, details in category_details.items()}
+
+
+def _fixture_mtimes():
+    mtimes = []
+    for name in FIXTURE_FILES:
+        path = FIXTURES_DIR / name
+        mtimes.append(path.stat().st_mtime if path.exists() else None)
+    return tuple(mtimes)
+
+
+def _read_fixture(name):
+    path = FIXTURES_DIR / name
+    if not path.exists():
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def iter_fixture(name, chunk_size=64 * 1024):
+    """fixture(JSON 배열) 파일을 전체를 메모리에 올리지 않고 객체 단위로 읽음"""
+    path = FIXTURES_DIR / name
+    if not path.exists():
+        return
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    with open(path, encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            buffer += chunk
+            while True:
+                buffer = buffer.lstrip(', \t\r\n') if started else buffer.lstrip()
+                if not started:
+                    if not buffer:
+                        break
+                    if buffer[0] != '[':
+                        raise ValueError(f'{name}: JSON 배열 형식이 아닙니다.')
+                    buffer = buffer[1:]
+                    started = True
+                    continue
+                if not buffer or buffer[0] == ']':
+                    break
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    if not chunk:
+                        raise
+                    break  # 객체가 청크 경계에 걸쳐 있으면 다음 청크를 더 읽음
+                yield item
+                buffer = buffer[end:]
+            if not chunk:
+                return
+
+
+def _load_from_fixtures():
+    covers = {item['pk']: item['fields'] for item in _read_fixture('cover.json')}
+    diseases = {item['pk']: item['fields'] for item in _read_fixture('disease.json')}
+    breeds = {
+        item['fields']['name']: {
+            'pk': item['pk'],
+            'species': item['fields']['species'],
+            'disease': item['fields'].get('disease', []),
+        }
+        for item in _read_fixture('breed.json')
+    }
+    cover_types = {item['pk']: item['fields']['type'] for item in _read_fixture('cover_type.json')}
+    return CoverageCatalog(covers, diseases, breeds, cover_types, source='fixtures')
+
+
+def _load_from_db():
+    from .models import Breed, Cover, CoverType, Disease
+
+    covers = {
+        row['id']: {
+            'cover_type': row['cover_type'],
+            'insurance': row['insurance_id'],
+            'price': row['price'],
+            'wild': row['wild'],
+            'detail': row['detail'],
+        }
+        for row in Cover.objects.values('id', 'cover_type', 'insurance_id', 'price', 'wild', 'detail')
+    }
+    if not covers:
+        return None
+    diseases = {
+        row.pop('id'): row
+        for row in Disease.objects.values('id', 'name', 'cover_type', 'info', 'cause', 'tip')
+    }
+    breed_diseases = defaultdict(list)
+    for breed_id, disease_id in Breed.disease.through.objects.order_by('id').values_list('breed_id', 'disease_id'):
+        breed_diseases[breed_id].append(disease_id)
+    breeds = {
+        row['name']: {'pk': row['id'], 'species': row['species'], 'disease': breed_diseases.get(row['id'], [])}
+        for row in Breed.objects.order_by('id').values('id', 'name', 'species')
+    }
+    cover_types = dict(CoverType.objects.values_list('id', 'type'))
+    return CoverageCatalog(covers, diseases, breeds, cover_types, source='db')
+
+
+def bump_catalog_version(name):
+    """DB 버전 증가 → 다른 프로세스의 캐시도 다음 확인 때 다시 로드됨"""
+    from .models import CatalogVersion
+
+    if not CatalogVersion.objects.filter(name=name).update(version=F('version') + 1):
+        CatalogVersion.objects.bulk_create([CatalogVersion(name=name, version=1)], ignore_conflicts=True)
+
+
+def stored_catalog_version(name):
+    from .models import CatalogVersion
+
+    try:
+        return CatalogVersion.objects.filter(name=name).values_list('version', flat=True).first() or 0
+    except DatabaseError:
+        return None
+
+
+class VersionCheck:
+    """DB 버전을 CATALOG_VERSION_CHECK_SECONDS 간격으로만 읽어 요청마다 쿼리하지 않도록 함"""
+
+    def __init__(self, name):
+        self.name = name
+        self.version = None
+        self.checked_at = None
+
+    def current(self):
+        now = time.monotonic()
+        interval = getattr(settings, 'CATALOG_VERSION_CHECK_SECONDS', 1)
+        if self.checked_at is None or now - self.checked_at >= interval:
+            self.version = stored_catalog_version(self.name)
+            self.checked_at = now
+        return self.version
+
+    def expire(self):
+        self.checked_at = None
+
+
+_lock = threading.Lock()
+_catalog = None
+_catalog_mtimes = None
+_catalog_version = None
+_version_check = VersionCheck('coverage')
+
+
+def get_catalog():
+    """프로세스 단위로 캐시된 카탈로그 반환 (DB 우선, 비어 있으면 fixtures 사용)
+
+    다른 프로세스(워커, import 명령)가 바꾼 경우에도 DB 버전이 달라지면 다시 로드한다.
+    """
+    global _catalog, _catalog_mtimes, _catalog_version
+    mtimes = _fixture_mtimes()
+    version = _version_check.current()
+    catalog = _catalog
+    if catalog is not None and version == _catalog_version and (catalog.source == 'db' or mtimes == _catalog_mtimes):
+        return catalog
+    with _lock:
+        if (
+            _catalog is None
+            or version != _catalog_version
+            or (_catalog.source == 'fixtures' and mtimes != _catalog_mtimes)
+        ):
+            try:
+                loaded = _load_from_db()
+            except DatabaseError:
+                loaded = None
+            _catalog = loaded or _load_from_fixtures()
+            _catalog_mtimes = mtimes
+            _catalog_version = version
+        return _catalog
+
+
+def invalidate_catalog(*args, **kwargs):
+    """Cover/Disease/Breed/CoverType 변경 시 호출되어 다음 요청에서 다시 로드되도록 함 (다른 프로세스 포함)"""
+    global _catalog
+    with _lock:
+        _catalog = None
+    bump_catalog_version('coverage')
+    _version_check.expire()
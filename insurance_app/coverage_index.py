@@ -0,0 +1,70 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from .catalog import get_catalog
+from .models import DiseaseCoverage, InsuranceDetail
+
+
+def coverage_rows(detail_id, insurance_id, basic, special, all_cover, disease_cover_types):
+    """상세 플랜 하나가 보장하는 (disease_id, insurance_id, detail_id, source) 목록"""
+    rows = set()
+    for source, ids in (('basic', basic), ('special', special)):
+        for disease_id in ids or []:
+            if disease_id in disease_cover_types:
+                rows.add((disease_id, insurance_id, detail_id, source))
+    # all_cover[cover_type] == 1 이면 해당 보장유형의 질병을 보장
+    if isinstance(all_cover, list):
+        for disease_id, cover_type in disease_cover_types.items():
+            if cover_type and cover_type < len(all_cover) and all_cover[cover_type]:
+                rows.add((disease_id, insurance_id, detail_id, 'all_cover'))
+    return rows
+
+
+def rebuild_disease_coverage(product_ids=None):
+    """InsuranceDetail.basic/special/all_cover로 질병 → 상품 역색인을 다시 생성"""
+    disease_cover_types = {pk: disease.get('cover_type') for pk, disease in get_catalog().diseases.items()}
+    details = InsuranceDetail.objects.all()
+    existing = DiseaseCoverage.objects.all()
+    if product_ids is not None:
+        details = details.filter(insurance_id__in=product_ids)
+        existing = existing.filter(insurance_id__in=product_ids)
+    rows = set()
+    for detail_id, insurance_id, basic, special, all_cover in details.values_list('id', 'insurance_id', 'basic', 'special', 'all_cover'):
+        rows |= coverage_rows(detail_id, insurance_id, basic, special, all_cover, disease_cover_types)
+    with transaction.atomic():
+        existing.delete()
+        DiseaseCoverage.objects.bulk_create([
+            DiseaseCoverage(disease_id=disease_id, insurance_id=insurance_id, detail_id=detail_id, source=source)
+            for disease_id, insurance_id, detail_id, source in sorted(rows)
+        ], batch_size=1000)
+    return len(rows)
+
+
+def products_covering(disease_ids):
+    """질병 ID 목록 중 각 상품이 보장하는 질병 ID 집합 {product_id: {disease_id, ...}}"""
+    covered = defaultdict(set)
+    if not disease_ids:
+        return covered
+    pairs = DiseaseCoverage.objects.filter(disease_id__in=disease_ids).values_list('insurance_id', 'disease_id').distinct()
+    for insurance_id, disease_id in pairs:
+        covered[insurance_id].add(disease_id)
+    return covered
+
+
+def breed_disease_bonus(product_ids, breed_disease_pks):
+    """상품별 품종 취약 질병 보장 비율(0~1)과 보장 질병 집합"""
+    matrix, covered_rows = breed_bonus_matrix(product_ids, [breed_disease_pks])
+    return matrix[0], covered_rows[0]
+
+
+def breed_bonus_matrix(product_ids, breed_disease_pk_lists):
+    """여러 품종의 보장 비율을 한 번의 역색인 조회로 (품종 수 × 상품 수) 행렬로 계산"""
+    covered = products_covering(sorted({pk for pks in breed_disease_pk_lists for pk in pks}))
+    matrix, covered_rows = [], []
+    for pks in breed_disease_pk_lists:
+        wanted = set(pks)
+        row_covered = {pid: covered[pid] & wanted for pid in product_ids if covered.get(pid, set()) & wanted}
+        matrix.append([len(row_covered.get(pid, ())) / len(wanted) if wanted else 0.0 for pid in product_ids])
+        covered_rows.append(row_covered)
+    return matrix, covered_rows
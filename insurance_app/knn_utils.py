@@ -1,9 +1,37 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+import joblib
 import pandas as pd
 import numpy as np
-from sklearn.neighbors import NearestNeighbors
-from .models import PetProfile, InsuranceChoice, InsuranceProduct
+from django.conf import settings
+from sklearn.neighbors import BallTree
+from .models import PetProfile, InsuranceChoice, InsuranceProduct, InsuranceDetail, DetailUser
+from .utils import calculate_age
 from datetime import datetime, timedelta
 
+# DetailUser 특성 컬럼 ↔ PetProfile.preference_dict key
+FEATURE_FIELDS = [
+    ('animal_birth', None),
+    ('hospitalization', 'inpatient'),
+    ('outpatient', 'outpatient'),
+    ('skin_disease', 'skin'),
+    ('operation', 'surgery'),
+    ('patella', 'joint'),
+    ('dental', 'oral'),
+    ('urinary', 'urinary'),
+    ('liability', 'liability'),
+]
+SPECIES_CODES = {'dog': 1, 'cat': 2}
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+INDEX_PATH = Path(getattr(settings, 'INSURANCE_KNN_INDEX_PATH', Path(__file__).parent / 'knn_data' / 'neighbor_index.joblib'))
+# 증분으로 쌓인 선택 기록이 이 수를 넘으면 스케줄러 작업(rebuild_if_needed)이 트리를 다시 생성
+REBUILD_THRESHOLD = 500
+# 새 선택 기록을 DB에서 delta로 가져오는 최소 간격(초)
+SYNC_SECONDS = getattr(settings, 'INSURANCE_KNN_SYNC_SECONDS', 5)
+
 def load_user_data(pet_type):
     """반려동물 종류별 사용자 데이터 로드"""
     try:
@@ -28,77 +56,220 @@ def calculate_inverse_weight(distance):
     """역거리 가중치 계산"""
     return 1 / (distance + 1e-10)  # 0으로 나누기 방지
 
+def profile_features(pet_profile):
+    """PetProfile을 DetailUser와 같은 순서의 특성 벡터로 변환"""
+    preference_dict = pet_profile.preference_dict or {}
+    age = calculate_age(pet_profile.birth_date) if pet_profile.birth_date else 0
+    return [age if key is None else preference_dict.get(key, 3) for _, key in FEATURE_FIELDS]
+
+def _detail_to_product():
+    """InsuranceDetail id → InsuranceProduct id 매핑 (DB가 비어 있으면 fixtures 사용)"""
+    mapping = dict(InsuranceDetail.objects.values_list('id', 'insurance_id'))
+    if not mapping and (FIXTURES_DIR / 'insurance_detail.json').exists():
+        with open(FIXTURES_DIR / 'insurance_detail.json', encoding='utf-8') as f:
+            mapping = {item['pk']: item['fields']['insurance'] for item in json.load(f)}
+    return mapping
+
+def _detail_user_rows():
+    """(species, features, insurance_choice) 목록 (DB가 비어 있으면 fixtures 사용)"""
+    columns = [name for name, _ in FEATURE_FIELDS]
+    rows = list(DetailUser.objects.values_list('species', *columns, 'insurance_choice'))
+    if not rows and (FIXTURES_DIR / 'detail_user.json').exists():
+        with open(FIXTURES_DIR / 'detail_user.json', encoding='utf-8') as f:
+            rows = [
+                (item['fields']['species'], *[item['fields'][c] for c in columns], item['fields']['insurance_choice'])
+                for item in json.load(f)
+            ]
+    return [(row[0], row[1:-1], row[-1]) for row in rows]
+
+def _choice_rows(since_id=0):
+    """InsuranceChoice 기록을 (choice id, species, features, product id) 목록으로 변환"""
+    choices = InsuranceChoice.objects.filter(id__gt=since_id, is_active=True).select_related('pet_profile').order_by('id')
+    return [
+        (choice.id, SPECIES_CODES.get(choice.pet_profile.pet_type), profile_features(choice.pet_profile), choice.insurance_product_id)
+        for choice in choices
+    ]
+
+class NeighborIndex:
+    """종(species)별 BallTree와 아직 트리에 반영되지 않은 최근 선택 기록(delta)"""
+
+    def __init__(self, trees, last_choice_id=0):
+        self.trees = trees  # species -> {'tree': BallTree, 'labels': np.ndarray(product id)}
+        self.last_choice_id = last_choice_id
+        self.delta = {}     # species -> ([features, ...], [product id, ...])
+
+    @classmethod
+    def build(cls):
+        detail_to_product = _detail_to_product()
+        samples = {}
+        for species, features, detail_id in _detail_user_rows():
+            product_id = detail_to_product.get(detail_id)
+            if product_id is not None:
+                samples.setdefault(species, ([], []))
+                samples[species][0].append(features)
+                samples[species][1].append(product_id)
+        last_choice_id = 0
+        for choice_id, species, features, product_id in _choice_rows():
+            samples.setdefault(species, ([], []))
+            samples[species][0].append(features)
+            samples[species][1].append(product_id)
+            last_choice_id = choice_id
+        trees = {
+            species: {'tree': BallTree(np.asarray(X, dtype=float)), 'labels': np.asarray(y)}
+            for species, (X, y) in samples.items() if X
+        }
+        return cls(trees, last_choice_id)
+
+    def save(self, path=None):
+        path = path or INDEX_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump({'trees': self.trees, 'last_choice_id': self.last_choice_id}, path)
+
+    @classmethod
+    def load(cls, path=None):
+        data = joblib.load(path or INDEX_PATH)
+        index = cls(data['trees'], data['last_choice_id'])
+        index.sync_choices()
+        return index
+
+    def sync_choices(self):
+        """마지막으로 반영한 이후의 선택 기록(다른 프로세스가 만든 것 포함)을 delta로 가져옴"""
+        return self.apply_choices(_choice_rows(self.last_choice_id))
+
+    def apply_choices(self, rows):
+        """_choice_rows 결과 중 아직 반영하지 않은 기록만 delta에 추가 → 추가한 수"""
+        added = 0
+        for choice_id, species, features, product_id in rows:
+            if choice_id > self.last_choice_id:
+                self.add(species, features, product_id, choice_id)
+                added += 1
+        return added
+
+    def add(self, species, features, product_id, choice_id=None):
+        # 잠금 없이 query 중인 스레드가 길이가 다른 X/y를 보지 않도록 새 리스트로 교체
+        X, y = self.delta.get(species, ([], []))
+        self.delta[species] = (X + [list(features)], y + [product_id])
+        if choice_id is not None:
+            self.last_choice_id = max(self.last_choice_id, choice_id)
+
+    def delta_size(self):
+        return sum(len(y) for _, y in self.delta.values())
+
+    def query(self, species, features, k=5):
+        """가장 가까운 k개 이웃의 (product id, 거리) 목록"""
+        point = np.asarray([features], dtype=float)
+        labels, distances = [], []
+        entry = self.trees.get(species)
+        if entry is not None:
+            dist, idx = entry['tree'].query(point, k=min(k, len(entry['labels'])))
+            labels.extend(entry['labels'][idx[0]].tolist())
+            distances.extend(dist[0].tolist())
+        if species in self.delta:
+            X, y = self.delta[species]
+            dist = np.sqrt(((np.asarray(X, dtype=float) - point) ** 2).sum(axis=1))
+            labels.extend(y)
+            distances.extend(dist.tolist())
+        order = np.argsort(distances, kind='stable')[:k]
+        return [(labels[i], distances[i]) for i in order]
+
+    def vote(self, species, features, k=5):
+        """역거리 가중 투표 결과 {product id: 가중치}"""
+        weights = {}
+        for product_id, distance in self.query(species, features, k):
+            # 완전히 같은 이웃 하나가 투표를 독점하지 않도록 utils.inverse_weight와 같은 상수(0.1) 사용
+            weights[product_id] = weights.get(product_id, 0) + 1.0 / (distance + 0.1)
+        return weights
+
+_lock = threading.Lock()
+_index = None
+_index_mtime = None
+_synced_at = None
+
+def _saved_mtime():
+    try:
+        return INDEX_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def get_neighbor_index():
+    """프로세스 단위로 캐시된 NeighborIndex 반환 (저장된 인덱스가 없으면 None)
+
+    인덱스는 요청 밖에서만 만든다 (스케줄러 knn_index 작업 / build_knn_index 명령).
+    다른 프로세스가 파일을 다시 저장했으면 다시 로드하고, 새 선택 기록은 SYNC_SECONDS 간격으로 가져온다.
+    파일/DB는 잠금 밖에서 읽고 교체만 잠금 안에서 한다.
+    """
+    global _index, _index_mtime, _synced_at
+    mtime = _saved_mtime()
+    index = _index
+    if mtime is not None and (index is None or mtime != _index_mtime):
+        loaded = NeighborIndex.load()
+        with _lock:
+            _index, _index_mtime, _synced_at = loaded, mtime, time.monotonic()
+        return loaded
+    if index is None:
+        return None
+    now = time.monotonic()
+    if now - _synced_at >= SYNC_SECONDS:
+        _synced_at = now
+        rows = _choice_rows(index.last_choice_id)
+        with _lock:
+            index.apply_choices(rows)
+    return index
+
+def rebuild_neighbor_index():
+    """DetailUser + InsuranceChoice 전체로 트리를 다시 만들고 저장"""
+    global _index, _index_mtime, _synced_at
+    index = NeighborIndex.build()
+    index.save()
+    with _lock:
+        _index, _index_mtime, _synced_at = index, _saved_mtime(), time.monotonic()
+    return index
+
+def rebuild_if_needed(threshold=REBUILD_THRESHOLD):
+    """저장된 인덱스가 없거나 트리에 반영되지 않은 선택 기록이 threshold건 이상이면 다시 생성
+
+    → 다시 만들었으면 그때의 delta 크기, 아니면 None
+    """
+    index = get_neighbor_index()
+    pending = index.delta_size() if index is not None else 0
+    if index is not None and pending < threshold:
+        return None
+    rebuild_neighbor_index()
+    return pending
+
 def get_nearest_neighbors(user_profile, k=5):
-    """가장 가까운 k개의 이웃 찾기"""
-    # 사용자 프로필의 특성 추출
-    pet_type = user_profile.pet_type
-    age = user_profile.get_age()
-    weight = user_profile.weight if user_profile.weight else 0
-    
-    # 모든 보험 상품 가져오기
-    all_products = InsuranceProduct.objects.filter(pet_type=pet_type)
-    
-    # 각 상품과의 유사도 계산
-    similarities = []
-    for product in all_products:
-        # 상품의 특성 추출
-        min_age = product.min_age or 0
-        max_age = product.max_age or 100
-        min_weight = product.min_weight or 0
-        max_weight = product.max_weight or 100
-        
-        # 유사도 계산
-        age_similarity = 1 if min_age <= age <= max_age else 0
-        
-        # weight가 None이거나 weight 제한이 없는 경우 weight_similarity는 1
-        if product.min_weight is None or product.max_weight is None:
-            weight_similarity = 1
-        else:
-            weight_similarity = 1 if min_weight <= weight <= max_weight else 0
-        
-        # 나이와 체중의 유사도를 평균내어 총 유사도 계산
-        total_similarity = (age_similarity + weight_similarity) / 2
-        
-        # 보험 상품의 sure_index도 고려 (sure_index가 None인 경우 0.5 사용)
-        sure_index = product.sure_index if product.sure_index is not None else 0.5
-        total_similarity = (total_similarity + sure_index) / 2
-        
-        similarities.append((product, total_similarity))
-    
-    # 유사도 기준으로 정렬
-    similarities.sort(key=lambda x: x[1], reverse=True)
-    
-    # 상위 k개 상품 반환
-    return [item[0] for item in similarities[:k]]
+    """가장 가까운 k개의 이웃 (product id, 거리) 찾기"""
+    index = get_neighbor_index()
+    if index is None:
+        return []
+    return index.query(SPECIES_CODES.get(user_profile.pet_type), profile_features(user_profile), k)
 
 def predict_insurance(user_profile, k=5):
     """KNN을 사용하여 보험 상품 추천"""
-    # 가장 가까운 k개의 이웃 찾기
-    neighbors = get_nearest_neighbors(user_profile, k)
-    
-    if not neighbors:
+    index = get_neighbor_index()
+    if index is None:
+        return []
+    weights = index.vote(SPECIES_CODES.get(user_profile.pet_type), profile_features(user_profile), k)
+    if not weights:
         return []
-    
-    # 이웃들이 선택한 보험 상품의 가중치 계산
-    weights = {}
-    for neighbor in neighbors:
-        if neighbor.id not in weights:
-            weights[neighbor.id] = 0
-        weights[neighbor.id] += 1
     
     # 가중치 기준으로 정렬
-    sorted_products = sorted(weights.items(), key=lambda x: x[1], reverse=True)
+    sorted_products = sorted(weights.items(), key=lambda x: x[1], reverse=True)[:5]
     
     # 상위 5개 상품 반환
-    return [InsuranceProduct.objects.get(id=product_id) for product_id, _ in sorted_products[:5]]
+    products = InsuranceProduct.objects.in_bulk([product_id for product_id, _ in sorted_products])
+    return [products[product_id] for product_id, _ in sorted_products if product_id in products]
 
 def update_user_choice(pet_profile, insurance_product):
     """사용자의 보험 선택 기록 업데이트"""
-    InsuranceChoice.objects.create(
+    choice = InsuranceChoice.objects.create(
         pet_profile=pet_profile,
         insurance_product=insurance_product,
         monthly_premium=insurance_product.base_price,
         start_date=datetime.now().date(),
         end_date=datetime.now().date() + timedelta(days=365),
         is_active=True
-    ) 
\ No newline at end of file
+    )
+    # DB에 저장된 선택 기록이 곧 delta: 각 프로세스가 다음 조회 때 가져가고,
+    # 트리 재생성은 요청 밖에서 (스케줄러 knn_index 작업 / build_knn_index 명령)
+    return choice
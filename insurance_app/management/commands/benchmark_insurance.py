@@ -0,0 +1,44 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from insurance_app.benchmark import DEFAULT_SIZES, run_benchmark
+
+class Command(BaseCommand):
+    help = '합성 보험 카탈로그(10/100/1k/10k 상품)로 추천/비교 뷰의 p50/p95 지연, 쿼리 수, 최대 메모리를 측정합니다. 실제 DB가 아닌 테스트 DB를 만들어 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES), help='측정할 상품 수')
+        parser.add_argument('--repeat', type=int, default=20, help='시나리오별 측정 반복 횟수')
+        parser.add_argument('--warmup', type=int, default=2, help='측정 전 워밍업 횟수')
+        parser.add_argument('--seed', type=int, default=0, help='합성 데이터 난수 시드')
+        parser.add_argument('--scenario', action='append', dest='scenarios', help='특정 시나리오만 측정 (여러 번 지정 가능)')
+        parser.add_argument('--output', help='결과 JSON 저장 경로 (실행 간 비교용)')
+
+    def handle(self, *args, **options):
+        def log(size, name, result):
+            self.stdout.write(
+                f"{size:>6} {name:<28} cold={result['cold_ms']:>9.2f}ms p50={result['p50_ms']:>9.2f}ms p95={result['p95_ms']:>9.2f}ms "
+                f"queries={result['queries']:>4} peak={result['peak_memory_kb']:>9.1f}KB status={result['status']}"
+            )
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = run_benchmark(
+                sizes=options['sizes'],
+                repeat=options['repeat'],
+                warmup=options['warmup'],
+                seed=options['seed'],
+                scenarios=options['scenarios'],
+                log=log,
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from insurance_app.knn_utils import get_neighbor_index, rebuild_if_needed, rebuild_neighbor_index, INDEX_PATH, REBUILD_THRESHOLD
+
+class Command(BaseCommand):
+    help = 'DetailUser와 InsuranceChoice로 종별 KNN 이웃 인덱스(BallTree)를 만들고 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--if-needed', action='store_true', help=f'저장된 인덱스가 없거나 트리에 반영되지 않은 선택 기록이 {REBUILD_THRESHOLD}건 이상일 때만 다시 생성')
+
+    def handle(self, *args, **options):
+        if options['if_needed']:
+            pending = rebuild_if_needed()
+            if pending is None:
+                self.stdout.write('다시 만들 필요 없음')
+                return
+            self.stdout.write(f'반영되지 않은 선택 기록 {pending}건')
+            index = get_neighbor_index()
+        else:
+            index = rebuild_neighbor_index()
+        for species, entry in sorted(index.trees.items()):
+            self.stdout.write(f'species={species}: {len(entry["labels"])}개')
+        self.stdout.write(self.style.SUCCESS(f'KNN 인덱스 저장 완료: {INDEX_PATH}'))
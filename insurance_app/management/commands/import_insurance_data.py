@@ -1,94 +1,177 @@
+import hashlib
+import json
+import time
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from insurance_app.catalog import iter_fixture
 from insurance_app.models import InsuranceCompany, InsuranceProduct
-import json
-import os
-import random
+from insurance_app.scoring import invalidate_scoring_engine
+from insurance_app.utils import recompute_sure_indexes
+
+UPDATE_FIELDS = ['base_price', 'coverage_details', 'special_benefits', 'coverage_limits', 'import_hash', 'updated_at']
+
+
+def content_hash(*parts):
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def new_product(company, fields):
+    """fixture에 새로 나온 상품의 기본값 (상세 정보가 있으면 apply_detail로 덮어씀)"""
+    return InsuranceProduct(
+        company=company,
+        name=fields['insurance_name'],
+        pet_type='dog' if fields['species'] == 1 else 'cat',
+        base_price=50000,
+        min_age=0,
+        max_age=20,
+        coverage_period=fields['payment_period'],
+        renewal_cycle=fields['payment_period'],
+        coverage_details={
+            '입원': '입원 시 발생하는 치료비',
+            '수술': '수술 시 발생하는 치료비',
+            '통원': '통원 치료 시 발생하는 치료비',
+            '약제비': '처방된 약제비용',
+            '검사비': '각종 검사 비용'
+        },
+        coverage_limits={
+            '입원': '300만원',
+            '수술': '200만원',
+            '통원': '15만원',
+            '약제비': '10만원',
+            '검사비': '20만원'
+        },
+        special_benefits=['24시간 상담 서비스', '예방접종 할인', '정기검진 할인'],
+    )
+
+
+def apply_detail(product, detail, disease_coverage):
+    """보험 상세 정보(insurance_detail)를 상품에 반영"""
+    product.base_price = detail['fee']
+    coverage_details = {}
+    if detail.get('basic'):
+        coverage_details['기본보장'] = detail['basic']
+    if detail.get('special'):
+        coverage_details['특별보장'] = detail['special']
+    coverage_details['질병보장'] = disease_coverage
+    product.coverage_details = coverage_details
+    product.special_benefits = detail.get('special', {})
+    product.coverage_limits = detail.get('all_cover', {})
+
 
 class Command(BaseCommand):
     help = 'Import insurance data from local fixtures'
 
-    def handle(self, *args, **kwargs):
-        # 파일 경로 설정
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-        fixtures_dir = os.path.join(base_dir, 'insurance_app', 'fixtures')
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='bulk_create/bulk_update 한 번에 처리할 행 수')
+        parser.add_argument('--dry-run', action='store_true', help='DB에 쓰지 않고 생성/수정될 행 수만 출력')
+        parser.add_argument('--changed-only', action='store_true', help='마지막 가져오기 이후 내용(해시)이 바뀐 상품만 수정')
 
-        # 보험사 데이터 가져오기
-        with open(os.path.join(fixtures_dir, 'insurance.json'), 'r', encoding='utf-8') as f:
-            insurance_data = json.load(f)
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        self.batch_size = options['batch_size']
+        self.dry_run = options['dry_run']
+        self.changed_only = options['changed_only']
+        self.stats = {'rows': 0, 'companies': 0, 'created': 0, 'updated': 0, 'skipped': 0}
 
-        # 보험 상세 데이터 가져오기
-        with open(os.path.join(fixtures_dir, 'insurance_detail.json'), 'r', encoding='utf-8') as f:
-            insurance_detail_data = json.load(f)
+        # 질병 정보는 모든 상품에 같은 값이 들어가므로 한 번만 만듦
+        self.disease_coverage = {}
+        for disease in iter_fixture('disease.json'):
+            fields = disease['fields']
+            if fields.get('cover_type'):
+                self.disease_coverage[fields['name']] = {
+                    '정보': fields['info'],
+                    '팁': fields['tip'],
+                    '원인': fields['cause']
+                }
+        # 보험 PK별 상세 정보 (같은 보험의 상세가 여러 개면 마지막 것을 사용)
+        self.details = {}
+        for detail in iter_fixture('insurance_detail.json'):
+            self.details[detail['fields']['insurance']] = detail['fields']
 
-        # 질병 데이터 가져오기
-        with open(os.path.join(fixtures_dir, 'disease.json'), 'r', encoding='utf-8') as f:
-            disease_data = json.load(f)
+        self.companies = {company.name: company for company in InsuranceCompany.objects.order_by('-id')}
+        self.products = {
+            (product.company_id, product.name): product
+            for product in InsuranceProduct.objects.order_by('-id')
+        }
 
-        # 보험사 및 기본 상품 생성
-        for item in insurance_data:
+        with transaction.atomic():
+            batch = []
+            for item in iter_fixture('insurance.json'):
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self.import_batch(batch)
+                    batch = []
+            if batch:
+                self.import_batch(batch)
+            if not self.dry_run:
+                # bulk 연산은 시그널을 보내지 않으므로 점수 엔진 무효화와 SURE 지수 재계산을 직접 실행
+                transaction.on_commit(invalidate_scoring_engine)
+                transaction.on_commit(recompute_sure_indexes)
 
-            company, created = InsuranceCompany.objects.get_or_create(
-                name=item['fields']['company_name'],
-                defaults={
-                    'website': item['fields']['company_url'],
-                    'description': item['fields'].get('content', '') + '\n' + item['fields'].get('etc', ''),
-                }
-            )
-
-            # 보험 상품 생성
-            product, created = InsuranceProduct.objects.get_or_create(
-                company=company,
-                name=item['fields']['insurance_name'],
-                defaults={
-                    'pet_type': 'dog' if item['fields']['species'] == 1 else 'cat',
-                    'base_price': 50000,
-                    'min_age': 0,
-                    'max_age': 20,
-                    'coverage_period': item['fields']['payment_period'],
-                    'renewal_cycle': item['fields']['payment_period'],
-                    'coverage_details': {
-                        '입원': '입원 시 발생하는 치료비',
-                        '수술': '수술 시 발생하는 치료비',
-                        '통원': '통원 치료 시 발생하는 치료비',
-                        '약제비': '처방된 약제비용',
-                        '검사비': '각종 검사 비용'
-                    },
-                    'coverage_limits': {
-                        '입원': '300만원',
-                        '수술': '200만원',
-                        '통원': '15만원',
-                        '약제비': '10만원',
-                        '검사비': '20만원'
-                    },
-                    'special_benefits': ['24시간 상담 서비스', '예방접종 할인', '정기검진 할인']
-                }
-            )
-
-            # 보험 상세 정보 업데이트
-            for detail in insurance_detail_data:
-                if detail['fields']['insurance'] == item['pk']:
-                    product.base_price = detail['fields']['fee']
-                    
-                    coverage_details = {}
-                    if detail['fields'].get('basic'):
-                        coverage_details['기본보장'] = detail['fields']['basic']
-                    if detail['fields'].get('special'):
-                        coverage_details['특별보장'] = detail['fields']['special']
-                    
-                    # 질병 정보 추가
-                    disease_coverage = {}
-                    for disease in disease_data:
-                        if disease['fields'].get('cover_type'):
-                            disease_coverage[disease['fields']['name']] = {
-                                '정보': disease['fields']['info'],
-                                '팁': disease['fields']['tip'],
-                                '원인': disease['fields']['cause']
-                            }
-                    coverage_details['질병보장'] = disease_coverage
-                    
-                    product.coverage_details = coverage_details
-                    product.special_benefits = detail['fields'].get('special', {})
-                    product.coverage_limits = detail['fields'].get('all_cover', {})
-                    product.save()
-
-        self.stdout.write(self.style.SUCCESS('Successfully imported insurance data')) 
\ No newline at end of file
+        elapsed = time.perf_counter() - started
+        stats = self.stats
+        prefix = '[dry-run] ' if self.dry_run else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Successfully imported insurance data: 보험사 {stats['companies']}개 생성, "
+            f"상품 {stats['created']}개 생성 / {stats['updated']}개 수정 / {stats['skipped']}개 변경 없음 "
+            f"({stats['rows']}행, {elapsed:.2f}s, {stats['rows'] / elapsed if elapsed else 0:.0f} rows/sec)"
+        ))
+
+    def import_batch(self, items):
+        # 1. 없는 보험사 생성
+        new_companies = {}
+        for item in items:
+            fields = item['fields']
+            name = fields['company_name']
+            if name not in self.companies and name not in new_companies:
+                new_companies[name] = InsuranceCompany(
+                    name=name,
+                    website=fields['company_url'],
+                    description=fields.get('content', '') + '\n' + fields.get('etc', ''),
+                )
+        if new_companies:
+            self.stats['companies'] += len(new_companies)
+            if not self.dry_run:
+                InsuranceCompany.objects.bulk_create(new_companies.values(), batch_size=self.batch_size)
+                # MySQL은 bulk_create 후 pk를 돌려주지 않으므로 다시 조회
+                new_companies = {company.name: company for company in InsuranceCompany.objects.filter(name__in=new_companies).order_by('-id')}
+            self.companies.update(new_companies)
+
+        # 2. 상품 생성/수정 대상 분류
+        to_create, to_update = {}, {}
+        now = timezone.now()
+        for item in items:
+            fields = item['fields']
+            self.stats['rows'] += 1
+            company = self.companies[fields['company_name']]
+            key = (company.pk or company.name, fields['insurance_name'])
+            detail = self.details.get(item['pk'])
+            digest = content_hash(fields, detail, self.disease_coverage)
+            product = self.products.get(key)
+            if product is None:
+                product = new_product(company, fields)
+                self.products[key] = product
+                to_create[key] = product
+            elif self.changed_only and product.import_hash == digest:
+                self.stats['skipped'] += 1
+                continue
+            elif key not in to_create:
+                product.updated_at = now
+                to_update[key] = product
+            if detail:
+                apply_detail(product, detail, self.disease_coverage)
+            product.import_hash = digest
+
+        self.stats['created'] += len(to_create)
+        self.stats['updated'] += len(to_update)
+        if self.dry_run:
+            return
+        InsuranceProduct.objects.bulk_create(to_create.values(), batch_size=self.batch_size)
+        InsuranceProduct.objects.bulk_update(to_update.values(), UPDATE_FIELDS, batch_size=self.batch_size)
+        if any(product.pk is None for product in to_create.values()):
+            created = InsuranceProduct.objects.filter(name__in={name for _, name in to_create}, company__in={product.company for product in to_create.values()})
+            for product in created:
+                self.products[(product.company_id, product.name)] = product
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+from insurance_app.recommendations import precompute_for_profiles, purge_stale_results
+from insurance_app.catalog import invalidate_catalog
+from insurance_app.scoring import get_scoring_engine, invalidate_scoring_engine
+
+class Command(BaseCommand):
+    help = '모든 PetProfile의 sure/price/cover 추천 순위를 미리 계산해 RecommendationResult에 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번의 행렬 연산으로 계산할 프로필 수')
+        parser.add_argument('--watch', action='store_true', help='종료하지 않고 interval마다 카탈로그 변경을 확인해 다시 계산')
+        parser.add_argument('--interval', type=int, default=60, help='--watch 확인 주기(초)')
+
+    def handle(self, *args, **options):
+        version = None
+        while True:
+            # 다른 프로세스(웹 서버)에서 바뀐 데이터는 시그널로 알 수 없으므로 매번 DB에서 다시 읽음
+            invalidate_catalog()
+            invalidate_scoring_engine()
+            engine = get_scoring_engine()
+            if engine.version != version:
+                # 카탈로그가 바뀌면 전체 재계산, 그대로면 새로 생긴 프로필만 계산
+                started = time.perf_counter()
+                computed = precompute_for_profiles(batch_size=options['batch_size'])
+                purged = purge_stale_results()
+                version = engine.version
+                self.stdout.write(self.style.SUCCESS(
+                    f'추천 순위 {computed}건 계산, 이전 버전 {purged}건 삭제 ({time.perf_counter() - started:.2f}s, version={version[:8]})'
+                ))
+            elif options['watch']:
+                computed = precompute_for_profiles(batch_size=options['batch_size'], only_missing=True)
+                if computed:
+                    self.stdout.write(f'새 추천 순위 {computed}건 계산')
+            if not options['watch']:
+                break
+            time.sleep(options['interval'])
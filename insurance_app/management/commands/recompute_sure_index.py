@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from insurance_app.utils import recompute_sure_indexes
+
+class Command(BaseCommand):
+    help = '보험상품별 동물 종류 × 나이대 SURE 지수를 다시 계산합니다. (정기 실행용, 생략 시 전체 상품)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('product_ids', nargs='*', type=int, help='재계산할 보험상품 ID (생략 시 전체)')
+
+    def handle(self, *args, **options):
+        computed = recompute_sure_indexes(options['product_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'SURE 지수 {computed}건 계산 완료!'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from insurance_app.utils import refresh_product_summaries
+from insurance_app.coverage_index import rebuild_disease_coverage
+
+class Command(BaseCommand):
+    help = 'InsuranceDetail 기준으로 보험상품 요약(상세 플랜 수, 평균 가격 점수, 보장 질병 ID)과 질병 → 상품 역색인을 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('product_ids', nargs='*', type=int, help='갱신할 보험상품 ID (생략 시 전체)')
+
+    def handle(self, *args, **options):
+        product_ids = options['product_ids'] or None
+        updated = refresh_product_summaries(product_ids)
+        self.stdout.write(self.style.SUCCESS(f'보험상품 요약 {updated}개 갱신 완료!'))
+        indexed = rebuild_disease_coverage(product_ids)
+        self.stdout.write(self.style.SUCCESS(f'질병 보장 역색인 {indexed}건 생성 완료!'))
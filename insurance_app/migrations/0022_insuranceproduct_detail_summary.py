@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-18 14:21
+
+from django.db import migrations, models
+
+
+def populate_detail_summary(apps, schema_editor):
+    InsuranceProduct = apps.get_model('insurance_app', 'InsuranceProduct')
+    InsuranceDetail = apps.get_model('insurance_app', 'InsuranceDetail')
+    grouped = {}
+    for insurance_id, price_score, basic, special in InsuranceDetail.objects.values_list('insurance_id', 'price_score', 'basic', 'special'):
+        grouped.setdefault(insurance_id, []).append((price_score, basic, special))
+    products = []
+    for product in InsuranceProduct.objects.filter(id__in=grouped.keys()):
+        details = grouped[product.id]
+        covered = set()
+        for _, basic, special in details:
+            covered.update(basic or [])
+            covered.update(special or [])
+        product.detail_count = len(details)
+        product.avg_price_score = sum(price_score or 0 for price_score, _, _ in details) / len(details)
+        product.covered_disease_ids = sorted(covered)
+        products.append(product)
+    InsuranceProduct.objects.bulk_update(products, ['detail_count', 'avg_price_score', 'covered_disease_ids'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance_app', '0021_petprofile_preference_dict'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='insuranceproduct',
+            name='avg_price_score',
+            field=models.FloatField(blank=True, null=True, verbose_name='평균 가격 점수'),
+        ),
+        migrations.AddField(
+            model_name='insuranceproduct',
+            name='covered_disease_ids',
+            field=models.JSONField(blank=True, default=list, verbose_name='보장 질병 ID'),
+        ),
+        migrations.AddField(
+            model_name='insuranceproduct',
+            name='detail_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='상세 플랜 수'),
+        ),
+        migrations.RunPython(populate_detail_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2 on 2026-10-18 14:23
+
+import json
+from pathlib import Path
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_disease_coverage(apps, schema_editor):
+    Disease = apps.get_model('insurance_app', 'Disease')
+    InsuranceDetail = apps.get_model('insurance_app', 'InsuranceDetail')
+    DiseaseCoverage = apps.get_model('insurance_app', 'DiseaseCoverage')
+    disease_cover_types = dict(Disease.objects.values_list('id', 'cover_type'))
+    disease_path = Path(__file__).resolve().parent.parent / 'fixtures' / 'disease.json'
+    if not disease_cover_types and disease_path.exists():
+        with open(disease_path, encoding='utf-8') as f:
+            disease_cover_types = {item['pk']: item['fields'].get('cover_type') for item in json.load(f)}
+    rows = set()
+    for detail_id, insurance_id, basic, special, all_cover in InsuranceDetail.objects.values_list('id', 'insurance_id', 'basic', 'special', 'all_cover'):
+        for source, ids in (('basic', basic), ('special', special)):
+            for disease_id in ids or []:
+                if disease_id in disease_cover_types:
+                    rows.add((disease_id, insurance_id, detail_id, source))
+        if isinstance(all_cover, list):
+            for disease_id, cover_type in disease_cover_types.items():
+                if cover_type and cover_type < len(all_cover) and all_cover[cover_type]:
+                    rows.add((disease_id, insurance_id, detail_id, 'all_cover'))
+    DiseaseCoverage.objects.bulk_create([
+        DiseaseCoverage(disease_id=disease_id, insurance_id=insurance_id, detail_id=detail_id, source=source)
+        for disease_id, insurance_id, detail_id, source in sorted(rows)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance_app', '0022_insuranceproduct_detail_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiseaseCoverage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('disease_id', models.IntegerField(verbose_name='질병 ID')),
+                ('source', models.CharField(choices=[('basic', '기본보장'), ('special', '특별보장'), ('all_cover', '보장유형')], max_length=10)),
+                ('detail', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='disease_coverages', to='insurance_app.insurancedetail')),
+                ('insurance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='disease_coverages', to='insurance_app.insuranceproduct')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['disease_id', 'insurance'], name='disease_coverage_lookup_idx')],
+                'unique_together': {('disease_id', 'detail', 'source')},
+            },
+        ),
+        migrations.RunPython(populate_disease_coverage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance_app', '0023_diseasecoverage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('catalog_version', models.CharField(db_index=True, max_length=40)),
+                ('pet_type', models.CharField(max_length=10)),
+                ('breed', models.CharField(blank=True, max_length=100)),
+                ('preference_dict', models.JSONField(default=dict)),
+                ('sure_ids', models.JSONField(default=list)),
+                ('price_ids', models.JSONField(default=list)),
+                ('cover_ids', models.JSONField(default=list)),
+                ('scores', models.JSONField(default=dict)),
+                ('covered_diseases', models.JSONField(default=dict)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 14:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance_app', '0024_recommendationresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='insuranceproduct',
+            name='import_hash',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='가져오기 해시'),
+        ),
+    ]
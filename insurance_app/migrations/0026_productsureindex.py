@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-18 14:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance_app', '0025_insuranceproduct_import_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSureIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pet_type', models.CharField(max_length=10)),
+                ('age_band', models.CharField(choices=[('junior', '1세 미만'), ('adult', '1~10세'), ('senior', '10세 초과')], max_length=10)),
+                ('sure_index', models.FloatField()),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sure_indexes', to='insurance_app.insuranceproduct')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['pet_type', 'age_band', '-sure_index'], name='sure_index_rank_idx')],
+                'unique_together': {('product', 'pet_type', 'age_band')},
+            },
+        ),
+    ]
@@ -55,12 +55,25 @@ class InsuranceProduct(models.Model):
     coverage_limits = models.JSONField(verbose_name='보장 한도')
     special_benefits = models.JSONField(verbose_name='특별 혜택')
     sure_index = models.FloatField(default=0.0, verbose_name='안전도 지수')
+    # InsuranceDetail 요약 (refresh_product_summaries로 갱신)
+    detail_count = models.PositiveIntegerField(default=0, verbose_name='상세 플랜 수')
+    avg_price_score = models.FloatField(null=True, blank=True, verbose_name='평균 가격 점수')
+    covered_disease_ids = models.JSONField(default=list, blank=True, verbose_name='보장 질병 ID')
+    # import_insurance_data가 마지막으로 반영한 fixture 내용의 해시 (--changed-only에서 변경 여부 판단)
+    import_hash = models.CharField(max_length=64, blank=True, default='', verbose_name='가져오기 해시')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.company.name} - {self.name}"
 
+    @property
+    def price_score(self):
+        """상세 플랜이 있으면 평균 price_score, 없으면 기본 보험료"""
+        if self.detail_count:
+            return float(self.avg_price_score or 0)
+        return float(self.base_price)
+
     class Meta:
         verbose_name = '보험상품'
         verbose_name_plural = '보험상품들'
@@ -202,6 +215,84 @@ class InsuranceDetail(models.Model):
     class Meta:
         app_label = 'insurance_app'
 
+class DiseaseCoverage(models.Model):
+    """질병 → 보장 상품/상세 플랜 역색인 (coverage_index.rebuild_disease_coverage로 갱신)"""
+    SOURCE_CHOICES = [
+        ('basic', '기본보장'),
+        ('special', '특별보장'),
+        ('all_cover', '보장유형'),
+    ]
+
+    disease_id = models.IntegerField(verbose_name='질병 ID')
+    insurance = models.ForeignKey('InsuranceProduct', on_delete=models.CASCADE, related_name='disease_coverages')
+    detail = models.ForeignKey('InsuranceDetail', on_delete=models.CASCADE, related_name='disease_coverages')
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+
+    def __str__(self):
+        return f"{self.disease_id} - {self.insurance_id} ({self.source})"
+
+    class Meta:
+        app_label = 'insurance_app'
+        unique_together = ('disease_id', 'detail', 'source')
+        indexes = [
+            models.Index(fields=['disease_id', 'insurance'], name='disease_coverage_lookup_idx'),
+        ]
+
+class ProductSureIndex(models.Model):
+    """동물 종류 × 나이대별 SURE 지수 (utils.recompute_sure_indexes로 갱신, 순위는 ORDER BY로 조회)"""
+    AGE_BAND_CHOICES = [
+        ('junior', '1세 미만'),
+        ('adult', '1~10세'),
+        ('senior', '10세 초과'),
+    ]
+
+    product = models.ForeignKey('InsuranceProduct', on_delete=models.CASCADE, related_name='sure_indexes')
+    pet_type = models.CharField(max_length=10)
+    age_band = models.CharField(max_length=10, choices=AGE_BAND_CHOICES)
+    sure_index = models.FloatField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.product_id} {self.pet_type}/{self.age_band}: {self.sure_index:.3f}"
+
+    class Meta:
+        app_label = 'insurance_app'
+        unique_together = ('product', 'pet_type', 'age_band')
+        indexes = [
+            models.Index(fields=['pet_type', 'age_band', '-sure_index'], name='sure_index_rank_idx'),
+        ]
+
+class RecommendationResult(models.Model):
+    """(선호도, 품종, 동물 종류, 카탈로그 버전) 해시별로 미리 계산해 둔 추천 순위"""
+    key = models.CharField(max_length=64, unique=True)
+    catalog_version = models.CharField(max_length=40, db_index=True)
+    pet_type = models.CharField(max_length=10)
+    breed = models.CharField(max_length=100, blank=True)
+    preference_dict = models.JSONField(default=dict)
+    sure_ids = models.JSONField(default=list)
+    price_ids = models.JSONField(default=list)
+    cover_ids = models.JSONField(default=list)
+    scores = models.JSONField(default=dict)             # product id -> {'sure', 'matching'}
+    covered_diseases = models.JSONField(default=dict)   # product id -> 보장하는 품종 취약 질병 ID
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.pet_type}/{self.breed} ({self.catalog_version[:8]})"
+
+    class Meta:
+        app_label = 'insurance_app'
+
+class CatalogVersion(models.Model):
+    """프로세스별 카탈로그/점수 엔진 캐시의 DB 버전 (바뀌면 다른 프로세스도 다시 로드)"""
+    name = models.CharField(max_length=20, unique=True)   # 'coverage' | 'scoring'
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+    class Meta:
+        app_label = 'insurance_app'
+
 class DetailUser(models.Model):
     breed = models.IntegerField()
     animal_name = models.CharField(max_length=100)
@@ -0,0 +1,103 @@
+import hashlib
+import json
+
+from django.db import connection
+
+from .coverage_index import breed_bonus_matrix
+from .models import PetProfile, RecommendationResult
+from .scoring import get_scoring_engine, preference_vector
+
+RANKING_SIZE = 6
+
+
+def recommendation_key(preference_dict, breed, pet_type, catalog_version):
+    """추천 결과 캐시 키 (선호도, 품종, 동물 종류, 카탈로그 버전의 해시)"""
+    payload = json.dumps([preference_dict or {}, breed or '', pet_type or '', catalog_version], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def compute_recommendations(entries, engine=None, limit=RANKING_SIZE):
+    """(preference_dict, breed, pet_type) 목록의 순위를 한 번의 행렬 연산으로 계산해 저장"""
+    engine = engine or get_scoring_engine()
+    catalog = engine.catalog
+    unique = {}
+    for preference_dict, breed, pet_type in entries:
+        key = recommendation_key(preference_dict, breed, pet_type, engine.version)
+        unique.setdefault(key, (preference_dict or {}, breed or '', pet_type or ''))
+    if not unique:
+        return {}
+    keys = list(unique.keys())
+    vectors = [preference_vector(unique[key][0]) for key in keys]
+    bonus, covered_rows = breed_bonus_matrix(engine.product_ids, [catalog.breed_disease_pks(unique[key][1]) for key in keys])
+    matching = engine.matching_scores(vectors)
+    sure = engine.sure_scores(vectors, breed_disease_bonus=bonus)
+    rankings = engine.rank(vectors, limit=limit, breed_disease_bonus=bonus)
+
+    results = {}
+    for row, key in enumerate(keys):
+        preference_dict, breed, pet_type = unique[key]
+        ranking = rankings[row]
+        shown = set(ranking['sure']) | set(ranking['price']) | set(ranking['cover'])
+        results[key] = RecommendationResult(
+            key=key,
+            catalog_version=engine.version,
+            pet_type=pet_type,
+            breed=breed,
+            preference_dict=preference_dict,
+            sure_ids=ranking['sure'],
+            price_ids=ranking['price'],
+            cover_ids=ranking['cover'],
+            scores={
+                str(pid): {'sure': float(sure[row, engine.index[pid]]), 'matching': float(matching[row, engine.index[pid]])}
+                for pid in shown
+            },
+            covered_diseases={str(pid): sorted(diseases) for pid, diseases in covered_rows[row].items() if pid in shown},
+        )
+    RecommendationResult.objects.bulk_create(
+        results.values(),
+        update_conflicts=True,
+        # MySQL은 충돌 대상을 지정할 수 없음 (ON DUPLICATE KEY UPDATE)
+        unique_fields=['key'] if connection.features.supports_update_conflicts_with_target else None,
+        update_fields=['catalog_version', 'sure_ids', 'price_ids', 'cover_ids', 'scores', 'covered_diseases', 'computed_at'],
+    )
+    return results
+
+
+def get_recommendations(preference_dict, breed, pet_type, engine=None):
+    """미리 계산된 결과가 있으면 키 조회 한 번으로 반환, 없으면 계산 후 저장"""
+    engine = engine or get_scoring_engine()
+    key = recommendation_key(preference_dict, breed, pet_type, engine.version)
+    result = RecommendationResult.objects.filter(key=key).first()
+    if result is None:
+        result = compute_recommendations([(preference_dict, breed, pet_type)], engine=engine)[key]
+    return result
+
+
+def precompute_for_profiles(profiles=None, batch_size=500, only_missing=False):
+    """PetProfile 전체(또는 일부)의 추천 순위를 batch_size 단위로 미리 계산"""
+    engine = get_scoring_engine()
+    if profiles is None:
+        profiles = PetProfile.objects.only('pet_type', 'breed', 'preference_dict').order_by('id')
+    existing = set()
+    if only_missing:
+        existing = set(RecommendationResult.objects.filter(catalog_version=engine.version).values_list('key', flat=True))
+    computed = 0
+    batch = []
+    for profile in (profiles.iterator(chunk_size=batch_size) if hasattr(profiles, 'iterator') else profiles):
+        entry = (profile.preference_dict or {}, profile.breed, profile.pet_type)
+        if only_missing and recommendation_key(*entry, engine.version) in existing:
+            continue
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            computed += len(compute_recommendations(batch, engine=engine))
+            batch = []
+    if batch:
+        computed += len(compute_recommendations(batch, engine=engine))
+    return computed
+
+
+def purge_stale_results():
+    """현재 카탈로그 버전이 아닌 결과 삭제"""
+    engine = get_scoring_engine()
+    deleted, _ = RecommendationResult.objects.exclude(catalog_version=engine.version).delete()
+    return deleted
@@ -0,0 +1,156 @@
+import hashlib
+import threading
+
+import numpy as np
+from django.db import models
+
+from .catalog import COVER_TYPE_TO_CATEGORY, VersionCheck, bump_catalog_version, get_catalog
+from .utils import flatten_coverage_keys, make_sure_score
+
+# 한글 key → 영문 코드 매핑 (보장 카테고리 벡터의 열 순서)
+PREFERENCE_MAP = {
+    '통원': 'outpatient',
+    '입원': 'inpatient',
+    '수술': 'surgery',
+    '배상책임': 'liability',
+    '슬관절': 'joint',
+    '피부병': 'skin',
+    '구강질환': 'oral',
+    '비뇨기질환': 'urinary',
+}
+COVERAGE_KEYS = list(PREFERENCE_MAP.keys())
+
+
+def preference_vector(preference_dict, default=0):
+    """선호도 딕셔너리를 COVERAGE_KEYS 순서의 벡터로 변환"""
+    return [preference_dict.get(PREFERENCE_MAP[key], default) for key in COVERAGE_KEYS]
+
+
+def category_coverage_vector(coverage_details, cover_id_to_type):
+    """상품 보장내역을 COVERAGE_KEYS 기준 0/1 벡터로 변환"""
+    vector = [0 for _ in COVERAGE_KEYS]
+    # 1. 카테고리 key가 있으면 1
+    for idx, key in enumerate(COVERAGE_KEYS):
+        if key in coverage_details:
+            vector[idx] = 1
+    # 2. '기본보장', '특별보장'의 보장 ID로 카테고리 체크
+    for section in ['기본보장', '특별보장']:
+        for cover_id in coverage_details.get(section, []):
+            category = COVER_TYPE_TO_CATEGORY.get(cover_id_to_type.get(cover_id))
+            if category in COVERAGE_KEYS:
+                vector[COVERAGE_KEYS.index(category)] = 1
+    # 3. 질병보장(disease) 항목도 기존대로 체크
+    for disease in coverage_details.get('질병보장', {}).values():
+        category = COVER_TYPE_TO_CATEGORY.get(disease.get('cover_type'))
+        if category in COVERAGE_KEYS:
+            vector[COVERAGE_KEYS.index(category)] = 1
+    return vector
+
+
+class ScoringEngine:
+    """전체 보험상품의 보장 카테고리 행렬과 점수 열을 미리 계산해 두고 행렬 연산으로 순위를 매김"""
+
+    def __init__(self, product_ids, coverage_matrix, company_scores, price_scores, cover_counts, catalog=None, coverage_token=''):
+        self.product_ids = list(product_ids)
+        self.index = {pid: i for i, pid in enumerate(self.product_ids)}
+        self.coverage_matrix = np.asarray(coverage_matrix, dtype=float).reshape(len(self.product_ids), len(COVERAGE_KEYS))
+        self.company_scores = np.asarray(company_scores, dtype=float)
+        self.price_scores = np.asarray(price_scores, dtype=float)
+        self.cover_counts = np.asarray(cover_counts, dtype=int)
+        self.catalog = catalog
+        self._product_norms = np.linalg.norm(self.coverage_matrix, axis=1)
+        # 가격/보장 개수 순위는 사용자 선호도와 무관하므로 한 번만 계산
+        self.price_order = np.argsort(self.price_scores, kind='stable')
+        self.cover_order = np.argsort(-self.cover_counts, kind='stable')
+        # 점수에 영향을 주는 데이터가 같으면 같은 값 (추천 결과 캐시 키에 사용)
+        digest = hashlib.sha1()
+        for array in (np.asarray(self.product_ids), self.coverage_matrix, self.company_scores, self.price_scores, self.cover_counts):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(str(coverage_token).encode())
+        self.version = digest.hexdigest()
+
+    @classmethod
+    def build(cls, products=None, catalog=None):
+        from .models import DiseaseCoverage, InsuranceProduct
+
+        catalog = catalog or get_catalog()
+        coverage = DiseaseCoverage.objects.aggregate(count=models.Count('id'), last=models.Max('id'))
+        if products is None:
+            products = InsuranceProduct.objects.select_related('company').order_by('id')
+        product_ids, rows, company_scores, price_scores, cover_counts = [], [], [], [], []
+        for product in products:
+            product_ids.append(product.id)
+            rows.append(category_coverage_vector(product.coverage_details, catalog.cover_id_to_type))
+            company_scores.append(float(product.company.rating) if product.company and product.company.rating else 0.0)
+            price_scores.append(product.price_score)
+            cover_counts.append(len(flatten_coverage_keys(product.coverage_details)))
+        breed_diseases = sorted((name, tuple(breed['disease'])) for name, breed in catalog.breeds.items())
+        return cls(product_ids, rows, company_scores, price_scores, cover_counts, catalog=catalog,
+                   coverage_token=f"{coverage['count']}:{coverage['last']}:{breed_diseases}")
+
+    def __len__(self):
+        return len(self.product_ids)
+
+    def coverage_vector(self, product_id):
+        return self.coverage_matrix[self.index[product_id]]
+
+    def matching_scores(self, user_vectors):
+        """(사용자 수 × 8) 선호도 행렬에 대한 (사용자 수 × 상품 수) 코사인 유사도"""
+        users = np.atleast_2d(np.asarray(user_vectors, dtype=float))
+        dots = users @ self.coverage_matrix.T
+        norms = np.linalg.norm(users, axis=1)[:, None] * self._product_norms[None, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(norms == 0, 0.0, dots / norms)
+
+    def sure_scores(self, user_vectors, breed_disease_bonus=0):
+        """SURE 점수 행렬 (breed_disease_bonus는 스칼라, 상품별 벡터 또는 사용자 × 상품 행렬)"""
+        matching = self.matching_scores(user_vectors)
+        return make_sure_score(self.company_scores, self.price_scores, matching, breed_disease_bonus=np.asarray(breed_disease_bonus, dtype=float))
+
+    def rank(self, user_vectors, limit=None, breed_disease_bonus=0):
+        """사용자별 sure/price/cover 순위를 상품 id 리스트로 반환"""
+        sure = self.sure_scores(user_vectors, breed_disease_bonus=breed_disease_bonus)
+        sure_orders = np.argsort(-sure, axis=1, kind='stable')[:, :limit]
+        ids = np.asarray(self.product_ids)
+        price_ids = ids[self.price_order[:limit]].tolist()
+        cover_ids = ids[self.cover_order[:limit]].tolist()
+        return [
+            {'sure': ids[order].tolist(), 'price': price_ids, 'cover': cover_ids}
+            for order in sure_orders
+        ]
+
+    def rank_preferences(self, preference_dicts, limit=None, default=0):
+        """여러 반려동물의 선호도 딕셔너리를 한 번의 행렬 곱으로 순위 계산"""
+        if not preference_dicts:
+            return []
+        vectors = [preference_vector(pref or {}, default=default) for pref in preference_dicts]
+        return self.rank(vectors, limit=limit)
+
+
+_lock = threading.Lock()
+_engine = None
+_engine_version = None
+_version_check = VersionCheck('scoring')
+
+
+def get_scoring_engine():
+    """프로세스 단위로 캐시된 ScoringEngine 반환 (카탈로그나 상품/상세/보험사의 DB 버전이 바뀌면 다시 생성)"""
+    global _engine, _engine_version
+    catalog = get_catalog()
+    version = _version_check.current()
+    engine = _engine
+    if engine is not None and engine.catalog is catalog and version == _engine_version:
+        return engine
+    with _lock:
+        if _engine is None or _engine.catalog is not catalog or version != _engine_version:
+            _engine = ScoringEngine.build(catalog=catalog)
+            _engine_version = version
+        return _engine
+
+
+def invalidate_scoring_engine(*args, **kwargs):
+    global _engine
+    with _lock:
+        _engine = None
+    bump_catalog_version('scoring')
+    _version_check.expire()
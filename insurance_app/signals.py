@@ -0,0 +1,81 @@
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .catalog import invalidate_catalog
+from .coverage_index import rebuild_disease_coverage
+from .models import Breed, Cover, CoverType, Disease, InsuranceCompany, InsuranceDetail, InsuranceProduct
+from .scoring import invalidate_scoring_engine
+from .utils import recompute_sure_indexes, refresh_product_summaries
+
+
+@receiver(post_save, sender=Cover)
+@receiver(post_delete, sender=Cover)
+@receiver(post_save, sender=Disease)
+@receiver(post_delete, sender=Disease)
+@receiver(post_save, sender=Breed)
+@receiver(post_delete, sender=Breed)
+@receiver(post_save, sender=CoverType)
+@receiver(post_delete, sender=CoverType)
+@receiver(m2m_changed, sender=Breed.disease.through)
+def refresh_coverage_catalog(sender, **kwargs):
+    """보장 카탈로그 원본 데이터가 바뀌면 캐시 무효화"""
+    invalidate_catalog()
+
+
+@receiver(post_save, sender=InsuranceProduct)
+@receiver(post_delete, sender=InsuranceProduct)
+@receiver(post_save, sender=InsuranceDetail)
+@receiver(post_delete, sender=InsuranceDetail)
+@receiver(post_save, sender=InsuranceCompany)
+@receiver(post_delete, sender=InsuranceCompany)
+def refresh_scoring_engine(sender, **kwargs):
+    """상품/상세/보험사 점수가 바뀌면 점수 행렬 다시 계산"""
+    invalidate_scoring_engine()
+
+
+@receiver(post_save, sender=InsuranceDetail)
+@receiver(post_delete, sender=InsuranceDetail)
+def refresh_detail_summary(sender, instance, origin=None, **kwargs):
+    """상세 플랜이 바뀌면 해당 상품의 요약 컬럼과 질병 역색인 갱신"""
+    # 상품/보험사 삭제에 딸려 지워지는 경우 삭제될 상품의 행을 다시 만들지 않음
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model in (InsuranceProduct, InsuranceCompany):
+        return
+    refresh_product_summaries([instance.insurance_id])
+    rebuild_disease_coverage([instance.insurance_id])
+    recompute_sure_indexes([instance.insurance_id])
+
+
+@receiver(post_save, sender=Disease)
+@receiver(post_delete, sender=Disease)
+def refresh_disease_coverage(sender, **kwargs):
+    """질병의 보장유형(cover_type)이 바뀌면 역색인 전체 재생성"""
+    rebuild_disease_coverage()
+
+
+@receiver(post_save, sender=InsuranceProduct)
+def refresh_product_sure_index(sender, instance, update_fields=None, **kwargs):
+    """보장내역/보험사/나이 조건이 바뀔 수 있는 저장이면 해당 상품의 SURE 지수 재계산"""
+    if update_fields is not None and not {'coverage_details', 'company', 'pet_type'} & set(update_fields):
+        return
+    recompute_sure_indexes([instance.id])
+
+
+@receiver(pre_save, sender=InsuranceCompany)
+def remember_company_rating(sender, instance, update_fields=None, **kwargs):
+    """저장 전 신뢰도(rating) 기록 (refresh_company_sure_index에서 비교)"""
+    instance._previous_rating = None
+    if instance.pk and (update_fields is None or 'rating' in update_fields):
+        instance._previous_rating = InsuranceCompany.objects.filter(pk=instance.pk).values_list('rating', flat=True).first()
+
+
+@receiver(post_save, sender=InsuranceCompany)
+def refresh_company_sure_index(sender, instance, created, **kwargs):
+    """보험사 신뢰도(rating)가 바뀌면 소속 상품의 SURE 지수 재계산"""
+    previous = getattr(instance, '_previous_rating', None)
+    if created or previous is None or previous == instance.rating:
+        return
+    product_ids = list(instance.products.values_list('id', flat=True))
+    if product_ids:
+        recompute_sure_indexes(product_ids)
@@ -1,3 +1,208 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import date
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.test import TestCase, override_settings
+
+from . import knn_utils
+from .benchmark import clear_catalog, generate_catalog
+from .catalog import bump_catalog_version
+from common_app.models import Pet
+from .models import (
+    CatalogVersion, InsuranceChoice, InsuranceCompany, InsuranceDetail, InsuranceProduct, PetProfile, ProductSureIndex,
+    RecommendationResult,
+)
+from .recommendations import precompute_for_profiles
+from .scoring import get_scoring_engine
+
+
+class CatalogDeleteTests(TestCase):
+    """상세 플랜이 있는 상품/보험사 삭제 시 시그널이 삭제 중인 상품의 SURE 지수를 다시 만들지 않아야 함"""
+
+    def setUp(self):
+        self.company = InsuranceCompany.objects.create(name='테스트보험', rating=4.0, contact_number='000')
+        self.products = [self.create_product(n) for n in range(2)]
+
+    def create_product(self, n):
+        product = InsuranceProduct.objects.create(
+            company=self.company, name=f'상품{n}', pet_type='dog', base_price=10000, min_age=0, max_age=10,
+            coverage_period=1, renewal_cycle=1, coverage_details={'통원': 1}, coverage_limits={}, special_benefits={},
+        )
+        for m in range(2):
+            InsuranceDetail.objects.create(
+                insurance=product, name=f'플랜{m}', fee=10000 + m, basic={}, all_cover={}, price_score=0.5,
+            )
+        return product
+
+    def test_delete_product_with_details(self):
+        deleted, remaining = self.products
+        deleted.delete()
+        self.assertFalse(InsuranceProduct.objects.filter(pk=deleted.pk).exists())
+        self.assertFalse(ProductSureIndex.objects.filter(product_id=deleted.pk).exists())
+        self.assertTrue(ProductSureIndex.objects.filter(product=remaining).exists())
+
+    def test_delete_company_with_details(self):
+        self.company.delete()
+        self.assertFalse(InsuranceProduct.objects.exists())
+        self.assertFalse(ProductSureIndex.objects.exists())
+
+    def test_delete_detail_recomputes_product(self):
+        product = self.products[0]
+        InsuranceDetail.objects.filter(insurance=product).first().delete()
+        product.refresh_from_db()
+        self.assertEqual(product.detail_count, 1)
+        self.assertEqual(ProductSureIndex.objects.filter(product=product).count(), 6)
+
+    def test_company_save_recomputes_only_on_rating_change(self):
+        product = self.products[0]
+        before = ProductSureIndex.objects.get(product=product, pet_type='dog', age_band='adult')
+        self.company.contact_number = '111'
+        self.company.save()
+        self.assertEqual(ProductSureIndex.objects.get(product=product, pet_type='dog', age_band='adult').pk, before.pk)
+        self.company.rating = 1.0
+        self.company.save()
+        after = ProductSureIndex.objects.get(product=product, pet_type='dog', age_band='adult')
+        self.assertNotEqual(after.pk, before.pk)
+        self.assertLess(after.sure_index, before.sure_index)
+
+
+@override_settings(CATALOG_VERSION_CHECK_SECONDS=0)
+class EngineVersionTests(TestCase):
+    """다른 프로세스(import 명령, 다른 워커)가 추가한 상품도 DB 버전이 바뀌면 점수 엔진에 반영"""
+
+    def setUp(self):
+        self.company = InsuranceCompany.objects.create(name='테스트보험', rating=4.0, contact_number='000')
+
+    def add_product_elsewhere(self, name):
+        # bulk_create는 시그널을 보내지 않으므로 이 프로세스의 캐시는 그대로 남음
+        return InsuranceProduct.objects.bulk_create([InsuranceProduct(
+            company=self.company, name=name, pet_type='dog', base_price=10000, min_age=0, max_age=10,
+            coverage_period=1, renewal_cycle=1, coverage_details={}, coverage_limits={}, special_benefits={},
+        )])[0]
+
+    def test_engine_reloads_on_version_change(self):
+        engine = get_scoring_engine()
+        product = self.add_product_elsewhere('다른 프로세스 상품')
+        self.assertIs(get_scoring_engine(), engine)
+        CatalogVersion.objects.filter(name='scoring').update(version=F('version') + 1)
+        self.assertIn(product.id, get_scoring_engine().product_ids)
+
+    def test_bump_creates_version_row(self):
+        CatalogVersion.objects.all().delete()
+        bump_catalog_version('coverage')
+        bump_catalog_version('coverage')
+        self.assertEqual(CatalogVersion.objects.get(name='coverage').version, 2)
+
+
+class NeighborIndexTests(TestCase):
+    """선택 기록은 DB에서 delta로 가져오고, 트리 생성/재생성은 요청 밖(rebuild_if_needed)에서만"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for name, value in (('INDEX_PATH', Path(tmp.name) / 'index.joblib'), ('SYNC_SECONDS', 0)):
+            patcher = mock.patch.object(knn_utils, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        knn_utils._index = None
+        self.addCleanup(setattr, knn_utils, '_index', None)
+
+        company = InsuranceCompany.objects.create(name='테스트보험', rating=4.0, contact_number='000')
+        self.product = InsuranceProduct.objects.create(
+            company=company, name='상품', pet_type='dog', base_price=10000, min_age=0, max_age=10,
+            coverage_period=1, renewal_cycle=1, coverage_details={}, coverage_limits={}, special_benefits={},
+        )
+        user = User.objects.create_user('owner', password='pw')
+        self.profile = PetProfile.objects.create(
+            user=user, name='코코', pet_type='dog', breed='말티즈', birth_date=date(2020, 1, 1), gender='male',
+        )
+
+    def choose_elsewhere(self):
+        # 다른 워커의 update_user_choice와 같은 결과
+        return InsuranceChoice.objects.create(
+            pet_profile=self.profile, insurance_product=self.product, monthly_premium=10000,
+            start_date=date(2026, 1, 1), end_date=date(2027, 1, 1),
+        )
+
+    def test_request_does_not_build_missing_index(self):
+        with mock.patch.object(knn_utils.NeighborIndex, 'build') as build:
+            self.assertIsNone(knn_utils.get_neighbor_index())
+            self.assertEqual(knn_utils.predict_insurance(self.profile), [])
+        build.assert_not_called()
+        self.assertEqual(knn_utils.rebuild_if_needed(), 0)
+        self.assertIsNotNone(knn_utils.get_neighbor_index())
+
+    def test_choices_from_other_processes_join_delta(self):
+        index = knn_utils.rebuild_neighbor_index()
+        self.choose_elsewhere()
+        self.assertIs(knn_utils.get_neighbor_index(), index)
+        self.assertEqual(index.delta_size(), 1)
+        self.assertIs(knn_utils.get_neighbor_index(), index)
+        self.assertEqual(index.delta_size(), 1)
+
+    def test_delta_sync_is_throttled(self):
+        index = knn_utils.rebuild_neighbor_index()
+        self.choose_elsewhere()
+        with mock.patch.object(knn_utils, 'SYNC_SECONDS', 60), self.assertNumQueries(0):
+            knn_utils.get_neighbor_index()
+        self.assertEqual(index.delta_size(), 0)
+
+    def test_update_user_choice_does_not_rebuild(self):
+        index = knn_utils.rebuild_neighbor_index()
+        with mock.patch.object(knn_utils, 'REBUILD_THRESHOLD', 1), mock.patch.object(knn_utils, 'rebuild_neighbor_index') as rebuild:
+            knn_utils.update_user_choice(self.profile, self.product)
+        rebuild.assert_not_called()
+        self.assertEqual(knn_utils.get_neighbor_index().delta_size(), 1)
+        self.assertIs(knn_utils.get_neighbor_index(), index)
+
+    def test_rebuild_if_needed(self):
+        knn_utils.rebuild_neighbor_index()
+        self.choose_elsewhere()
+        self.assertIsNone(knn_utils.rebuild_if_needed(threshold=2))
+        self.assertEqual(knn_utils.rebuild_if_needed(threshold=1), 1)
+        self.assertEqual(knn_utils.get_neighbor_index().delta_size(), 0)
+
+    def test_reload_when_saved_by_another_process(self):
+        index = knn_utils.rebuild_neighbor_index()
+        self.choose_elsewhere()
+        knn_utils.NeighborIndex.build().save()
+        stat = knn_utils.INDEX_PATH.stat()
+        os.utime(knn_utils.INDEX_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        reloaded = knn_utils.get_neighbor_index()
+        self.assertIsNot(reloaded, index)
+        self.assertEqual(reloaded.delta_size(), 0)
+
+
+class RecommendBreedKeyTests(TestCase):
+    """추천 화면과 precompute_for_profiles가 같은 품종(PetProfile.breed)으로 결과 키를 만들어야 함"""
+
+    def test_view_uses_precomputed_key_for_selected_breed(self):
+        user = User.objects.create_user('owner', password='pw')
+        pet = Pet.objects.create(owner=user, name='코코', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+        self.client.force_login(user)
+        response = self.client.post(f'/insurance/recommend/{pet.id}/', {'outpatient': 5, 'breed': '말티즈'})
+        self.assertEqual(response.status_code, 200)
+        profile = PetProfile.objects.get(user=user)
+        self.assertEqual(profile.breed, '말티즈')
+        self.assertEqual(RecommendationResult.objects.count(), 1)
+        self.assertEqual(precompute_for_profiles(PetProfile.objects.filter(pk=profile.pk), only_missing=True), 0)
+
+
+class BenchmarkTeardownTests(TestCase):
+    def test_clear_catalog_invalidates_once(self):
+        generate_catalog(20, diseases=10, breeds=6)
+        before = dict(CatalogVersion.objects.values_list('name', 'version'))
+        with mock.patch('insurance_app.signals.rebuild_disease_coverage') as rebuild:
+            clear_catalog()
+        rebuild.assert_not_called()
+        after = dict(CatalogVersion.objects.values_list('name', 'version'))
+        self.assertEqual(after, {name: version + 1 for name, version in before.items()})
+        self.assertFalse(InsuranceProduct.objects.exists())
+        # 끊었던 시그널이 다시 연결됨
+        company = InsuranceCompany.objects.create(name='보험사', rating=3.0, contact_number='')
+        company.delete()
+        self.assertEqual(CatalogVersion.objects.get(name='scoring').version, after['scoring'] + 2)
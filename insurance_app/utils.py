@@ -1,5 +1,7 @@
 from datetime import datetime
-from .models import InsuranceProduct
+from django.db import transaction
+from django.db.models import Q
+from .models import InsuranceProduct, InsuranceDetail, ProductSureIndex
 import numpy as np
 
 def calculate_age(birth_date):
@@ -46,9 +48,66 @@ def calculate_sure_index(product, pet_type, age):
     
     return sure_index
 
-def recommend_insurance(pet_type, birth_date, weight=None):
+# 나이대별 대표 나이 (calculate_sure_index의 나이 가중치 구간과 같음)
+AGE_BANDS = {'junior': 0, 'adult': 5, 'senior': 11}
+SURE_PET_TYPES = ('dog', 'cat')
+
+def age_band(age):
+    if age < 1:
+        return 'junior'
+    if age > 10:
+        return 'senior'
+    return 'adult'
+
+def recompute_sure_indexes(product_ids=None):
+    """상품별 동물 종류 × 나이대 SURE 지수를 다시 계산해 ProductSureIndex와 sure_index(성체 기준)에 저장"""
+    products = InsuranceProduct.objects.select_related('company')
+    existing = ProductSureIndex.objects.all()
+    if product_ids is not None:
+        products = products.filter(id__in=product_ids)
+        existing = existing.filter(product_id__in=product_ids)
+    rows = []
+    changed = []
+    for product in products:
+        for pet_type in SURE_PET_TYPES:
+            for band, age in AGE_BANDS.items():
+                rows.append(ProductSureIndex(product=product, pet_type=pet_type, age_band=band, sure_index=calculate_sure_index(product, pet_type, age)))
+        own_index = calculate_sure_index(product, product.pet_type, AGE_BANDS['adult'])
+        if product.sure_index != own_index:
+            product.sure_index = own_index
+            changed.append(product)
+    with transaction.atomic():
+        existing.delete()
+        ProductSureIndex.objects.bulk_create(rows, batch_size=1000)
+        InsuranceProduct.objects.bulk_update(changed, ['sure_index'], batch_size=1000)
+    return len(rows)
+
+def recommend_insurance(pet_type, birth_date, weight=None, limit=3):
     age = calculate_age(birth_date)
-    products = InsuranceProduct.objects.all()
+    if pet_type not in SURE_PET_TYPES:
+        return _recommend_insurance_python(pet_type, age, weight, limit)
+
+    # 미리 계산된 SURE 지수를 (pet_type, age_band, -sure_index) 인덱스 순서로 조회
+    ranked = ProductSureIndex.objects.filter(
+        pet_type=pet_type,
+        age_band=age_band(age),
+    ).filter(
+        Q(product__min_age=0) | Q(product__min_age__lte=age),
+        Q(product__max_age=0) | Q(product__max_age__gte=age),
+    ).select_related('product__company').order_by('-sure_index', 'product_id')
+    if weight:
+        ranked = ranked.filter(
+            Q(product__min_weight__isnull=True) | Q(product__min_weight=0) | Q(product__min_weight__lte=weight),
+            Q(product__max_weight__isnull=True) | Q(product__max_weight=0) | Q(product__max_weight__gte=weight),
+        )
+    product_scores = [(row.product, row.sure_index) for row in ranked[:limit]]
+    if product_scores or ProductSureIndex.objects.exists() or not InsuranceProduct.objects.exists():
+        return product_scores
+    # 아직 recompute_sure_index를 실행하지 않은 경우
+    return _recommend_insurance_python(pet_type, age, weight, limit)
+
+def _recommend_insurance_python(pet_type, age, weight=None, limit=3):
+    products = InsuranceProduct.objects.select_related('company')
     
     # 각 상품의 SURE 지수 계산
     product_scores = []
@@ -65,8 +124,8 @@ def recommend_insurance(pet_type, birth_date, weight=None):
     # SURE 지수 기준으로 정렬
     product_scores.sort(key=lambda x: x[1], reverse=True)
     
-    # 상위 3개 상품 (상품, sure_index) 튜플로 반환
-    return product_scores[:3]
+    # 상위 limit개 상품 (상품, sure_index) 튜플로 반환
+    return product_scores[:limit]
 
 def euclidean_distance(user, neighbor):
     """유클리드 거리 계산"""
@@ -83,15 +142,14 @@ def inverse_weight(user, neighbor):
     return num / (distance + const)
 
 def get_neighbors(user, neighbor_list, k):
-    distances = []
-    for neighbor in neighbor_list:
-        dist = inverse_weight(user, neighbor)
-        distances.append((neighbor, dist))
-    distances.sort(reverse=True, key=lambda tup: tup[1])
-    near_neighbors = []
-    for i in range(min(k, len(distances))):
-        near_neighbors.append(distances[i][0])
-    return near_neighbors
+    """역거리 가중치가 큰(거리가 가까운) 순으로 k개 이웃 반환"""
+    if not neighbor_list:
+        return []
+    user = np.asarray(user, dtype=float)
+    neighbors = np.asarray(neighbor_list, dtype=float)[:, :len(user)]
+    distances = np.sqrt(((neighbors - user) ** 2).sum(axis=1))
+    order = np.argsort(distances, kind='stable')[:k]
+    return [neighbor_list[i] for i in order]
 
 def predict_classification(user, neighbor_list, k):
     neighbors = get_neighbors(user, neighbor_list, k)
@@ -99,19 +157,22 @@ def predict_classification(user, neighbor_list, k):
     return predict_candidate
 
 def get_pred(user, neighbor_list, k):
-    predict_candidate = predict_classification(user, neighbor_list, k)
-    weight_dist = 0
-    for neighbor in neighbor_list:
-        weight_dist = inverse_weight(user, neighbor)
-    lst = [0] * 100  # 보험상품 개수에 맞게 조정 필요
-    for i in range(min(k, len(predict_candidate))):
-        x = predict_candidate[i]
-        lst[x] += weight_dist
-    return lst
-
-def make_sure_score(company_score, price_score, matching_score):
-    """SURE 점수(신뢰지수) 가중합 계산"""
-    return (company_score * 0.3) + (price_score * 0.3) + (matching_score * 0.4)
+    """이웃 k개의 선택(마지막 컬럼)에 각 이웃의 역거리 가중치를 더한 배열 반환"""
+    neighbors = get_neighbors(user, neighbor_list, k)
+    if not neighbors:
+        return []
+    user = np.asarray(user, dtype=float)
+    data = np.asarray(neighbors, dtype=float)
+    weights = 1.0 / (np.sqrt(((data[:, :len(user)] - user) ** 2).sum(axis=1)) + 0.1)
+    labels = data[:, -1].astype(int)
+    # 상품 개수에 맞게 배열 크기 결정
+    lst = np.bincount(labels, weights=weights, minlength=labels.max() + 1)
+    return lst.tolist()
+
+def make_sure_score(company_score, price_score, matching_score, breed_disease_bonus=0):
+    """SURE 점수(신뢰지수) 가중합 계산 (스칼라/NumPy 배열 모두 지원)"""
+    base_score = (company_score * 0.3) + (price_score * 0.3) + (matching_score * 0.4)  # 합계 100%
+    return base_score + (breed_disease_bonus * 0.2)  # 최대 20% 가산점
 
 def get_coverage_vector(coverage_details, all_coverage_keys):
     """보장항목 딕셔너리를 전체 보장항목 키 기준 벡터(0/1)로 변환"""
@@ -140,4 +201,36 @@ def get_flat_coverage_vector(coverage_details, all_coverage_keys):
     keys = flatten_coverage_keys(coverage_details)
     return [1 if key in keys else 0 for key in all_coverage_keys]
 
+def summarize_details(details):
+    """(price_score, basic, special) 목록으로 상세 플랜 수, 평균 price_score, 보장 질병 ID 합집합 계산"""
+    count = 0
+    total = 0.0
+    covered = set()
+    for price_score, basic, special in details:
+        count += 1
+        total += price_score or 0
+        covered.update(basic or [])
+        covered.update(special or [])
+    avg = total / count if count else None
+    return count, avg, sorted(covered)
+
+def refresh_product_summaries(product_ids=None):
+    """InsuranceProduct의 detail_count/avg_price_score/covered_disease_ids를 InsuranceDetail 기준으로 갱신"""
+    products = InsuranceProduct.objects.all()
+    details = InsuranceDetail.objects.all()
+    if product_ids is not None:
+        products = products.filter(id__in=product_ids)
+        details = details.filter(insurance_id__in=product_ids)
+    grouped = {}
+    for insurance_id, price_score, basic, special in details.values_list('insurance_id', 'price_score', 'basic', 'special'):
+        grouped.setdefault(insurance_id, []).append((price_score, basic, special))
+    changed = []
+    for product in products.only('id', 'detail_count', 'avg_price_score', 'covered_disease_ids'):
+        summary = summarize_details(grouped.get(product.id, []))
+        if summary != (product.detail_count, product.avg_price_score, product.covered_disease_ids):
+            product.detail_count, product.avg_price_score, product.covered_disease_ids = summary
+            changed.append(product)
+    InsuranceProduct.objects.bulk_update(changed, ['detail_count', 'avg_price_score', 'covered_disease_ids'])
+    return len(changed)
+
 # price_score, matching_score 등은 실제 데이터와 연동하여 views.py에서 계산/전달하도록 설계 
\ No newline at end of file
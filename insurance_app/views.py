@@ -9,15 +9,14 @@ from django.core.mail import send_mail
 from django.conf import settings
 from .models import InsuranceProduct, InsuranceCompany, InsuranceInquiry, PetProfile, InsuranceChoice
 from common_app.models import Pet
+from common_app.instrumentation import query_budget
 from .utils import recommend_insurance, calculate_sure_index, calculate_age, get_pred, make_sure_score, get_coverage_vector, jaccard_similarity, flatten_coverage_keys
 from .knn_utils import predict_insurance, update_user_choice
+from .catalog import get_catalog
+from .recommendations import get_recommendations, precompute_for_profiles
+from .scoring import get_scoring_engine, preference_vector, COVERAGE_KEYS, PREFERENCE_MAP
 import json
-from pathlib import Path
-from django.db import models
-from numpy import dot
-from numpy.linalg import norm
 from django.urls import reverse
-from collections import defaultdict
 
 @login_required
 def main(request):
@@ -104,13 +103,8 @@ def recommend_form(request, pet_profile_id):
         ('구강질환', 'oral'),
         ('비뇨기질환', 'urinary'),
     ]
-    # breed.json에서 품종명 리스트 추출
-    breed_path = Path(__file__).parent / 'fixtures' / 'breed.json'
-    breed_list = []
-    if breed_path.exists():
-        with open(breed_path, encoding='utf-8') as f:
-            breed_data = json.load(f)
-            breed_list = [b['fields']['name'] for b in breed_data]
+    # 카탈로그에서 품종명 리스트 추출
+    breed_list = get_catalog().breed_names
     # PetProfile에 저장된 preference_dict 불러오기 (없으면 3으로 채움)
     preference_dict = pet_profile.preference_dict or {key: 3 for label, key in preference_fields}
     # 혹시라도 값이 빠진 key가 있으면 3으로 채움
@@ -127,6 +121,7 @@ def recommend_form(request, pet_profile_id):
     return render(request, 'insurance/recommend_form.html', context)
 
 @login_required
+@query_budget(20)
 def insurance_recommend(request, pet_profile_id):
     # POST 데이터가 없으면 폼으로 리다이렉트
     if request.method != 'POST':
@@ -134,7 +129,6 @@ def insurance_recommend(request, pet_profile_id):
     
     # pet_profile_id는 실제로는 Pet의 id이므로 Pet을 먼저 찾음
     pet = get_object_or_404(Pet, id=pet_profile_id, owner=request.user)
-    breed_name = pet.breed  # Pet 객체에서 breed 값을 가져옴
     # PetProfile을 user, name, birth_date 등 주요 정보로 찾음
     pet_profile = PetProfile.objects.filter(
         user=pet.owner,
@@ -187,124 +181,41 @@ def insurance_recommend(request, pet_profile_id):
     else:
         preference_dict = {key: 3 for label, key in preference_fields}
 
-    # 모든 보험 상품 가져오기
-    products = InsuranceProduct.objects.all()
-
-    # 한글 key → 영문 코드 매핑
-    preference_map = {
-        '통원': 'outpatient',
-        '입원': 'inpatient',
-        '수술': 'surgery',
-        '배상책임': 'liability',
-        '슬관절': 'joint',
-        '피부병': 'skin',
-        '구강질환': 'oral',
-        '비뇨기질환': 'urinary',
-    }
-
-    # all_coverage_keys를 preference_map의 key만으로 제한
-    all_coverage_keys = list(preference_map.keys())
-
-    # user_vector를 all_coverage_keys의 한글 key를 preference_map(한글→영문)으로 변환해서 preference_dict에서 값을 가져오도록 수정
-    user_vector = []
-    for cov_key in all_coverage_keys:
-        eng_key = preference_map.get(cov_key)
-        if eng_key:
-            user_vector.append(preference_dict.get(eng_key, 0))
-        else:
-            user_vector.append(0)
-
-    # cover_type → 카테고리명 매핑
-    cover_type_to_category = {
-        1: '통원',
-        2: '입원',
-        3: '수술',
-        4: '슬관절',
-        5: '피부병',
-        6: '구강질환',
-        7: '비뇨기질환',
-        8: '배상책임',
-    }
-
-    # cover.json에서 보장 ID → cover_type 매핑 생성
-    cover_id_to_type = {}
-    cover_path = Path(__file__).parent / 'fixtures' / 'cover.json'
-    if cover_path.exists():
-        with open(cover_path, encoding='utf-8') as f:
-            for item in json.load(f):
-                cover_id_to_type[item['pk']] = item['fields']['cover_type']
-
-    def get_category_coverage_vector(coverage_details, all_coverage_keys):
-        vector = [0 for _ in all_coverage_keys]
-        # 1. 카테고리 key가 있으면 1
-        for idx, key in enumerate(all_coverage_keys):
-            if key in coverage_details:
-                vector[idx] = 1
-        # 2. '기본보장', '특별보장'의 보장 ID로 카테고리 체크
-        for section in ['기본보장', '특별보장']:
-            for cover_id in coverage_details.get(section, []):
-                cover_type = cover_id_to_type.get(cover_id)
-                category = cover_type_to_category.get(cover_type)
-                if category and category in all_coverage_keys:
-                    idx = all_coverage_keys.index(category)
-                    vector[idx] = 1
-        # 3. 질병보장(disease) 항목도 기존대로 체크
-        disease_dict = coverage_details.get('질병보장', {})
-        for disease in disease_dict.values():
-            cover_type = disease.get('cover_type')
-            if cover_type and cover_type_to_category.get(cover_type) in all_coverage_keys:
-                idx = all_coverage_keys.index(cover_type_to_category[cover_type])
-                vector[idx] = 1
-        return vector
-
-    # cosine similarity 함수 정의
-    def cosine_similarity(a, b):
-        if norm(a) == 0 or norm(b) == 0:
-            return 0.0
-        return float(dot(a, b) / (norm(a) * norm(b)))
-
-    before_ranking = []
-    for product in products:
-        product_vector = get_category_coverage_vector(product.coverage_details, all_coverage_keys)
-        matching_score = cosine_similarity(user_vector, product_vector)
+    # 폼에서 고른 품종이 저장된 PetProfile.breed 기준 (precompute_for_profiles와 같은 키)
+    breed_name = pet_profile.breed
+    # 미리 계산된 순위(선호도/품종/카탈로그 버전 해시 키)를 조회, 없으면 계산 후 저장
+    catalog = get_catalog()
+    engine = get_scoring_engine()
+    all_coverage_keys = COVERAGE_KEYS
+    result = get_recommendations(preference_dict, breed_name, pet_profile.pet_type, engine=engine)
+    breed_disease_pks = catalog.breed_disease_pks(breed_name)
+    shown_ids = list(dict.fromkeys(result.sure_ids + result.price_ids + result.cover_ids))
+    products = InsuranceProduct.objects.select_related('company').in_bulk(shown_ids)
+
+    before_ranking = {}
+    for product_id in shown_ids:
+        product = products.get(product_id)
+        if product is None or product_id not in engine.index:
+            continue
+        idx = engine.index[product_id]
+        product_vector = engine.coverage_matrix[idx]
+        scores = result.scores.get(str(product_id), {})
         temp_detail = {}
         temp_detail['product'] = product
-        temp_detail['company_score'] = float(product.company.rating) if product.company and product.company.rating else 0.0
-        details = getattr(product, 'insurancedetail_set', None)
-        if details and details.exists():
-            price_score = float(details.aggregate(models.Avg('price_score'))['price_score__avg'] or 0)
-        else:
-            price_score = float(product.base_price)
-        temp_detail['price_score'] = price_score
-        temp_detail['matching_score'] = matching_score
-        temp_detail['cover_count'] = len(flatten_coverage_keys(product.coverage_details))
-        temp_detail['sure_score'] = make_sure_score(temp_detail['company_score'], price_score, matching_score, breed_disease_bonus=0)
-        cover_path = Path(__file__).parent / 'fixtures' / 'cover.json'
-        disease_path = Path(__file__).parent / 'fixtures' / 'disease.json'
-        cover_map = {}
-        disease_map = {}
-        if cover_path.exists():
-            with open(cover_path, encoding='utf-8') as f:
-                for item in json.load(f):
-                    cover_map[item['pk']] = item['fields']
-        if disease_path.exists():
-            with open(disease_path, encoding='utf-8') as f:
-                for item in json.load(f):
-                    disease_map[item['pk']] = item['fields']['name']
-        product.coverage_details_verbose = {}
-        for key, value in product.coverage_details.items():
-            if isinstance(value, list):
-                product.coverage_details_verbose[key] = [cover_map.get(i, {}).get('detail') or disease_map.get(i) or str(i) for i in value]
-            else:
-                product.coverage_details_verbose[key] = value
+        temp_detail['company_score'] = float(engine.company_scores[idx])
+        temp_detail['price_score'] = float(engine.price_scores[idx])
+        temp_detail['matching_score'] = scores.get('matching', 0.0)
+        temp_detail['cover_count'] = int(engine.cover_counts[idx])
+        temp_detail['sure_score'] = scores.get('sure', 0.0)
+        product.coverage_details_verbose = catalog.verbose_coverage(product.coverage_details)
         # 특별 혜택 detail만 리스트로 변환
         if hasattr(product, 'special_benefits') and isinstance(product.special_benefits, list):
-            product.special_benefits = [cover_map.get(i, {}).get('detail', str(i)) for i in product.special_benefits]
+            product.special_benefits = [catalog.covers.get(i, {}).get('detail', str(i)) for i in product.special_benefits]
         # 4점 이상(중시)로 선택한 항목 중 이 상품이 보장하는 항목만 모으기
         highlighted = []
-        for idx, cov_key in enumerate(all_coverage_keys):
-            eng_key = preference_map.get(cov_key)
-            if eng_key and preference_dict.get(eng_key, 0) >= 4 and product_vector[idx] == 1:
+        for vec_idx, cov_key in enumerate(all_coverage_keys):
+            eng_key = PREFERENCE_MAP.get(cov_key)
+            if eng_key and preference_dict.get(eng_key, 0) >= 4 and product_vector[vec_idx] == 1:
                 highlighted.append(f"'{cov_key}'")
         matching_reason = []
         if highlighted:
@@ -312,46 +223,19 @@ def insurance_recommend(request, pet_profile_id):
 
         temp_detail['matching_reason'] = matching_reason
         # 카테고리별 보장 내용 정리 (중복 제거)
-        category_details = defaultdict(set)
-        for section in ['기본보장', '특별보장']:
-            for cover_id in product.coverage_details.get(section, []):
-                cover = cover_map.get(cover_id)
-                if cover:
-                    category = cover_type_to_category.get(cover['cover_type'], '기타')
-                    category_details[category].add(cover['detail'])
-        temp_detail['category_coverage_summary'] = {cat: list(details) for cat, details in category_details.items()}
-        before_ranking.append(temp_detail)
+        temp_detail['category_coverage_summary'] = catalog.category_summary(product.coverage_details)
+        before_ranking[product_id] = temp_detail
 
-    sure_ranking = sorted(before_ranking, key=lambda item: -item['sure_score'])[:6]
-    price_ranking = sorted(before_ranking, key=lambda item: item['price_score'])[:6]
-    cover_ranking = sorted(before_ranking, key=lambda item: -item['cover_count'])[:6]
+    sure_ranking = [before_ranking[pid] for pid in result.sure_ids if pid in before_ranking][:6]
+    price_ranking = [before_ranking[pid] for pid in result.price_ids if pid in before_ranking][:6]
+    cover_ranking = [before_ranking[pid] for pid in result.cover_ids if pid in before_ranking][:6]
 
     # --- 품종별 취약 질병 보장 가산점 추천 근거 추가 ---
-    breed_path = Path(__file__).parent / 'fixtures' / 'breed.json'
-    disease_path = Path(__file__).parent / 'fixtures' / 'disease.json'
-    breed_disease_pks = []
-    breed_disease_names = []
-    if breed_path.exists() and disease_path.exists():
-        with open(breed_path, encoding='utf-8') as f:
-            breed_data = json.load(f)
-        with open(disease_path, encoding='utf-8') as f:
-            disease_data = json.load(f)
-        # 품종명 -> 질병 PK 매핑
-        breed_name_to_disease = {b['fields']['name']: b['fields']['disease'] for b in breed_data}
-        breed_disease_pks = breed_name_to_disease.get(breed_name, [])
-        disease_pk_to_name = {d['pk']: d['fields']['name'] for d in disease_data}
-        breed_disease_names = [disease_pk_to_name.get(pk) for pk in breed_disease_pks if pk in disease_pk_to_name]
-    for temp_detail in before_ranking:
-        product = temp_detail['product']
-        details = getattr(product, 'insurancedetail_set', None)
-        covered_diseases = set()
-        if details and details.exists() and breed_disease_pks:
-            for detail in details.all():
-                for pk in breed_disease_pks:
-                    if (pk in (detail.basic or [])) or (detail.special and pk in detail.special):
-                        covered_diseases.add(pk)
+    breed_disease_names = [catalog.disease_name(pk) for pk in breed_disease_pks if pk in catalog.diseases]
+    for product_id, temp_detail in before_ranking.items():
+        covered_diseases = set(result.covered_diseases.get(str(product_id), []))
         if covered_diseases:
-            covered_names = [name for pk, name in zip(breed_disease_pks, breed_disease_names) if pk in covered_diseases]
+            covered_names = [catalog.disease_name(pk) for pk in breed_disease_pks if pk in covered_diseases and pk in catalog.diseases]
             if covered_names:
                 temp_detail['matching_reason'].insert(0, f"{breed_name} 품종은 {', '.join(covered_names)} 질병에 취약하여, 해당 질병이 보장내역에 포함된 상품을 추천합니다.")
     # 추천 근거 reason(문구) context에 추가(상위 1개 상품 기준)
@@ -384,6 +268,7 @@ def recommend_result(request):
     return redirect('insurance:recommend')
 
 @login_required
+@query_budget(12)
 def insurance_compare(request):
     pet_id = request.GET.get('pet_id')
     pet = None
@@ -402,20 +287,8 @@ def insurance_compare(request):
         except Pet.DoesNotExist:
             pass
 
-    products = InsuranceProduct.objects.all()
-
-    cover_path = Path(__file__).parent / 'fixtures' / 'cover.json'
-    disease_path = Path(__file__).parent / 'fixtures' / 'disease.json'
-    cover_map = {}
-    disease_map = {}
-    if cover_path.exists():
-        with open(cover_path, encoding='utf-8') as f:
-            for item in json.load(f):
-                cover_map[item['pk']] = item['fields']['detail']
-    if disease_path.exists():
-        with open(disease_path, encoding='utf-8') as f:
-            for item in json.load(f):
-                disease_map[item['pk']] = item['fields']['name']
+    catalog = get_catalog()
+    engine = get_scoring_engine()
 
     # 비교에서도 선호도 기반 user_vector 생성
     preference_fields = [
@@ -428,83 +301,31 @@ def insurance_compare(request):
         ('구강질환', 'oral'),
         ('비뇨기질환', 'urinary'),
     ]
-    preference_map = {
-        '통원': 'outpatient',
-        '입원': 'inpatient',
-        '수술': 'surgery',
-        '배상책임': 'liability',
-        '슬관절': 'joint',
-        '피부병': 'skin',
-        '구강질환': 'oral',
-        '비뇨기질환': 'urinary',
-    }
-    all_coverage_keys = list(preference_map.keys())
+    all_coverage_keys = COVERAGE_KEYS
     # POST로 선호도 값이 오면 반영
     if request.method == 'POST':
         preference_dict = {}
         for label, key in preference_fields:
             preference_dict[key] = int(request.POST.get(key, 3))
-        user_vector = [preference_dict.get(preference_map[k], 3) for k in all_coverage_keys]
+        user_vector = preference_vector(preference_dict, default=3)
     else:
         user_vector = [3 for _ in all_coverage_keys]
 
-    # cover_type_to_category, cover_id_to_type 등 기존 추천과 동일하게 적용
-    cover_type_to_category = {
-        1: '통원', 2: '입원', 3: '수술', 4: '슬관절', 5: '피부병', 6: '구강질환', 7: '비뇨기질환', 8: '배상책임',
-    }
-    cover_id_to_type = {}
-    if cover_path.exists():
-        with open(cover_path, encoding='utf-8') as f:
-            for item in json.load(f):
-                cover_id_to_type[item['pk']] = item['fields']['cover_type']
-    def get_category_coverage_vector(coverage_details, all_coverage_keys):
-        vector = [0 for _ in all_coverage_keys]
-        for idx, key in enumerate(all_coverage_keys):
-            if key in coverage_details:
-                vector[idx] = 1
-        for section in ['기본보장', '특별보장']:
-            for cover_id in coverage_details.get(section, []):
-                cover_type = cover_id_to_type.get(cover_id)
-                category = cover_type_to_category.get(cover_type)
-                if category and category in all_coverage_keys:
-                    idx = all_coverage_keys.index(category)
-                    vector[idx] = 1
-        disease_dict = coverage_details.get('질병보장', {})
-        for disease in disease_dict.values():
-            cover_type = disease.get('cover_type')
-            if cover_type and cover_type_to_category.get(cover_type) in all_coverage_keys:
-                idx = all_coverage_keys.index(cover_type_to_category[cover_type])
-                vector[idx] = 1
-        return vector
-    def cosine_similarity(a, b):
-        from numpy import dot
-        from numpy.linalg import norm
-        if norm(a) == 0 or norm(b) == 0:
-            return 0.0
-        return float(dot(a, b) / (norm(a) * norm(b)))
+    # 기존 추천과 동일한 점수 엔진으로 전체 상품 SURE 점수를 한 번에 계산
+    sure_scores = engine.sure_scores([user_vector])[0]
+    products = InsuranceProduct.objects.select_related('company').in_bulk(engine.product_ids)
 
     processed = []
-    for product in products:
-        product.coverage_details_verbose = {}
-        for key, value in product.coverage_details.items():
-            if isinstance(value, list):
-                product.coverage_details_verbose[key] = [cover_map.get(i) or disease_map.get(i) or str(i) for i in value]
-            else:
-                product.coverage_details_verbose[key] = value
+    for idx, product_id in enumerate(engine.product_ids):
+        product = products.get(product_id)
+        if product is None:
+            continue
+        product.coverage_details_verbose = catalog.verbose_coverage(product.coverage_details)
         if not isinstance(product.special_benefits, list):
             product.special_benefits = []
         else:
-            product.special_benefits = [cover_map.get(i) or disease_map.get(i) or str(i) for i in product.special_benefits]
-        company_score = float(product.company.rating) if product.company and product.company.rating else 0.0
-        details = getattr(product, 'insurancedetail_set', None)
-        if details and details.exists():
-            price_score = float(details.aggregate(models.Avg('price_score'))['price_score__avg'] or 0)
-        else:
-            price_score = float(product.base_price)
-        product_vector = get_category_coverage_vector(product.coverage_details, all_coverage_keys)
-        matching_score = cosine_similarity(user_vector, product_vector)
-        sure_score = make_sure_score(company_score, price_score, matching_score, breed_disease_bonus=0)
-        processed.append((product, sure_score))
+            product.special_benefits = [catalog.cover_detail(i) or catalog.disease_name(i) or str(i) for i in product.special_benefits]
+        processed.append((product, float(sure_scores[idx])))
 
     context = {
         'products': processed,
@@ -523,13 +344,14 @@ def api_recommend(request):
         recommended_products = recommend_insurance(pet_type, pet_birth)
         
         result = []
-        for product in recommended_products:
+        for product, sure_index in recommended_products:
             result.append({
                 'id': product.id,
                 'name': product.name,
                 'company': product.company.name,
                 'base_price': float(product.base_price),
-                'coverage_details': product.coverage_details
+                'coverage_details': product.coverage_details,
+                'sure_index': sure_index,
             })
         
         return JsonResponse({'status': 'success', 'products': result})
@@ -580,48 +402,20 @@ def inquiry(request, product_id):
     return render(request, 'insurance/inquiry.html', {'product': product})
 
 @login_required
+@query_budget(10)
 def insurance_detail(request, product_id):
     product = get_object_or_404(InsuranceProduct, id=product_id)
 
-    # cover_map, disease_map 생성 (recommend와 동일)
-    cover_path = Path(__file__).parent / 'fixtures' / 'cover.json'
-    disease_path = Path(__file__).parent / 'fixtures' / 'disease.json'
-    cover_map = {}
-    disease_map = {}
-    if cover_path.exists():
-        with open(cover_path, encoding='utf-8') as f:
-            for item in json.load(f):
-                cover_map[item['pk']] = item['fields']
-    if disease_path.exists():
-        with open(disease_path, encoding='utf-8') as f:
-            for item in json.load(f):
-                disease_map[item['pk']] = item['fields']['name']
-
-    # 보장 id를 이름/설명으로 변환하여 context에 전달
-    coverage_details_verbose = {}
-    for key, value in product.coverage_details.items():
-        if isinstance(value, list):
-            coverage_details_verbose[key] = [cover_map.get(i, {}).get('detail') or disease_map.get(i) or str(i) for i in value]
-        else:
-            coverage_details_verbose[key] = value
+    # 보장 id를 이름/설명으로 변환하여 context에 전달 (recommend와 동일한 카탈로그 사용)
+    catalog = get_catalog()
+    coverage_details_verbose = catalog.verbose_coverage(product.coverage_details)
     # 특별 혜택 detail만 리스트로 변환
     if not isinstance(product.special_benefits, list):
         special_benefits_verbose = []
     else:
-        special_benefits_verbose = [cover_map.get(i, {}).get('detail', str(i)) for i in product.special_benefits]
+        special_benefits_verbose = [catalog.covers.get(i, {}).get('detail', str(i)) for i in product.special_benefits]
     # 카테고리별 보장 내용 정리 (중복 제거)
-    cover_type_to_category = {
-        1: '통원', 2: '입원', 3: '수술', 4: '슬관절', 5: '피부병', 6: '구강질환', 7: '비뇨기질환', 8: '배상책임',
-    }
-    category_details = defaultdict(set)
-    for section in ['기본보장', '특별보장']:
-        for cover_id in product.coverage_details.get(section, []):
-            cover = cover_map.get(cover_id)
-            if cover:
-                category = cover_type_to_category.get(cover['cover_type'], '기타')
-                category_details[category].add(cover['detail'])
-    # set → list 변환
-    category_coverage_summary = {cat: list(details) for cat, details in category_details.items()}
+    category_coverage_summary = catalog.category_summary(product.coverage_details)
     context = {
         'product': product,
         'coverage_details_verbose': coverage_details_verbose,
@@ -648,17 +442,15 @@ def choose_insurance(request, pet_profile_id, product_id):
 @require_POST
 def api_save_preference(request, pet_profile_id):
     import json
-    pet_profile = get_object_or_404(PetProfile, id=pet_profile_id, owner=request.user)
+    pet_profile = get_object_or_404(PetProfile, id=pet_profile_id, user=request.user)
     data = json.loads(request.body)
     pet_profile.preference_dict = data.get('preference_dict', {})
     pet_profile.save()
+    # 바뀐 선호도 기준으로 이 반려동물의 추천 순위만 다시 계산
+    precompute_for_profiles([pet_profile])
     return JsonResponse({'success': True})
 
 @login_required
 def api_get_preference(request, pet_profile_id):
-    pet_profile = get_object_or_404(PetProfile, id=pet_profile_id, owner=request.user)
+    pet_profile = get_object_or_404(PetProfile, id=pet_profile_id, user=request.user)
     return JsonResponse({'preference_dict': pet_profile.preference_dict or {}})
-
-def make_sure_score(company_score, price_score, matching_score, breed_disease_bonus=0):
-    base_score = (company_score * 0.3) + (price_score * 0.3) + (matching_score * 0.4)  # 합계 100%
-    return base_score + (breed_disease_bonus * 0.2)  # 최대 20% 가산점
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_app', '0009_calendarversion'),
+        ('item_purchase_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='otherpurchase',
+            index=models.Index(fields=['user', 'purchase_date'], name='otherpurchase_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otherpurchase',
+            index=models.Index(fields=['user', 'cat', 'purchase_date'], name='otherpurchase_user_pet_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otherpurchase',
+            index=models.Index(fields=['user', 'type', 'purchase_date'], name='otherpurchase_user_type_idx'),
+        ),
+    ]
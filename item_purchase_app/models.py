@@ -24,6 +24,12 @@ class OtherPurchase(models.Model):
 
     class Meta:
         ordering = ['-purchase_date']
+        indexes = [
+            # 월별 목록/통계 (사용자 + 구매일, 반려동물·카테고리 필터)
+            models.Index(fields=['user', 'purchase_date'], name='otherpurchase_user_date_idx'),
+            models.Index(fields=['user', 'cat', 'purchase_date'], name='otherpurchase_user_pet_idx'),
+            models.Index(fields=['user', 'type', 'purchase_date'], name='otherpurchase_user_type_idx'),
+        ]
         verbose_name = '기타 구매'
         verbose_name_plural = '기타 구매'
 
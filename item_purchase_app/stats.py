@@ -0,0 +1,76 @@
+from datetime import date
+
+from django.db.models import Count, IntegerField, Max, Q, Sum
+from django.db.models.functions import Coalesce
+
+from common_app.spending import add_months, month_start
+from .models import OtherPurchase
+
+CATEGORY_LABELS = ['장난감', '간식', '용품', '의료', '미용', '기타']
+
+
+def purchase_statistics(user, month, pet=None, search='', category=''):
+    """한 달의 기타 구매 통계를 한 번의 GROUP BY 쿼리로 계산
+
+    이번 달(검색어/카테고리 필터 적용), 지난달, 직전 3개월(반려동물 필터만 적용) 합계를
+    Sum(..., filter=Q(...)) 조건부 집계로 구하고, 타입별 행을 합쳐서 반환한다.
+    """
+    start = month_start(month)
+    end = add_months(start, 1)
+    last_start = add_months(start, -1)
+    history_start = add_months(start, -3)
+
+    current = Q(purchase_date__gte=start, purchase_date__lt=end)
+    if search:
+        current &= Q(product_name__icontains=search)
+    if category:
+        current &= Q(type=category)
+    last_month = Q(purchase_date__gte=last_start, purchase_date__lt=start)
+    history = Q(purchase_date__gte=history_start, purchase_date__lt=start)
+
+    qs = OtherPurchase.objects.filter(user=user, purchase_date__gte=history_start, purchase_date__lt=end)
+    if pet:
+        qs = qs.filter(cat_id=pet)
+    rows = qs.values('type').annotate(
+        total=Coalesce(Sum('price', filter=current), 0, output_field=IntegerField()),
+        count=Count('id', filter=current),
+        largest=Max('price', filter=current),
+        last_month_total=Coalesce(Sum('price', filter=last_month), 0, output_field=IntegerField()),
+        last_month_count=Count('id', filter=last_month),
+        three_months_total=Coalesce(Sum('price', filter=history), 0, output_field=IntegerField()),
+    ).order_by('type')
+
+    stats = {
+        'month': start,
+        'total_price': 0,
+        'count': 0,
+        'category_totals': {},
+        'largest_expense': 0,
+        'largest_category': '',
+        'last_month_total': 0,
+        'last_month_count': 0,
+        'three_months_total': 0,
+    }
+    for row in rows:
+        stats['total_price'] += row['total']
+        stats['count'] += row['count']
+        stats['last_month_total'] += row['last_month_total']
+        stats['last_month_count'] += row['last_month_count']
+        stats['three_months_total'] += row['three_months_total']
+        if row['count']:
+            stats['category_totals'][row['type']] = row['total']
+        if row['largest'] is not None and row['largest'] > stats['largest_expense']:
+            stats['largest_expense'] = row['largest']
+            stats['largest_category'] = row['type']
+    return stats
+
+
+def parse_month(value, default=None):
+    """'YYYY-MM' 또는 'YYYY-MM-DD'를 그 달의 1일로 변환 (형식이 다르면 default, 없으면 이번 달)"""
+    try:
+        if value and len(value) in (7, 10):
+            year, mon = map(int, value[:7].split('-'))
+            return date(year, mon, 1)
+    except ValueError:
+        pass
+    return default or month_start(date.today())
@@ -1,3 +1,66 @@
+from datetime import date
+
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from common_app.models import Pet
+
+from .models import OtherPurchase
+from .stats import parse_month, purchase_statistics
+
+
+class PurchaseStatisticsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('owner', password='pw')
+        self.pet = Pet.objects.create(owner=self.user, name='코코', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+        self.other_pet = Pet.objects.create(owner=self.user, name='보리', pet_type='cat', breed='etc', birth_date=date(2021, 1, 1))
+        rows = [
+            # 이번 달 (2026-03)
+            (self.pet, date(2026, 3, 1), 5000, '장난감', '공'),
+            (self.pet, date(2026, 3, 31), 12000, '간식', '육포'),
+            (self.other_pet, date(2026, 3, 15), 3000, '장난감', '낚싯대'),
+            # 지난달, 직전 3개월
+            (self.pet, date(2026, 2, 28), 4000, '간식', '육포'),
+            (self.pet, date(2026, 1, 10), 6000, '용품', '하네스'),
+            (self.pet, date(2025, 12, 1), 1000, '기타', '봉투'),
+            # 범위 밖
+            (self.pet, date(2025, 11, 30), 99000, '의료', '검진'),
+            (self.pet, date(2026, 4, 1), 99000, '의료', '검진'),
+        ]
+        for pet, day, price, kind, name in rows:
+            OtherPurchase.objects.create(user=self.user, cat=pet, purchase_date=day, price=price, type=kind, product_name=name)
+        stranger = User.objects.create_user('stranger', password='pw')
+        stranger_pet = Pet.objects.create(owner=stranger, name='남의 집', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+        OtherPurchase.objects.create(user=stranger, cat=stranger_pet, purchase_date=date(2026, 3, 2), price=50000, type='간식', product_name='육포')
+
+    def test_month_and_history_windows(self):
+        with self.assertNumQueries(1):
+            stats = purchase_statistics(self.user, date(2026, 3, 20))
+        self.assertEqual(stats['month'], date(2026, 3, 1))
+        self.assertEqual((stats['total_price'], stats['count']), (20000, 3))
+        self.assertEqual(stats['category_totals'], {'간식': 12000, '장난감': 8000})
+        self.assertEqual((stats['largest_expense'], stats['largest_category']), (12000, '간식'))
+        self.assertEqual((stats['last_month_total'], stats['last_month_count']), (4000, 1))
+        self.assertEqual(stats['three_months_total'], 11000)
+
+    def test_filters_apply_to_current_month_only(self):
+        stats = purchase_statistics(self.user, date(2026, 3, 1), pet=self.pet.id, search='육', category='간식')
+        self.assertEqual((stats['total_price'], stats['count'], stats['category_totals']), (12000, 1, {'간식': 12000}))
+        # 지난달/3개월은 반려동물 필터만 적용
+        self.assertEqual((stats['last_month_total'], stats['three_months_total']), (4000, 11000))
+
+    def test_empty_month(self):
+        stats = purchase_statistics(self.user, date(2030, 1, 1))
+        self.assertEqual((stats['total_price'], stats['count'], stats['category_totals'], stats['largest_category']), (0, 0, {}, ''))
+
+    def test_parse_month(self):
+        self.assertEqual(parse_month('2026-03'), date(2026, 3, 1))
+        self.assertEqual(parse_month('2026-03-17'), date(2026, 3, 1))
+        self.assertEqual(parse_month('2026-13', default=date(2026, 1, 1)), date(2026, 1, 1))
+
+    def test_stats_api(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/items/api/otherpurchase/stats/', {'month': '2026-03', 'pet': self.pet.id})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['month'], data['total_price'], data['count']), ('2026-03', 17000, 2))
@@ -9,8 +9,10 @@ from common_app.models import Pet
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from .serializers import OtherPurchaseSerializer
-from django.db.models import Sum, Value, DecimalField, Count
+from django.db.models import Sum, Value, DecimalField
 from django.db.models.functions import Coalesce
+from rest_framework.decorators import action
+from .stats import CATEGORY_LABELS, parse_month, purchase_statistics
 
 # Create your views here.
 
@@ -54,17 +56,18 @@ def other_purchase_management(request):
     if category:
         qs = qs.filter(type=category)
     
-    # 총 합계
-    total_price = qs.aggregate(total_price=Coalesce(Sum('price'), Value(0), output_field=DecimalField()))['total_price']
-    
-    # 지난달 데이터 계산
-    last_month_start = start_date - timedelta(days=30)
-    last_month_end = start_date
-    last_month_qs = OtherPurchase.objects.filter(user=request.user, purchase_date__gte=last_month_start, purchase_date__lt=last_month_end)
-    if selected_pet_id:
-        last_month_qs = last_month_qs.filter(cat_id=selected_pet_id)
-    last_month_total = last_month_qs.aggregate(total_price=Coalesce(Sum('price'), Value(0), output_field=DecimalField()))['total_price']
-    
+    # 이번 달/지난달/최근 3개월 통계를 한 번의 조건부 집계 쿼리로 계산 (달력 월 기준)
+    stats = purchase_statistics(request.user, start_date.date(), pet=selected_pet_id, search=search, category=category)
+    total_price = stats['total_price']
+    current_count = stats['count']
+    last_month_total = stats['last_month_total']
+    last_month_count = stats['last_month_count']
+    three_months_total = stats['three_months_total']
+    category_labels = CATEGORY_LABELS
+    category_totals = [stats['category_totals'].get(label, 0) for label in category_labels]
+    largest_expense = stats['largest_expense']
+    largest_category = stats['largest_category']
+
     # 지난달 대비 변화율 계산
     if last_month_total and last_month_total > 0:
         change_percentage = ((total_price - last_month_total) / last_month_total) * 100
@@ -82,12 +85,6 @@ def other_purchase_management(request):
         trend_icon = "fas fa-minus"
     
     # 평소와의 비교 (최근 3개월 평균 대비)
-    three_months_ago = start_date - timedelta(days=90)
-    three_months_qs = OtherPurchase.objects.filter(user=request.user, purchase_date__gte=three_months_ago, purchase_date__lt=start_date)
-    if selected_pet_id:
-        three_months_qs = three_months_qs.filter(cat_id=selected_pet_id)
-    three_months_total = three_months_qs.aggregate(total_price=Coalesce(Sum('price'), Value(0), output_field=DecimalField()))['total_price']
-    
     if three_months_total and three_months_total > 0:
         avg_monthly = three_months_total / 3
         current_vs_avg = ((total_price - avg_monthly) / avg_monthly) * 100
@@ -105,8 +102,6 @@ def other_purchase_management(request):
         daily_trend_icon = "fas fa-minus"
     
     # 구매 건수 변화
-    current_count = qs.count()
-    last_month_count = last_month_qs.count()
     if last_month_count > 0:
         count_change = current_count - last_month_count
         if count_change > 0:
@@ -122,19 +117,9 @@ def other_purchase_management(request):
         count_trend_text = "지난달 데이터 없음"
         count_trend_icon = "fas fa-minus"
     
-    category_labels = ['장난감', '간식', '용품', '의료', '미용', '기타']
-    category_totals = []
-    for label in category_labels:
-        total = qs.filter(type=label).aggregate(sum=Sum('price'))['sum'] or 0
-        category_totals.append(int(total))
-    
     # 일 평균 지출
     days = (end_date - start_date).days or 1
     average_daily = int(total_price // days) if total_price else 0
-    # 최대 지출
-    largest = qs.order_by('-price').first()
-    largest_expense = largest.price if largest else 0
-    largest_category = largest.type if largest else ''
     # 선택된 월 설정 (파라미터로 전달된 월 또는 현재 월)
     if month:
         if len(month) == 10:  # YYYY-MM-DD 형식으로 전달된 경우
@@ -219,6 +204,17 @@ class OtherPurchaseViewSet(ModelViewSet):
             'total_price': int(total_price) if total_price is not None else 0
         }, safe=False)
 
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        # other_purchase_management 화면과 같은 통계 (month, pet, search, category 파라미터)
+        params = request.query_params
+        stats = purchase_statistics(
+            request.user, parse_month(params.get('month')),
+            pet=params.get('pet'), search=params.get('search', ''), category=params.get('category', ''),
+        )
+        stats['month'] = stats['month'].strftime('%Y-%m')
+        return JsonResponse(stats)
+
     def perform_create(self, serializer):
         pet_id = self.request.data.get('pet')
         if pet_id:
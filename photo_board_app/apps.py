@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BoardAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'photo_board_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -12,11 +12,17 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='작성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
     likes = models.ManyToManyField(User, related_name='liked_posts', blank=True, verbose_name='좋아요')
+    # likes/comments 행 수 (common_app.counters에서 F()로 갱신)
+    like_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='좋아요 수')
+    comment_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='댓글 수')
     is_together = models.BooleanField(default=False, verbose_name='함께 작성')
     is_etc = models.BooleanField(default=False, verbose_name='기타 작성')
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['pet', '-created_at'], name='photopost_pet_created_idx'),
+        ]
         verbose_name = '게시글'
         verbose_name_plural = '게시글들'
 
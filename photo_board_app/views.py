@@ -4,13 +4,15 @@ from django.contrib import messages
 from django.http import JsonResponse
 from .models import Post, Comment, Pet
 from .forms import PostForm, CommentForm
+from common_app.counters import is_liked, save_edit_form, toggle_like
+from common_app.instrumentation import query_budget
 from django.db import models
 
 @login_required
 def post_list(request):
     pets = Pet.objects.filter(owner=request.user)
     pet_id = request.GET.get('pet')
-    posts = Post.objects.filter(pet__owner=request.user)
+    posts = Post.objects.filter(pet__owner=request.user).select_related('author')
     
     if pet_id:
         if pet_id == 'all':
@@ -88,12 +90,13 @@ def post_create(request):
 @login_required
 def post_detail(request, post_id):
     post = get_object_or_404(Post, id=post_id, pet__owner=request.user)
-    comments = post.comments.all()
+    comments = post.comments.select_related('author')
     comment_form = CommentForm()
     return render(request, 'photo_board_app/post_detail.html', {
         'post': post,
         'comments': comments,
-        'comment_form': comment_form
+        'comment_form': comment_form,
+        'liked': is_liked(post, request.user),
     })
 
 @login_required
@@ -108,7 +111,7 @@ def post_edit(request, post_id):
         form = PostForm(data, request.FILES, instance=post)
         form.fields['pet'].queryset = Pet.objects.filter(owner=request.user)
         if form.is_valid():
-            form.save()
+            save_edit_form(form)
             messages.success(request, '게시글이 수정되었습니다.')
             return redirect('photo_board_app:detail', post_id=post.id)
     else:
@@ -146,12 +149,8 @@ def comment_delete(request, post_id, comment_id):
     return redirect('photo_board_app:detail', post_id=post.id)
 
 @login_required
+@query_budget(12)
 def post_like(request, post_id):
     post = get_object_or_404(Post, id=post_id, pet__owner=request.user)
-    if request.user in post.likes.all():
-        post.likes.remove(request.user)
-        liked = False
-    else:
-        post.likes.add(request.user)
-        liked = True
-    return JsonResponse({'liked': liked, 'count': post.likes.count()}) 
\ No newline at end of file
+    liked, count = toggle_like(post, request.user)
+    return JsonResponse({'liked': liked, 'count': count}) 
\ No newline at end of file
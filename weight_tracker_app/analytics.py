@@ -0,0 +1,146 @@
+import math
+from datetime import date
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .models import Weight
+
+PERIODS = ('day', 'week', 'month')
+# 차트 한 개에 보낼 최대 점 수 (LTTB로 줄임)
+DEFAULT_POINTS = 120
+MAX_POINTS = 1000
+# 이동 평균에 쓸 구간(버킷) 수
+ROLLING_WINDOW = 4
+# 직전 기록 대비 주당 변화율이 이 비율을 넘으면 급변으로 표시
+ANOMALY_WEEKLY_RATE = 0.05
+DAYS_PER_MONTH = 365.25 / 12
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def bucket_series(days, weights, period):
+    """날짜(ordinal)별 체중을 일/주/월 단위 평균으로 묶음 → (버킷 시작 ordinal, 평균 체중)"""
+    if period == 'week':
+        # 월요일 시작 (date.fromordinal(1)은 월요일)
+        keys = days - (days - 1) % 7
+    elif period == 'month':
+        # ordinal → datetime64로 바꿔 월 단위로 내림한 뒤 다시 ordinal로
+        epoch = date(1970, 1, 1).toordinal()
+        months = (days - epoch).astype('datetime64[D]').astype('datetime64[M]')
+        keys = months.astype('datetime64[D]').astype(np.int64) + epoch
+    else:
+        keys = days
+    unique, inverse = np.unique(keys, return_inverse=True)
+    sums = np.bincount(inverse, weights=weights)
+    counts = np.bincount(inverse)
+    return unique, sums / counts
+
+
+def rolling_mean(values, window=ROLLING_WINDOW):
+    """직전 window개(현재 포함) 평균 (앞부분은 있는 만큼만 평균)"""
+    if not len(values):
+        return values
+    cumsum = np.cumsum(np.insert(values, 0, 0.0))
+    index = np.arange(1, len(values) + 1)
+    start = np.maximum(index - window, 0)
+    return (cumsum[index] - cumsum[start]) / (index - start)
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets 다운샘플링 → 남길 인덱스 배열 (처음/마지막 점은 항상 포함)"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    # 처음/마지막 점을 뺀 나머지를 threshold - 2개 구간으로 나눔
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        if next_start >= next_end:
+            next_x, next_y = x[-1], y[-1]
+        else:
+            next_x, next_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        # 이전 선택점, 현재 구간의 각 점, 다음 구간 평균점이 이루는 삼각형 넓이가 가장 큰 점
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def weight_trend(days, weights, period='day', points=DEFAULT_POINTS, window=ROLLING_WINDOW):
+    """날짜순 원본 기록으로 차트용 시계열/추세/급변 지점 계산"""
+    if not len(days):
+        return {'raw_count': 0, 'series': [], 'slope_kg_per_month': None, 'latest': None, 'anomalies': []}
+
+    bucket_days, bucket_weights = bucket_series(days, weights, period)
+    means = rolling_mean(bucket_weights, window)
+    keep = lttb(bucket_days.astype(float), bucket_weights, points)
+
+    # 최소제곱 직선의 기울기 (kg/일 → kg/월)
+    slope = float(np.polyfit(days - days[0], weights, 1)[0] * DAYS_PER_MONTH) if len(days) > 1 and days[-1] > days[0] else None
+
+    # 직전 기록 대비 주당 변화율
+    gaps = np.diff(days)
+    changes = np.diff(weights)
+    weekly_rate = changes / weights[:-1] / np.maximum(gaps, 1) * 7
+    flagged = np.nonzero(np.abs(weekly_rate) > ANOMALY_WEEKLY_RATE)[0]
+
+    return {
+        'raw_count': int(len(days)),
+        'series': [{
+            'date': date.fromordinal(int(bucket_days[i])).isoformat(),
+            'weight': round(float(bucket_weights[i]), 2),
+            'rolling_mean': round(float(means[i]), 2),
+        } for i in keep],
+        'slope_kg_per_month': round(slope, 3) if slope is not None and math.isfinite(slope) else None,
+        'latest': {'date': date.fromordinal(int(days[-1])).isoformat(), 'weight': round(float(weights[-1]), 2)},
+        'anomalies': [{
+            'date': date.fromordinal(int(days[i + 1])).isoformat(),
+            'weight': round(float(weights[i + 1]), 2),
+            'change': round(float(changes[i]), 2),
+            'days_since_last': int(gaps[i]),
+            'weekly_rate': round(float(weekly_rate[i]), 3),
+        } for i in flagged],
+    }
+
+
+def analytics_cache_key(pet_id, last_modified, count, period, points, window):
+    stamp = last_modified.timestamp() if last_modified else 0
+    return f'weight:analytics:{pet_id}:{count}:{stamp}:{period}:{points}:{window}'
+
+
+def pet_weight_trends(user, pet_ids, period='day', points=DEFAULT_POINTS, window=ROLLING_WINDOW):
+    """반려동물별 weight_trend 결과 {pet_id: {...}}
+
+    (반려동물, 마지막 수정 시각, 기록 수)를 넣은 키로 캐시하고, 캐시에 없는 반려동물의 기록만 한 번에 조회한다.
+    """
+    versions = {
+        row['pet_id']: (row['last_modified'], row['count'])
+        for row in Weight.objects.filter(user=user, pet_id__in=pet_ids).values('pet_id').annotate(
+            last_modified=Max('updated_at'), count=Count('id'),
+        ).order_by()
+    }
+    keys = {pet_id: analytics_cache_key(pet_id, *versions.get(pet_id, (None, 0)), period, points, window) for pet_id in pet_ids}
+    cached = cache.get_many(keys.values())
+    results = {pet_id: cached[key] for pet_id, key in keys.items() if key in cached}
+    missing = [pet_id for pet_id in pet_ids if pet_id not in results]
+    if missing:
+        rows = Weight.objects.filter(user=user, pet_id__in=missing).order_by('pet_id', 'date').values_list('pet_id', 'date', 'weight')
+        series = {pet_id: ([], []) for pet_id in missing}
+        for pet_id, day, weight in rows.iterator(chunk_size=5000):
+            series[pet_id][0].append(day.toordinal())
+            series[pet_id][1].append(float(weight))
+        computed = {
+            pet_id: weight_trend(np.array(days, dtype=np.int64), np.array(weights, dtype=float), period, points, window)
+            for pet_id, (days, weights) in series.items()
+        }
+        cache.set_many({keys[pet_id]: result for pet_id, result in computed.items()}, timeout=CACHE_TIMEOUT)
+        results.update(computed)
+    return results
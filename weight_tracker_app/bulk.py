@@ -0,0 +1,146 @@
+"""체중 기록 일괄 가져오기/내보내기 (CSV, JSON Lines)
+
+- import_weights: 업로드 파일을 한 줄씩 읽어 CHUNK_SIZE행씩 검증하고
+  (user, pet, date)가 같으면 체중을 덮어쓰는 bulk_create(update_conflicts=True)로 저장
+  (전체를 한 트랜잭션으로 처리, 잘못된 행은 건너뛰고 줄 번호와 오류를 반환)
+  bulk_create는 post_save 시그널을 보내지 않으므로 커밋 후 캘린더 버전을 직접 올림
+- export_rows: 사용자의 기록을 반려동물/날짜순으로 CSV 또는 JSON Lines 줄 단위로 생성
+  (StreamingHttpResponse로 보내 전체를 메모리에 올리지 않음)
+
+열: pet(반려동물 id) 또는 pet_name, date(YYYY-MM-DD), weight(kg)
+"""
+import codecs
+import csv
+import json
+
+from django.db import connection, transaction
+
+from common_app.calendar_feed import bump_calendar_version
+from common_app.models import Pet
+
+from .models import Weight
+from .serializers import WeightImportSerializer
+
+FORMATS = ('csv', 'jsonl')
+CHUNK_SIZE = 1000
+# 응답에 담을 최대 오류 행 수 (전체 건수는 error_count로)
+MAX_REPORTED_ERRORS = 500
+EXPORT_FIELDS = ['pet', 'pet_name', 'date', 'weight']
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(upload, requested=None):
+    """요청한 형식 → 파일 확장자 순으로 판단"""
+    if requested:
+        if requested not in FORMATS:
+            raise ImportFormatError(f'지원하지 않는 형식입니다: {requested}')
+        return requested
+    name = (upload.name or '').lower()
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    raise ImportFormatError('파일 형식(csv 또는 jsonl)을 알 수 없습니다.')
+
+
+def read_rows(upload, fmt):
+    """(줄 번호, dict 또는 None) 생성 (JSON으로 읽을 수 없는 줄은 None)"""
+    lines = codecs.iterdecode(upload, 'utf-8-sig')
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        if not reader.fieldnames or 'date' not in reader.fieldnames or 'weight' not in reader.fieldnames:
+            raise ImportFormatError('CSV 첫 줄에 date, weight 열(과 pet 또는 pet_name 열)이 있어야 합니다.')
+        for row in reader:
+            yield reader.line_num, {key: value for key, value in row.items() if key is not None and value != ''}
+        return
+    for line_num, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_num, row if isinstance(row, dict) else None
+
+
+def chunked(iterable, size=CHUNK_SIZE):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def upsert(weights):
+    """(user, pet, date)가 이미 있으면 체중만 갱신"""
+    # MySQL은 충돌 대상을 지정하지 않고 ON DUPLICATE KEY UPDATE로 처리
+    unique_fields = ['user', 'pet', 'date'] if connection.features.supports_update_conflicts_with_target else None
+    Weight.objects.bulk_create(
+        weights, batch_size=CHUNK_SIZE, update_conflicts=True,
+        unique_fields=unique_fields, update_fields=['weight', 'updated_at'],
+    )
+
+
+def import_weights(user, upload, fmt):
+    """→ {'saved', 'error_count', 'errors': [{'line', 'errors'}]}"""
+    pets = dict(Pet.objects.filter(owner=user).values_list('id', 'name'))
+    pet_ids_by_name = {name: pet_id for pet_id, name in pets.items()}
+    saved, error_count, errors = 0, 0, []
+
+    def report(line, error):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({'line': line, 'errors': error})
+
+    with transaction.atomic():
+        for chunk in chunked(read_rows(upload, fmt)):
+            # 같은 파일 안에서 (반려동물, 날짜)가 겹치면 마지막 행을 사용
+            valid = {}
+            for line, row in chunk:
+                if row is None:
+                    report(line, {'non_field_errors': ['JSON 객체로 읽을 수 없는 줄입니다.']})
+                    continue
+                serializer = WeightImportSerializer(data=row)
+                if not serializer.is_valid():
+                    report(line, serializer.errors)
+                    continue
+                data = serializer.validated_data
+                pet_id = data['pet'] if 'pet' in data else pet_ids_by_name.get(data.get('pet_name'))
+                if pet_id not in pets:
+                    report(line, {'pet': ['등록된 반려동물이 아닙니다.']})
+                    continue
+                valid[pet_id, data['date']] = Weight(user=user, pet_id=pet_id, date=data['date'], weight=data['weight'])
+            upsert(list(valid.values()))
+            saved += len(valid)
+        if saved:
+            transaction.on_commit(lambda: bump_calendar_version(user.id, sources=('weight',)))
+    return {'saved': saved, 'error_count': error_count, 'errors': errors}
+
+
+class Echo:
+    """csv.writer가 쓴 줄을 그대로 돌려주는 버퍼"""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(user, fmt, pet_id=None):
+    weights = Weight.objects.filter(user=user, pet__isnull=False)
+    if pet_id:
+        weights = weights.filter(pet_id=pet_id)
+    rows = weights.order_by('pet_id', 'date').values_list('pet_id', 'pet__name', 'date', 'weight').iterator(chunk_size=2000)
+    if fmt == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for pet, pet_name, date, weight in rows:
+            yield writer.writerow([pet, pet_name, date.isoformat(), weight])
+        return
+    for pet, pet_name, date, weight in rows:
+        yield json.dumps({'pet': pet, 'pet_name': pet_name, 'date': date.isoformat(), 'weight': float(weight)}, ensure_ascii=False) + '\n'
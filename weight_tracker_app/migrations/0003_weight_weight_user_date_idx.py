@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_app', '0009_calendarversion'),
+        ('weight_tracker_app', '0002_alter_weight_unique_together_weight_pet_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='weight',
+            index=models.Index(fields=['user', 'date'], name='weight_user_date_idx'),
+        ),
+    ]
@@ -1,7 +1,27 @@
 from django.db import models
+from django.db.models import DecimalField, ExpressionWrapper, F, Window
+from django.db.models.functions import Lag
 from django.contrib.auth.models import User
+from common_app.db import DaysBetween
 from common_app.models import Pet
 
+
+class WeightQuerySet(models.QuerySet):
+    def with_deltas(self):
+        """반려동물별 날짜순으로 직전 기록 대비 변화량(change)과 경과 일수(days_since_last) 주석 (첫 기록은 None)
+
+        윈도 함수는 WHERE 이후에 계산되므로 더 오래된 기록을 잘라내는 필터와 함께 쓰면 값이 달라진다.
+        """
+        previous = {'partition_by': [F('pet_id')], 'order_by': [F('date').asc()]}
+        return self.annotate(
+            change=ExpressionWrapper(
+                F('weight') - Window(Lag('weight'), **previous),
+                output_field=DecimalField(max_digits=6, decimal_places=2),
+            ),
+            days_since_last=DaysBetween(F('date'), Window(Lag('date'), **previous)),
+        )
+
+
 class Weight(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     pet = models.ForeignKey(Pet, on_delete=models.CASCADE, related_name='weight_records', null=True, blank=True)
@@ -10,9 +30,15 @@ class Weight(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = WeightQuerySet.as_manager()
+
     class Meta:
         ordering = ['-date']
         unique_together = ['user', 'pet', 'date']
+        indexes = [
+            # 반려동물 구분 없이 사용자의 기간 조회 ((user, pet, date)는 unique_together 인덱스로 처리)
+            models.Index(fields=['user', 'date'], name='weight_user_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.pet.name} - {self.date}: {self.weight}kg"
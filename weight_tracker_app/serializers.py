@@ -1,3 +1,4 @@
+from decimal import Decimal
 from rest_framework import serializers
 from .models import Weight
 
@@ -5,4 +6,16 @@ class WeightSerializer(serializers.ModelSerializer):
     class Meta:
         model = Weight
         fields = ['id', 'pet', 'date', 'weight']
-        read_only_fields = ['id'] 
\ No newline at end of file
+        read_only_fields = ['id'] 
+
+class WeightImportSerializer(serializers.Serializer):
+    """일괄 가져오기 한 행 (pet은 반려동물 id, 없으면 pet_name으로 찾음)"""
+    pet = serializers.IntegerField(required=False)
+    pet_name = serializers.CharField(required=False)
+    date = serializers.DateField()
+    weight = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=Decimal('0.01'))
+
+    def validate(self, attrs):
+        if 'pet' not in attrs and 'pet_name' not in attrs:
+            raise serializers.ValidationError('pet 또는 pet_name이 필요합니다.')
+        return attrs
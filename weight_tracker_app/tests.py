@@ -1,3 +1,159 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+
+from common_app.models import Pet
+
+from .analytics import bucket_series, lttb, rolling_mean, weight_trend
+from .bulk import import_weights
+from .models import Weight
+
+
+def upload(name, text):
+    return SimpleUploadedFile(name, text.encode('utf-8'))
+
+
+class WeightImportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('owner', password='pw')
+        self.pet = Pet.objects.create(owner=self.user, name='코코', pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+
+    def test_upsert_and_error_report(self):
+        Weight.objects.create(user=self.user, pet=self.pet, date=date(2026, 1, 1), weight=Decimal('5.00'))
+        result = import_weights(self.user, upload('w.csv', (
+            'pet_name,date,weight\n'
+            '코코,2026-01-01,5.50\n'
+            '코코,2026-01-02,5.60\n'
+            '없는이름,2026-01-03,5.70\n'
+            '코코,2026-13-01,5.80\n'
+            '코코,2026-01-02,5.65\n'
+        )), 'csv')
+        self.assertEqual(result['saved'], 2)
+        self.assertEqual(result['error_count'], 2)
+        self.assertEqual([error['line'] for error in result['errors']], [4, 5])
+        self.assertIn('pet', result['errors'][0]['errors'])
+        self.assertIn('date', result['errors'][1]['errors'])
+        self.assertEqual(
+            list(Weight.objects.filter(pet=self.pet).order_by('date').values_list('weight', flat=True)),
+            [Decimal('5.50'), Decimal('5.65')],
+        )
+
+    def test_jsonl_bad_line(self):
+        result = import_weights(self.user, upload('w.jsonl', (
+            f'{{"pet": {self.pet.id}, "date": "2026-01-01", "weight": 5}}\n'
+            'not json\n'
+            '{"date": "2026-01-02", "weight": 5}\n'
+        )), 'jsonl')
+        self.assertEqual(result['saved'], 1)
+        self.assertEqual([error['line'] for error in result['errors']], [2, 3])
+
+    def test_import_changes_calendar_feed_etag(self):
+        self.client.force_login(self.user)
+        url = '/home/calendar/feed/?start=2026-01-01&end=2026-02-01&sources=weight'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/weight/api/weights/import/', {'file': upload('w.csv', 'pet,date,weight\n%d,2026-01-05,6.1\n' % self.pet.id)})
+        self.assertEqual(response.json()['saved'], 1)
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], etag)
+        self.assertIn('6.1', second.content.decode())
+
+
+class WeightListCursorTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('owner', password='pw')
+        self.client.force_login(self.user)
+        self.pets = [
+            Pet.objects.create(owner=self.user, name=name, pet_type='dog', breed='etc', birth_date=date(2020, 1, 1))
+            for name in ('코코', '보리')
+        ]
+        for pet in self.pets:
+            for day, weight in ((1, '5.00'), (4, '5.50'), (10, '5.25')):
+                Weight.objects.create(user=self.user, pet=pet, date=date(2026, 1, day), weight=Decimal(weight))
+        for day in (2, 3):
+            Weight.objects.create(user=self.user, pet=None, date=date(2026, 1, day), weight=Decimal('4.00'))
+
+    def fetch_all(self, limit):
+        pages, cursor = [], None
+        while True:
+            params = {'limit': limit, **({'cursor': cursor} if cursor else {})}
+            body = self.client.get('/weight/api/weights/', params).json()
+            pages.append(body['results'])
+            cursor = body['next_cursor']
+            if cursor is None:
+                return pages
+
+    def test_pages_cross_pet_boundaries_without_gaps(self):
+        full = self.fetch_all(2000)
+        self.assertEqual(len(full), 1)
+        paged = self.fetch_all(2)
+        self.assertEqual(len(paged), 4)
+        self.assertEqual([row for page in paged for row in page], full[0])
+        self.assertEqual(
+            [(row['pet'], row['date']) for row in full[0]],
+            [(pet.pk, f'2026-01-{day:02d}') for pet in reversed(self.pets) for day in (10, 4, 1)]
+            + [(None, '2026-01-03'), (None, '2026-01-02')],
+        )
+
+    def test_deltas_match_previous_record(self):
+        rows = self.fetch_all(2)
+        coco = [row for page in rows for row in page if row['pet'] == self.pets[0].pk]
+        self.assertEqual([(row['change'], row['days_since_last']) for row in coco], [(-0.25, 6), (0.5, 3), (None, None)])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/weight/api/weights/', {'cursor': 'x:2026-01-01'})
+        self.assertEqual(response.status_code, 400)
+
+
+def ordinals(*days):
+    return np.array([day.toordinal() for day in days], dtype=np.int64)
+
+
+class WeightAnalyticsTests(SimpleTestCase):
+    def test_week_buckets_start_on_monday(self):
+        # 2026-01-05는 월요일
+        days = ordinals(date(2026, 1, 4), date(2026, 1, 5), date(2026, 1, 11), date(2026, 1, 12))
+        keys, means = bucket_series(days, np.array([1.0, 2.0, 4.0, 6.0]), 'week')
+        self.assertEqual([date.fromordinal(int(k)) for k in keys], [date(2025, 12, 29), date(2026, 1, 5), date(2026, 1, 12)])
+        self.assertEqual(means.tolist(), [1.0, 3.0, 6.0])
+
+    def test_month_buckets_split_on_month_boundary(self):
+        days = ordinals(date(2024, 2, 1), date(2024, 2, 29), date(2024, 3, 1))
+        keys, means = bucket_series(days, np.array([4.0, 6.0, 7.0]), 'month')
+        self.assertEqual([date.fromordinal(int(k)) for k in keys], [date(2024, 2, 1), date(2024, 3, 1)])
+        self.assertEqual(means.tolist(), [5.0, 7.0])
+
+    def test_rolling_mean_uses_available_prefix(self):
+        self.assertEqual(rolling_mean(np.array([2.0, 4.0, 6.0, 8.0]), window=2).tolist(), [2.0, 3.0, 5.0, 7.0])
+        self.assertEqual(len(rolling_mean(np.array([]))), 0)
+
+    def test_lttb_keeps_everything_when_threshold_not_smaller(self):
+        x = np.arange(5, dtype=float)
+        self.assertEqual(lttb(x, x, 5).tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(lttb(x, x, 2).tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(lttb(x[:0], x[:0], 3).tolist(), [])
+
+    def test_lttb_keeps_endpoints_and_peak(self):
+        x = np.arange(100, dtype=float)
+        y = np.zeros(100)
+        y[37] = 10.0
+        keep = lttb(x, y, 10)
+        self.assertEqual(len(keep), 10)
+        self.assertEqual((keep[0], keep[-1]), (0, 99))
+        self.assertIn(37, keep.tolist())
+        self.assertTrue(np.all(np.diff(keep) > 0))
+
+    def test_weight_trend_single_and_empty(self):
+        self.assertEqual(weight_trend(np.array([], dtype=np.int64), np.array([]))['series'], [])
+        result = weight_trend(ordinals(date(2026, 1, 1)), np.array([5.0]))
+        self.assertIsNone(result['slope_kg_per_month'])
+        self.assertEqual(result['anomalies'], [])
+        self.assertEqual(result['series'], [{'date': '2026-01-01', 'weight': 5.0, 'rolling_mean': 5.0}])
@@ -6,5 +6,8 @@ app_name = 'weight_tracker_app'
 urlpatterns = [
     path('', views.weight_tracker_view, name='weight_tracker'),
     path('api/weights/', views.weight_list, name='weight_list'),
+    path('api/weights/analytics/', views.weight_analytics, name='weight_analytics'),
+    path('api/weights/import/', views.weight_import, name='weight_import'),
+    path('api/weights/export/', views.weight_export, name='weight_export'),
     path('api/weights/<int:pk>/', views.weight_delete, name='weight_delete'),
 ] 
\ No newline at end of file
@@ -6,45 +6,69 @@ from rest_framework.permissions import IsAuthenticated
 from django.db import IntegrityError
 from .models import Weight
 from .serializers import WeightSerializer
-from django.db.models import Avg
-from django.db.models.functions import TruncMonth
+from . import analytics, bulk
+from django.db.models import F, Q
 from datetime import datetime, timedelta
 from django.utils import timezone
+from django.http import JsonResponse, StreamingHttpResponse
+from django.contrib.auth.decorators import login_required
 from common_app.models import Pet
 import json
-from collections import defaultdict
+
+# weight_list 한 페이지의 기본/최대 기록 수
+WEIGHT_PAGE_SIZE = 500
+MAX_WEIGHT_PAGE_SIZE = 2000
+
+
+def parse_weight_cursor(value):
+    """'<pet_id 또는 none>:<YYYY-MM-DD>' → (pet_id, date) (형식이 다르면 ValueError)"""
+    pet_id, _, day = value.partition(':')
+    return (None if pet_id == 'none' else int(pet_id)), datetime.strptime(day, '%Y-%m-%d').date()
+
+
+def weight_cursor(row):
+    return f"{row['pet'] if row['pet'] is not None else 'none'}:{row['date']:%Y-%m-%d}"
+
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def weight_list(request):
     if request.method == 'GET':
+        # 반려동물 내림차순 → 날짜 내림차순, (pet, date) 키셋 커서로 페이지 단위 조회
+        # 변화량/경과 일수는 윈도 함수(Lag)로 DB에서 계산 (커서 조건은 더 최근 기록만 제외하므로 값에 영향 없음)
+        try:
+            limit = min(max(int(request.GET.get('limit', WEIGHT_PAGE_SIZE)), 1), MAX_WEIGHT_PAGE_SIZE)
+            cursor = parse_weight_cursor(request.GET['cursor']) if request.GET.get('cursor') else None
+        except ValueError:
+            return Response({'error': '잘못된 limit 또는 cursor입니다.'}, status=status.HTTP_400_BAD_REQUEST)
         pet_id = request.GET.get('pet_id')
         weights = Weight.objects.filter(user=request.user)
         if pet_id:
             weights = weights.filter(pet_id=pet_id)
-        weights = weights.order_by('-pet_id', '-date')
-        data = []
-        pet_weights = defaultdict(list)
-        for weight in weights:
-            pet_weights[weight.pet_id].append(weight)
-        for pet_id, weight_list in pet_weights.items():
-            for i, weight in enumerate(weight_list):
-                weight_data = {
-                    'id': weight.id,
-                    'pet': weight.pet_id,
-                    'pet_name': weight.pet.name if weight.pet else '',
-                    'date': weight.date,
-                    'weight': float(weight.weight),
-                    'change': None,
-                    'days_since_last': None
-                }
-                if i < len(weight_list) - 1:
-                    prev_weight = weight_list[i + 1]
-                    weight_data['change'] = float(weight.weight) - float(prev_weight.weight)
-                    weight_data['days_since_last'] = (weight.date - prev_weight.date).days
-                data.append(weight_data)
-        data.sort(key=lambda x: (x['pet'], x['date']), reverse=True)
-        return Response(data)
+        if cursor:
+            cursor_pet, cursor_date = cursor
+            if cursor_pet is None:
+                weights = weights.filter(pet__isnull=True, date__lt=cursor_date)
+            else:
+                weights = weights.filter(
+                    Q(pet_id__lt=cursor_pet) | Q(pet_id=cursor_pet, date__lt=cursor_date) | Q(pet__isnull=True)
+                )
+        rows = list(weights.with_deltas().order_by(F('pet_id').desc(nulls_last=True), '-date').values(
+            'id', 'pet', 'pet__name', 'date', 'weight', 'change', 'days_since_last',
+        )[:limit + 1])
+        data = [{
+            'id': row['id'],
+            'pet': row['pet'],
+            'pet_name': row['pet__name'] or '',
+            'date': row['date'],
+            'weight': float(row['weight']),
+            'change': float(row['change']) if row['change'] is not None else None,
+            'days_since_last': row['days_since_last'],
+        } for row in rows[:limit]]
+        return Response({
+            'results': data,
+            'next_cursor': weight_cursor(rows[limit - 1]) if len(rows) > limit else None,
+        })
     
     elif request.method == 'POST':
         serializer = WeightSerializer(data=request.data)
@@ -68,6 +92,60 @@ def weight_delete(request, pk):
     except Weight.DoesNotExist:
         return Response({'status': 'error', 'message': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def weight_analytics(request):
+    """반려동물별 차트용 체중 추세 (일/주/월 평균을 최대 points개로 다운샘플링 + 이동 평균, 월간 기울기, 급변 지점)"""
+    period = request.GET.get('period', 'day')
+    try:
+        points = min(max(int(request.GET.get('points', analytics.DEFAULT_POINTS)), 3), analytics.MAX_POINTS)
+        window = max(int(request.GET.get('window', analytics.ROLLING_WINDOW)), 1)
+    except ValueError:
+        return Response({'error': '잘못된 points 또는 window입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    if period not in analytics.PERIODS:
+        return Response({'error': '잘못된 period입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    pets = Pet.objects.filter(owner=request.user).order_by('id')
+    pet_id = request.GET.get('pet_id')
+    if pet_id:
+        pets = pets.filter(id=pet_id) if pet_id.isdigit() else pets.none()
+    pets = list(pets.values('id', 'name'))
+    if pet_id and not pets:
+        return Response({'error': '반려동물을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+    trends = analytics.pet_weight_trends(request.user, [pet['id'] for pet in pets], period, points, window)
+    return Response({
+        'period': period,
+        'pets': [{'pet_id': pet['id'], 'pet_name': pet['name'], **trends[pet['id']]} for pet in pets],
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def weight_import(request):
+    """CSV/JSON Lines 파일(file)로 체중 기록 일괄 등록 (같은 반려동물/날짜는 덮어씀)"""
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'file이 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        fmt = bulk.detect_format(upload, request.GET.get('type'))
+        result = bulk.import_weights(request.user, upload, fmt)
+    except (bulk.ImportFormatError, UnicodeDecodeError) as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result)
+
+@login_required
+def weight_export(request):
+    """체중 기록 내보내기 (?type=csv|jsonl, ?pet_id=)"""
+    fmt = request.GET.get('type', 'csv')
+    if fmt not in bulk.FORMATS:
+        return JsonResponse({'error': '지원하지 않는 형식입니다.'}, status=400)
+    response = StreamingHttpResponse(
+        bulk.export_rows(request.user, fmt, request.GET.get('pet_id')),
+        content_type='text/csv; charset=utf-8' if fmt == 'csv' else 'application/x-ndjson; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'attachment; filename="weights.{fmt}"'
+    return response
+
 def weight_tracker_view(request):
     user_pets = list(Pet.objects.filter(owner=request.user).values('id', 'name')) if request.user.is_authenticated else []
     return render(request, 'weight_tracker/index.html', {'user_pets': json.dumps(user_pets)})